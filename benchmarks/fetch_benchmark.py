@@ -0,0 +1,148 @@
+"""
+Fetch Benchmark
+Compares sequential vs concurrent PerformanceAnalyzer.fetch_companies
+against a local stand-in HTTP server that simulates latency and 429s
+
+Usage:
+    python benchmarks/fetch_benchmark.py --tickers 100 --latency 0.05 --throttle 0.1
+"""
+import argparse
+import io
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+from src.analysis.data_providers import DataProvider, RateLimitError
+from src.analysis.performance_analyzer import PerformanceAnalyzer
+from src.analysis.fetch_scheduler import RateLimitedProvider
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serve synthetic history/info, sleeping `latency` and throttling randomly"""
+
+    latency = 0.05
+    throttle_rate = 0.1
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if random.random() < self.throttle_rate:
+            self.send_response(429)
+            self.end_headers()
+            return
+
+        kind, ticker = self.path.strip('/').split('/', 1)
+        if kind == 'history':
+            body = self._history_csv(ticker).encode()
+            content_type = 'text/csv'
+        else:
+            body = json.dumps({'longName': f"{ticker} Inc", 'sector': 'Technology',
+                               'industry': 'Semiconductors', 'currency': 'USD'}).encode()
+            content_type = 'application/json'
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def _history_csv(ticker: str) -> str:
+        rng = np.random.default_rng(abs(hash(ticker)) % 2**32)
+        dates = pd.bdate_range('2019-01-01', '2023-12-29')
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+        return pd.DataFrame({'Date': dates, 'Close': close,
+                             'Volume': 1_000_000}).to_csv(index=False)
+
+    def log_message(self, *args):
+        pass
+
+
+class HttpStandInProvider(DataProvider):
+    """Provider talking to the stand-in server"""
+
+    name = 'standin'
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def get_history(self, ticker, start_date, end_date):
+        data = pd.read_csv(io.StringIO(self._get(f"history/{ticker}")),
+                           parse_dates=['Date'], index_col='Date')
+        return data[(data.index >= start_date) & (data.index < end_date)]
+
+    def get_info(self, ticker):
+        return json.loads(self._get(f"info/{ticker}"))
+
+    def _get(self, path: str) -> str:
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/{path}", timeout=10) as resp:
+                return resp.read().decode()
+        except urllib.error.HTTPError as e:
+            if e.code == 429:
+                raise RateLimitError(f"429 for {path}") from e
+            raise
+
+
+def run(workers: int, tickers, base_url: str, args) -> float:
+    provider = RateLimitedProvider(
+        HttpStandInProvider(base_url),
+        max_concurrency=workers,
+        requests_per_second=args.rate,
+        burst=workers,
+        max_retries=args.retries,
+        backoff_base=args.backoff
+    )
+    analyzer = PerformanceAnalyzer(provider=provider, max_workers=workers)
+
+    started = time.perf_counter()
+    companies = analyzer.fetch_companies(tickers, datetime(2019, 1, 1), datetime(2024, 1, 1))
+    elapsed = time.perf_counter() - started
+
+    order = [c.ticker for c in companies]
+    assert order == sorted(order, key=tickers.index), "results must keep input order"
+    print(f"  workers={workers:<3} fetched={len(companies):<5} "
+          f"requests={provider.budget.used:<5} wall={elapsed:.2f}s")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--tickers', type=int, default=60)
+    parser.add_argument('--latency', type=float, default=0.05, help='seconds per request')
+    parser.add_argument('--throttle', type=float, default=0.1, help='fraction of 429 responses')
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--rate', type=float, default=None, help='requests per second')
+    parser.add_argument('--retries', type=int, default=5)
+    parser.add_argument('--backoff', type=float, default=0.05)
+    args = parser.parse_args()
+
+    StandInHandler.latency = args.latency
+    StandInHandler.throttle_rate = args.throttle
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    tickers = [f"T{i:04d}" for i in range(args.tickers)]
+    print(f"Stand-in server at {base_url}: latency={args.latency}s, 429 rate={args.throttle:.0%}")
+
+    sequential = run(1, tickers, base_url, args)
+    concurrent = run(args.workers, tickers, base_url, args)
+    print(f"Speedup: {sequential / concurrent:.1f}x")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Metrics Kernel Benchmark
+Scaling of the vectorized metrics kernel vs the former per-ticker pandas path
+
+Usage:
+    python benchmarks/metrics_kernel_benchmark.py --years 5 --max-pandas 1000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+from src.analysis.metrics_kernel import compute_metrics
+
+
+def pandas_metrics(close: np.ndarray):
+    """Per-ticker loop equivalent to the former _fetch_stock_data calculation"""
+    for column in close.T:
+        data = pd.DataFrame({'Close': column})
+        data['Return'] = data['Close'].pct_change()
+        data['Volatility'] = data['Return'].rolling(30, min_periods=10).std() * np.sqrt(252)
+        data = data.ffill().bfill()
+        _ = (data['Close'].iloc[-1] / data['Close'].iloc[0] - 1) * 100
+        _ = float(data['Volatility'].mean() * 100)
+        _ = ((data['Close'] / data['Close'].cummax()) - 1).min() * 100
+
+
+def timed(func, *args) -> float:
+    started = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--years', type=int, default=5)
+    parser.add_argument('--max-pandas', type=int, default=1000,
+                        help='largest universe to time the per-ticker loop on')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    n_dates = 252 * args.years
+    print(f"{'tickers':>8} {'kernel (s)':>12} {'per-ticker (s)':>16} {'speedup':>9}")
+
+    for n_tickers in (10, 100, 1000, 10000):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, (n_dates, n_tickers)), axis=0))
+        kernel = timed(compute_metrics, close)
+
+        if n_tickers <= args.max_pandas:
+            loop = timed(pandas_metrics, close)
+            print(f"{n_tickers:>8} {kernel:>12.4f} {loop:>16.4f} {loop / kernel:>8.1f}x")
+        else:
+            print(f"{n_tickers:>8} {kernel:>12.4f} {'-':>16} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Panel Memory Benchmark
+Reports bytes per ticker for per-company yfinance-style DataFrames vs PricePanel
+
+Usage:
+    python benchmarks/panel_memory_benchmark.py --tickers 1000 --years 5
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+from src.analysis.performance_analyzer import CompanyData
+from src.analysis.price_panel import PricePanel
+
+
+def synthetic_companies(n_tickers: int, years: int):
+    """CompanyData shaped like yfinance history plus the derived columns"""
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range('2019-01-01', periods=252 * years, tz='America/New_York', name='Date')
+    companies = []
+    for i in range(n_tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.02, len(dates))))
+        data = pd.DataFrame({
+            'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+            'Volume': rng.integers(1e5, 1e7, len(dates)),
+            'Dividends': 0.0, 'Stock Splits': 0.0
+        }, index=dates)
+        data['Return'] = data['Close'].pct_change()
+        data['Volatility'] = data['Return'].rolling(30, min_periods=10).std() * np.sqrt(252)
+        companies.append(CompanyData(
+            name=f"T{i:05d} Inc", sector='Semiconductors', data=data,
+            ticker=f"T{i:05d}", metrics={'return': 0.0, 'volatility': 0.0, 'drawdown': 0.0}
+        ))
+    return companies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--years', type=int, default=5)
+    args = parser.parse_args()
+
+    companies = synthetic_companies(args.tickers, args.years)
+    frame_bytes = sum(c.data.memory_usage(deep=True).sum() for c in companies)
+    print(f"{args.tickers} tickers x {args.years} years")
+    print(f"  DataFrame per company : {frame_bytes / args.tickers:>12,.0f} bytes/ticker")
+
+    for dtype in (np.float64, np.float32):
+        panel = PricePanel.from_companies(companies, dtype=dtype)
+        print(f"  PricePanel {np.dtype(dtype).name:<10} : "
+              f"{panel.bytes_per_ticker():>12,.0f} bytes/ticker")
+
+
+if __name__ == "__main__":
+    main()
@@ -38,6 +38,17 @@ SECTOR_MAP = {
     'Telecom_Industrial': ['CSCO', 'ERIC', 'NOK', 'ABB']
 }
 
+# Fallback for tickers outside SECTOR_MAP (from sc_analyzer_new.py _determine_sector)
+# Matched against the provider's lowercased sector + industry; first listed sector wins
+SECTOR_KEYWORDS = {
+    'Semiconductors': ['semiconductor', 'chip'],
+    'Automotive': ['auto', 'vehicle'],
+    'Consumer Electronics': ['electronic', 'computer'],
+    'Telecom_Industrial': ['telecom', 'industrial']
+}
+
+DEFAULT_SECTOR = 'Other'
+
 # ============================================================================
 # IMPACT THRESHOLDS (from sc_analyzer_new.py __init__)
 # ============================================================================
@@ -61,6 +72,17 @@ SEMICONDUCTOR_DEPENDENCY = {
     'Other': 'Low'
 }
 
+# ============================================================================
+# DEPENDENCY GRAPH (supplier -> customer shock propagation)
+# ============================================================================
+
+DEPENDENCY_GRAPH = {
+    'edge_file': 'data/supply_chain_edges.csv',   # supplier,customer,weight (CSV/Parquet), under the project root
+    'tiers': 3,                                   # hops a shock travels downstream
+    'decay': 0.5,                                 # attenuation per hop
+    'normalize_inbound': True                     # cap each customer's inbound weight at 1
+}
+
 # ============================================================================
 # STRATEGIC RECOMMENDATIONS (from sc_analyzer_new.py _get_recommendation)
 # ============================================================================
@@ -106,4 +128,197 @@ RECOVERY_TIME_RULES = [
     (20, '6-12 months'),
     (0, '12-18 months'),
     (float('-inf'), '18+ months')
-]
\ No newline at end of file
+]
+
+# ============================================================================
+# DATA PROVIDER (price history & company metadata source)
+# ============================================================================
+
+# 'yahoo' fetches over the network; 'local' reads <TICKER>.parquet/.csv and
+# metadata.parquet/.csv from 'directory' for offline runs
+DATA_PROVIDER = {
+    'type': 'yahoo'
+}
+
+# ============================================================================
+# FETCH SETTINGS (concurrency, rate limiting & retries)
+# ============================================================================
+
+FETCH_SETTINGS = {
+    'max_workers': 8,           # thread pool size; 1 fetches sequentially
+    'max_retries': 3,           # retries on throttling / transient errors
+    'backoff_base': 0.5,        # seconds; doubled per attempt with full jitter
+    'request_budget': None,     # max provider requests per run (None = unlimited)
+    'provider_limits': {
+        'yahoo': {'max_concurrency': 4, 'requests_per_second': 2.0, 'burst': 4},
+        'local': {'max_concurrency': 16, 'requests_per_second': None}
+    }
+}
+
+# ============================================================================
+# PRICE CACHE (persistent per-ticker OHLCV store)
+# ============================================================================
+
+PRICE_CACHE = {
+    'enabled': True,
+    'directory': '.cache/prices',
+    'max_bytes': 512 * 1024 * 1024,   # LRU eviction above this size
+    'adjustment_rtol': 1e-6,          # overlap bar mismatch => refetch (split/dividend)
+    'providers': ['yahoo']            # local files are already on disk
+}
+
+# ============================================================================
+# METADATA CACHE (company name / sector / industry / currency)
+# ============================================================================
+
+METADATA_CACHE = {
+    'enabled': True,
+    'path': '.cache/metadata.sqlite',
+    'ttl_days': 30,
+    'preload_file': None,             # optional Parquet/CSV/JSON, bulk loaded once per file version
+    'providers': ['yahoo']
+}
+
+# ============================================================================
+# INCREMENTAL METRICS (per-ticker state for `run_analysis.py refresh`)
+# ============================================================================
+
+INCREMENTAL_METRICS = {
+    'path': '.cache/metrics_book.pkl'   # relative to the project root
+}
+
+# ============================================================================
+# PRICE PANEL (aligned dates x tickers arrays shared by the analyzers)
+# ============================================================================
+
+PANEL_SETTINGS = {
+    'fields': ['Open', 'High', 'Low', 'Close', 'Volume'],   # OHLC feeds the weekly/monthly chart bars
+    'dtype': 'float32'
+}
+
+# ============================================================================
+# TIME SERIES SETTINGS (recovery trajectory chart data)
+# ============================================================================
+
+TIME_SERIES_SETTINGS = {
+    'max_companies': None,      # None charts every analyzed company
+    'point_budget': 150,        # max points per company after downsampling
+    'method': 'lttb',           # 'lttb' or 'minmax'
+    'chart_width_px': 1200      # target plot width for pyramid level selection
+}
+
+# ============================================================================
+# PIPELINE SETTINGS (stage executor)
+# ============================================================================
+
+PIPELINE_SETTINGS = {
+    'max_workers': 4,           # stages run concurrently on this many threads
+    'cache_size': 64,           # memoized stage outputs kept in memory
+    'cache_mb': 512             # ... and their approximate total size (shared by all sessions)
+}
+
+# ============================================================================
+# RISK MODEL (Isolation Forest over risk_features.FEATURE_NAMES)
+# ============================================================================
+
+RISK_MODEL = {
+    'n_estimators': 200,
+    'n_jobs': -1,                           # fit trees on every core
+    'path': '.cache/risk_model.joblib'      # under the project root; written by batch --save-risk-model
+}
+
+# ============================================================================
+# RISK TIMELINE (rolling-window anomaly scores)
+# ============================================================================
+
+RISK_TIMELINE = {
+    'window': 63,               # trading days per window (~3 months)
+    'step': 5,                  # score every 5th date (weekly)
+    'n_estimators': 100,
+    'fit_sample': 100_000,      # windows sampled to fit the forest
+    'chunk_rows': 50_000,       # windows per parallel scoring chunk
+    'max_workers': 4,
+    'chart_tickers': 30         # most anomalous tickers shown in the heatmap
+}
+
+# ============================================================================
+# CORRELATION SETTINGS (daily-return correlation matrices)
+# ============================================================================
+
+CORRELATION_SETTINGS = {
+    'min_periods': 20,          # overlapping days required per pair
+    'rolling_window': 63,       # trailing days for the 'rolling' variant
+    'ewm_halflife': 21,         # days for the exponentially weighted variant
+    'max_ticker_matrix': 500,   # dense ticker matrix up to this many tickers,
+                                # top-k neighbours (sparse) above it
+    'top_k': 10,                # neighbours kept per ticker in the sparse output
+    'dtype': 'float32',         # blockwise engine precision
+    'memory_budget_mb': 256,    # peak working memory of the blockwise engine
+    'shrinkage': None           # None or 'ledoit_wolf' for the ticker matrix
+}
+
+# ============================================================================
+# SCENARIO SETTINGS (Monte Carlo disruption simulator)
+# ============================================================================
+
+SCENARIO_SETTINGS = {
+    'n_paths': 5_000,           # paths per scenario in the pipeline
+    'horizon_days': 252,        # simulated trading days per path
+    'paths_per_task': 2_500,    # paths per process-pool task (fixes the seeding)
+    'max_workers': 4,           # capped at the core count; None uses every core
+    'min_pool_work': 1_000_000, # paths x tickers per call below which no pool is started
+    'start_method': 'spawn',    # worker start method; never 'fork' from threaded callers
+    'seed': 42,
+    'memory_budget_mb': 128,    # peak working memory in each worker
+    'bins': 2000,               # drawdown histogram resolution (0.05%)
+    'percentiles': [50, 95, 99],
+    'scenarios': [
+        {'name': 'Baseline', 'shocks': {}, 'duration_days': 0},
+        {
+            'name': 'Foundry output -30% for two quarters',
+            'shocks': {'Semiconductors': -0.30},
+            'duration_days': 126,
+            'propagate': True
+        }
+    ]
+}
+
+# ============================================================================
+# EVENT STUDY (market-model abnormal returns around disruption events)
+# ============================================================================
+
+EVENT_STUDY = {
+    'events': [
+        {'name': 'AKM Nobeoka fab fire', 'date': '2020-10-20'},
+        {'name': 'Automakers cut output on chip shortage', 'date': '2021-02-03'},
+        {'name': 'Renesas Naka fab fire', 'date': '2021-03-19'},
+        {'name': 'US advanced-chip export controls', 'date': '2022-10-07'}
+    ],
+    'estimation_window': (-250, -30),   # trading days relative to the event
+    'min_estimation_days': 120,         # fewer valid days leaves the fit empty
+    'windows': {                        # CAR windows (inclusive offsets)
+        'CAR_m1_p1': (-1, 1),
+        'CAR_0_p5': (0, 5),
+        'CAR_m5_p20': (-5, 20)
+    }
+}
+
+# ============================================================================
+# EXPORT SETTINGS (streaming Excel / Parquet / Arrow / zipped CSV)
+# ============================================================================
+
+EXPORT_SETTINGS = {
+    'chunk_rows': 100_000,          # rows per write for price history / time series
+    'include_price_history': True,  # daily closes for every analyzed ticker
+    'temp_dir': None                # None uses the system temp directory
+}
+
+# ============================================================================
+# DASHBOARD SETTINGS (figure cache and rendering)
+# ============================================================================
+
+DASHBOARD_SETTINGS = {
+    'webgl_point_threshold': 1000,  # scatter/line charts with more points render with WebGL
+    'figure_cache_entries': 64,     # figures and tables kept per session for the current results
+    'table_page_size': 100          # result table rows sent to the browser per page
+}
@@ -1,12 +1,20 @@
 """
 CLI Entry Point for Supply Chain Analysis
-Run this file to launch the Streamlit dashboard
+Run this file to launch the Streamlit dashboard, use the `batch`
+subcommand to run the analysis headless over a ticker file, or `refresh`
+to bring the persisted per-ticker metrics up to date
+
+    python run_analysis.py
+    python run_analysis.py batch --tickers-file universe.txt --output outputs/batch
+    python run_analysis.py refresh --tickers-file universe.txt --output outputs/refresh
 """
+import argparse
 import subprocess
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
 
-def main():
+def launch_dashboard():
     """Launch Streamlit dashboard"""
     dashboard_path = Path(__file__).parent / "src" / "dashboard" / "app.py"
     
@@ -33,5 +41,106 @@ def main():
         print("\nTry running directly:")
         print(f"  streamlit run {dashboard_path}")
 
+def run_batch(args):
+    """Run the full pipeline headless and write results to disk"""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from src.analysis.batch_runner import BatchRunner, read_ticker_file
+    from src.analysis.risk_analyzer import default_model_path
+    
+    tickers = read_ticker_file(args.tickers_file)
+    save_risk_model = args.save_risk_model
+    if save_risk_model == '':
+        save_risk_model = str(default_model_path())
+    print(f"Batch analysis: {len(tickers)} tickers, {args.start:%Y-%m-%d} to {args.end:%Y-%m-%d}")
+    
+    summary = BatchRunner(workers=args.workers, shard_size=args.shard_size).run(
+        tickers,
+        args.start,
+        args.end,
+        output_dir=args.output,
+        risk_threshold=args.risk_threshold,
+        fmt=args.format,
+        risk_model=args.risk_model,
+        save_risk_model=save_risk_model
+    )
+    
+    print(f"✅ {summary['companies_analyzed']}/{summary['tickers_requested']} companies analyzed "
+          f"in {summary['total_seconds']:.1f}s ({summary['tickers_per_second']:.1f} tickers/s)")
+    print(f"Results written to: {args.output}")
+    if save_risk_model:
+        print(f"Risk model saved to: {save_risk_model}")
+
+def run_refresh(args):
+    """Update the incremental metrics book with new bars only"""
+    sys.path.insert(0, str(Path(__file__).parent))
+    from src.analysis.batch_runner import read_ticker_file, refresh_metrics
+    
+    tickers = read_ticker_file(args.tickers_file)
+    print(f"Metrics refresh: {len(tickers)} tickers from {args.start:%Y-%m-%d} to {args.end:%Y-%m-%d}")
+    
+    summary = refresh_metrics(
+        tickers,
+        args.start,
+        args.end,
+        output_dir=args.output,
+        fmt=args.format,
+        book_path=args.book
+    )
+    
+    print(f"✅ {summary['tickers_refreshed']}/{summary['tickers_requested']} tickers refreshed "
+          f"({summary['tickers_seeded']} seeded) in {summary['total_seconds']:.1f}s")
+    print(f"Metrics written to: {args.output}")
+
+def parse_args(argv=None):
+    from config import DATE_RANGE
+    
+    def date(value):
+        return datetime.strptime(value, "%Y-%m-%d")
+    
+    parser = argparse.ArgumentParser(description="Supply Chain Resilience Analysis")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("dashboard", help="Launch the Streamlit dashboard (default)")
+    
+    batch = subparsers.add_parser("batch", help="Run the analysis headless over a ticker file")
+    batch.add_argument("--tickers-file", required=True,
+                       help="Tickers separated by newlines or commas")
+    batch.add_argument("--start", type=date, default=DATE_RANGE['start'], help="YYYY-MM-DD")
+    batch.add_argument("--end", type=date, default=DATE_RANGE['end'], help="YYYY-MM-DD")
+    batch.add_argument("--output", default="outputs/batch", help="Output directory")
+    batch.add_argument("--format", choices=["parquet", "json"], default="parquet")
+    batch.add_argument("--workers", type=int, default=None, help="Processes in the pool")
+    batch.add_argument("--shard-size", type=int, default=None, help="Tickers per shard")
+    batch.add_argument("--risk-threshold", type=float, default=0.3)
+    batch.add_argument("--risk-model", default=None,
+                       help="Score against this saved risk model instead of refitting")
+    batch.add_argument("--save-risk-model", nargs="?", const="", default=None, metavar="PATH",
+                       help="Save the fitted risk model (default path: RISK_MODEL['path'])")
+    
+    refresh = subparsers.add_parser("refresh",
+                                    help="Update persisted per-ticker metrics with new bars only")
+    refresh.add_argument("--tickers-file", required=True,
+                         help="Tickers separated by newlines or commas")
+    refresh.add_argument("--start", type=date, default=DATE_RANGE['start'],
+                         help="YYYY-MM-DD; changing it reseeds the book")
+    refresh.add_argument("--end", type=date,
+                         default=datetime.combine(datetime.now().date() + timedelta(days=1), datetime.min.time()),
+                         help="YYYY-MM-DD, exclusive (default: through today)")
+    refresh.add_argument("--output", default="outputs/refresh", help="Output directory")
+    refresh.add_argument("--format", choices=["parquet", "json"], default="parquet")
+    refresh.add_argument("--book", default=None,
+                         help="Metrics book path (default: INCREMENTAL_METRICS['path'])")
+    
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args()
+    
+    if args.command == "batch":
+        run_batch(args)
+    elif args.command == "refresh":
+        run_refresh(args)
+    else:
+        launch_dashboard()
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,202 @@
+"""
+Batch Runner
+Headless pipeline over large ticker universes, sharded across a process pool
+Used by `python run_analysis.py batch` and `python run_analysis.py refresh`
+"""
+import json
+import multiprocessing
+import os
+import time
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import sys
+sys.path.append('..')
+from config import DATA_PROVIDER, FETCH_SETTINGS, INCREMENTAL_METRICS, PANEL_SETTINGS
+from .data_providers import DataProvider, create_provider
+from .fetch_scheduler import RateLimitedProvider
+from .incremental_metrics import IncrementalMetricsBook
+from .performance_analyzer import PerformanceAnalyzer, project_root
+from .pipeline import analyze_companies, clean_tickers
+
+# Results tables written to the output directory
+OUTPUT_TABLES = ('performance', 'risk', 'supply_chain_impact', 'sector_vulnerability', 'scenarios')
+
+
+def read_ticker_file(path) -> List[str]:
+    """Tickers separated by newlines and/or commas; '#' starts a comment"""
+    tickers = []
+    for line in Path(path).read_text().splitlines():
+        line = line.split('#', 1)[0]
+        tickers.extend(line.split(','))
+    return clean_tickers(tickers)
+
+
+# This process's analyzer, drawing on the run's shared fetcher
+_shard_analyzer: Optional[PerformanceAnalyzer] = None
+
+
+def _init_worker(fetcher: RateLimitedProvider):
+    """Pool initializer (also called in-process): one analyzer per worker"""
+    global _shard_analyzer
+    _shard_analyzer = PerformanceAnalyzer(provider=fetcher)
+
+
+def _fetch_shard(shard: Tuple[int, List[str], datetime, datetime]):
+    """Worker entry point: fetch one shard of the universe"""
+    index, tickers, start_date, end_date = shard
+    return index, _shard_analyzer.fetch_companies(
+        tickers, start_date, end_date,
+        fields=PANEL_SETTINGS['fields'], dtype=PANEL_SETTINGS['dtype'],
+        new_run=False
+    )
+
+
+def refresh_metrics(tickers: List[str], start_date: datetime, end_date: datetime,
+                    output_dir, fmt: str = 'parquet', book_path=None) -> Dict:
+    """
+    Daily metrics refresh from the persisted IncrementalMetricsBook
+
+    Only bars after each ticker's last refreshed date are fetched (through
+    the same cached, rate-limited provider as the full pipeline); tickers
+    new to the book are seeded from start_date. The book is saved back
+    atomically and the metrics are written to output_dir.
+
+    Returns:
+        Refresh summary (also written to refresh_summary.json)
+    """
+    tickers = clean_tickers(tickers)
+    started = time.perf_counter()
+    path = Path(book_path) if book_path else project_root / INCREMENTAL_METRICS['path']
+
+    book = IncrementalMetricsBook.open(path, start_date)
+    known = sum(t in book.states for t in tickers)
+    analyzer = PerformanceAnalyzer()
+    metrics = book.refresh(analyzer.provider.get_history, tickers, end_date,
+                           max_workers=analyzer.max_workers)
+    book.save(path)
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    frame = BatchRunner._to_frame(metrics)
+    if not frame.empty:
+        frame['bars'] = [book.states[t].bars for t in frame['Ticker']]
+        frame['last_date'] = [book.states[t].last_date for t in frame['Ticker']]
+    BatchRunner._write_table(frame, output_dir / 'metrics', fmt)
+
+    summary = {
+        'tickers_requested': len(tickers),
+        'tickers_refreshed': len(metrics),
+        'tickers_seeded': len(metrics) - known,
+        'book': str(path),
+        'total_seconds': round(time.perf_counter() - started, 3)
+    }
+    (output_dir / 'refresh_summary.json').write_text(json.dumps(summary, indent=2))
+    return summary
+
+
+class BatchRunner:
+    """Shard the universe, fetch shards in parallel, merge and analyze once"""
+
+    def __init__(self, workers: Optional[int] = None, shard_size: Optional[int] = None,
+                 provider: Optional[DataProvider] = None):
+        self.workers = workers or min(os.cpu_count() or 1, 4)
+        self.shard_size = shard_size
+        self.provider = provider
+
+    def run(self, tickers: List[str], start_date: datetime, end_date: datetime,
+            output_dir, risk_threshold: float = 0.3, fmt: str = 'parquet',
+            risk_model: Optional[str] = None, save_risk_model: Optional[str] = None) -> Dict:
+        """
+        Run the full pipeline and write one file per result table
+
+        risk_model scores the universe against a saved model instead of
+        fitting a new one; save_risk_model persists the model fitted here.
+
+        Returns:
+            Throughput summary (also written to summary.json)
+        """
+        tickers = clean_tickers(tickers)
+        started = time.perf_counter()
+
+        shards = self._shards(tickers)
+        jobs = [(*shard, start_date, end_date) for shard in shards]
+        parallel = self.workers > 1 and len(shards) > 1
+        context = multiprocessing.get_context() if parallel else None
+        # One rate limit, concurrency limit and request budget for the whole
+        # run, shared by every worker rather than multiplied by them
+        fetcher = RateLimitedProvider.from_settings(
+            self.provider or create_provider(DATA_PROVIDER), FETCH_SETTINGS, context
+        )
+
+        partials = {}
+        if not parallel:
+            _init_worker(fetcher)
+            for job in jobs:
+                index, companies = _fetch_shard(job)
+                partials[index] = companies
+        else:
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                     initializer=_init_worker,
+                                     initargs=(fetcher,)) as executor:
+                for index, companies in executor.map(_fetch_shard, jobs):
+                    partials[index] = companies
+
+        # Merge partial results in shard order, then analyze the whole universe
+        companies = [c for index in sorted(partials) for c in partials[index]]
+        fetched = time.perf_counter()
+
+        results = analyze_companies(companies, tickers, start_date, end_date,
+                                    risk_threshold, risk_model, save_risk_model)
+        analyzed = time.perf_counter()
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for key in OUTPUT_TABLES:
+            self._write_table(self._to_frame(results[key]), output_dir / key, fmt)
+        if results['risk_timeline'] is not None:
+            timeline = results['risk_timeline'].frame().rename_axis('Date').reset_index()
+            self._write_table(timeline, output_dir / 'risk_timeline', fmt)
+        if results['event_study'] is not None:
+            self._write_table(pd.DataFrame(results['event_study'].records()),
+                              output_dir / 'event_study', fmt)
+
+        summary = {
+            'tickers_requested': len(tickers),
+            'companies_analyzed': len(companies),
+            'failed': len(tickers) - len(companies),
+            'shards': len(shards),
+            'workers': self.workers,
+            'fetch_seconds': round(fetched - started, 3),
+            'analysis_seconds': round(analyzed - fetched, 3),
+            'total_seconds': round(time.perf_counter() - started, 3),
+            'tickers_per_second': round(len(tickers) / max(analyzed - started, 1e-9), 2),
+            'metadata': {k: v for k, v in results['metadata'].items() if k != 'tickers'}
+        }
+        (output_dir / 'summary.json').write_text(json.dumps(summary, indent=2, default=str))
+        return summary
+
+    def _shards(self, tickers: List[str]) -> List[Tuple[int, List[str]]]:
+        size = self.shard_size or max(1, -(-len(tickers) // (self.workers * 4)))
+        return [
+            (index, tickers[start:start + size])
+            for index, start in enumerate(range(0, len(tickers), size))
+        ]
+
+    @staticmethod
+    def _to_frame(data) -> pd.DataFrame:
+        """Ticker-keyed dicts become rows with a Ticker column; lists become rows"""
+        if isinstance(data, dict):
+            return pd.DataFrame.from_dict(data, orient='index').rename_axis('Ticker').reset_index()
+        return pd.DataFrame(data)
+
+    @staticmethod
+    def _write_table(df: pd.DataFrame, path: Path, fmt: str):
+        if fmt == 'parquet':
+            df.to_parquet(path.with_suffix('.parquet'), index=False)
+        elif fmt == 'json':
+            df.to_json(path.with_suffix('.json'), orient='records', indent=2)
+        else:
+            raise ValueError(f"Unknown output format: {fmt}")
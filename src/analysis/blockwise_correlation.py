@@ -0,0 +1,245 @@
+"""
+Blockwise Correlation
+Tile-by-tile covariance / correlation for large return panels under a memory budget
+Optional Ledoit-Wolf shrinkage and top-k neighbour sparse output
+"""
+import numpy as np
+from typing import Optional, Tuple
+from scipy import sparse
+
+
+class BlockwiseCorrelation:
+    """
+    Covariance and correlation of a dates x tickers return panel, computed
+    in square column tiles so that only the standardized panel plus one
+    tile's working set is ever resident.
+
+    Missing returns are zero after demeaning, i.e. each ticker is centred
+    on its own mean and contributes nothing on days it didn't trade. The
+    covariance divides by the number of dates, matching
+    sklearn.covariance.ledoit_wolf on complete data.
+    """
+
+    def __init__(self, dtype='float32', memory_budget_mb: float = 256,
+                 shrinkage: Optional[str] = None):
+        """
+        Args:
+            dtype: Working precision ('float32' halves memory)
+            memory_budget_mb: Cap on the panel copy plus tile working memory
+                (the dense output, if requested, is extra)
+            shrinkage: None or 'ledoit_wolf'
+        """
+        if shrinkage not in (None, 'ledoit_wolf'):
+            raise ValueError(f"Unknown shrinkage: {shrinkage}")
+        self.dtype = np.dtype(dtype)
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.shrinkage = shrinkage
+
+    def covariance(self, returns: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dense tickers x tickers covariance (shrunk if configured)"""
+        x, coefficient, target = self._prepare(returns)
+        out = self._allocate(out, x.shape[1])
+        for rows, cols, tile in self._tiles(x):
+            tile *= coefficient
+            out[rows, cols] = tile
+            out[cols, rows] = tile.T
+        if target:
+            out[np.diag_indices_from(out)] += target
+        return out
+
+    def correlation(self, returns: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dense tickers x tickers correlation (from the shrunk covariance if configured)"""
+        x, coefficient, target = self._prepare(returns)
+        scale = self._inverse_std(x, coefficient, target)
+        out = self._allocate(out, x.shape[1])
+        for rows, cols, tile in self._tiles(x):
+            tile *= coefficient
+            tile *= scale[rows, None]
+            tile *= scale[None, cols]
+            out[rows, cols] = tile
+            out[cols, rows] = tile.T
+        self._fix_diagonal(out, scale)
+        return out
+
+    def top_k(self, returns: np.ndarray, k: int = 10) -> sparse.csr_matrix:
+        """
+        Each ticker's k most correlated other tickers (by absolute value)
+
+        Returns:
+            CSR matrix with k stored correlations per row
+        """
+        x, coefficient, target = self._prepare(returns)
+        scale = self._inverse_std(x, coefficient, target)
+        n = x.shape[1]
+        k = min(k, n - 1)
+        # tile, candidate copy, abs values and int64 partition indices per cell
+        block = self._block_size(x.shape, 3 * self.dtype.itemsize + 8, extra_cells=k)
+
+        indptr = np.arange(0, n * k + 1, k)
+        indices = np.empty(n * k, dtype=np.int64)
+        data = np.empty(n * k, dtype=self.dtype)
+
+        for start in range(0, n, block):
+            rows = slice(start, min(start + block, n))
+            size = rows.stop - rows.start
+            best_idx = np.zeros((size, 0), dtype=np.int64)
+            best_val = np.zeros((size, 0), dtype=self.dtype)
+
+            for col_start in range(0, n, block):
+                cols = slice(col_start, min(col_start + block, n))
+                tile = x[:, rows].T @ x[:, cols]
+                tile *= coefficient
+                tile *= scale[rows, None]
+                tile *= scale[None, cols]
+                np.nan_to_num(tile, copy=False)
+                # A ticker is not its own neighbour
+                own = np.arange(max(rows.start, cols.start), min(rows.stop, cols.stop))
+                tile[own - rows.start, own - cols.start] = 0
+
+                # Candidates: the running best (positions < kept) then this tile
+                kept = best_val.shape[1]
+                candidates = np.hstack([best_val, tile])
+                del tile
+                if candidates.shape[1] > k:
+                    keep = np.argpartition(np.abs(candidates), -k, axis=1)[:, -k:].copy()
+                else:
+                    keep = np.broadcast_to(np.arange(candidates.shape[1]), candidates.shape)
+                best_val = np.take_along_axis(candidates, keep, axis=1)
+                from_tile = keep >= kept
+                best_idx = np.where(
+                    from_tile,
+                    keep - kept + cols.start,
+                    np.take_along_axis(best_idx, np.where(from_tile, 0, keep), axis=1)
+                    if kept else 0
+                )
+                del candidates
+
+            order = np.argsort(-np.abs(best_val), axis=1)
+            span = slice(rows.start * k, rows.stop * k)
+            indices[span] = np.take_along_axis(best_idx, order, axis=1).ravel()
+            data[span] = np.take_along_axis(best_val, order, axis=1).ravel()
+
+        return sparse.csr_matrix((data, indices, indptr), shape=(n, n))
+
+    def shrinkage_intensity(self, returns: np.ndarray) -> float:
+        """Ledoit-Wolf shrinkage coefficient for this panel"""
+        x = self._standardize(returns)
+        return self._ledoit_wolf(x)[0]
+
+    def _prepare(self, returns: np.ndarray) -> Tuple[np.ndarray, float, float]:
+        """
+        Centred panel plus the affine map tile -> covariance:
+        cov = coefficient * (x.T @ x) + target * I
+        """
+        x = self._standardize(returns)
+        n_samples = x.shape[0]
+        if self.shrinkage == 'ledoit_wolf':
+            shrinkage, mu = self._ledoit_wolf(x)
+            return x, (1 - shrinkage) / n_samples, shrinkage * mu
+        return x, 1.0 / n_samples, 0.0
+
+    def _standardize(self, returns: np.ndarray) -> np.ndarray:
+        """Demean each ticker over its valid days; missing days become zero"""
+        returns = np.asarray(returns)
+        # Column-major so column tiles are contiguous views
+        x = np.empty(returns.shape, dtype=self.dtype, order='F')
+        for cols in self._column_blocks(returns.shape):
+            block = returns[:, cols].astype(np.float64)
+            valid = ~np.isnan(block)
+            with np.errstate(invalid='ignore'):
+                means = np.where(valid, block, 0).sum(axis=0) / valid.sum(axis=0)
+            x[:, cols] = np.where(valid, block - np.nan_to_num(means), 0)
+        return x
+
+    def _column_sumsq(self, x: np.ndarray) -> np.ndarray:
+        """Per-ticker sum of squares in float64, a column block at a time"""
+        return np.concatenate([
+            (x[:, cols].astype(np.float64) ** 2).sum(axis=0)
+            for cols in self._column_blocks(x.shape)
+        ])
+
+    def _column_blocks(self, shape: Tuple[int, int]):
+        """Column slices whose float64 working copies stay within the budget"""
+        n_dates, n_features = shape
+        width = max(1, min(n_features, self.memory_budget // (8 * 8 * max(n_dates, 1))))
+        for start in range(0, n_features, width):
+            yield slice(start, min(start + width, n_features))
+
+    def _ledoit_wolf(self, x: np.ndarray) -> Tuple[float, float]:
+        """Shrinkage towards mu * I, accumulated tile by tile (as in sklearn)"""
+        n_samples, n_features = x.shape
+        trace = float(self._column_sumsq(x).sum()) / n_samples
+        if n_features == 1:
+            return 0.0, trace
+        mu = trace / n_features
+
+        beta, delta = 0.0, 0.0
+        for rows, cols, tile in self._tiles(x, squared=True):
+            # Off-diagonal tiles stand for themselves and their mirror
+            weight = 1 if rows == cols else 2
+            products, squared = tile
+            delta += weight * float((products.astype(np.float64) ** 2).sum())
+            beta += weight * float(squared.sum(dtype=np.float64))
+        delta /= n_samples ** 2
+
+        beta = (beta / n_samples - delta) / (n_features * n_samples)
+        delta = (delta - 2 * mu * trace + n_features * mu ** 2) / n_features
+        beta = min(beta, delta)
+        return (0.0 if beta == 0 else beta / delta), mu
+
+    def _inverse_std(self, x: np.ndarray, coefficient: float, target: float) -> np.ndarray:
+        variance = coefficient * self._column_sumsq(x) + target
+        with np.errstate(divide='ignore'):
+            scale = np.where(variance > 0, 1 / np.sqrt(variance), np.nan)
+        return scale.astype(self.dtype)
+
+    @staticmethod
+    def _fix_diagonal(out: np.ndarray, scale: np.ndarray):
+        out[np.diag_indices_from(out)] = np.where(np.isnan(scale), np.nan, 1.0)
+
+    def _allocate(self, out: Optional[np.ndarray], n: int) -> np.ndarray:
+        if out is None:
+            return np.empty((n, n), dtype=self.dtype)
+        if out.shape != (n, n):
+            raise ValueError(f"out must have shape {(n, n)}, got {out.shape}")
+        return out
+
+    def _tiles(self, x: np.ndarray, squared: bool = False):
+        """
+        Yield (rows, cols, x[:, rows].T @ x[:, cols]) for the upper-triangle
+        tiles; with squared=True the tile is (products, squared products)
+        """
+        n = x.shape[1]
+        if squared:
+            # two product tiles plus a float64 copy, and two squared column slices
+            block = self._block_size(x.shape, 2 * self.dtype.itemsize + 8,
+                                     bytes_per_column=2 * x.shape[0] * self.dtype.itemsize)
+        else:
+            block = self._block_size(x.shape, 2 * self.dtype.itemsize)
+        for start in range(0, n, block):
+            rows = slice(start, min(start + block, n))
+            for col_start in range(start, n, block):
+                cols = slice(col_start, min(col_start + block, n))
+                tile = x[:, rows].T @ x[:, cols]
+                if squared:
+                    tile = (tile, (x[:, rows] ** 2).T @ (x[:, cols] ** 2))
+                yield rows, cols, tile
+
+    def _block_size(self, shape: Tuple[int, int], bytes_per_cell: int,
+                    bytes_per_column: int = 0, extra_cells: int = 0) -> int:
+        """
+        Largest tile width b whose working set fits the budget left after
+        the panel copy: bytes_per_cell for each of the b x (b + extra_cells)
+        tile cells plus bytes_per_column for each of the b columns
+        """
+        n_dates, n_features = shape
+        available = self.memory_budget - n_dates * n_features * self.dtype.itemsize
+        a = bytes_per_cell
+        c = bytes_per_cell * extra_cells + bytes_per_column
+        if available <= a + c:
+            raise MemoryError(
+                f"Memory budget of {self.memory_budget / 1024 ** 2:.0f} MB is too small "
+                f"for a {n_dates} x {n_features} return panel"
+            )
+        block = int((-c + np.sqrt(c * c + 4 * a * available)) / (2 * a))
+        return max(1, min(block, n_features))
@@ -0,0 +1,138 @@
+"""
+Correlation Analyzer
+Sector and ticker correlations of aligned daily returns
+Replaces the sector loop formerly in DashboardComponents
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+import sys
+sys.path.append('..')
+from config import CORRELATION_SETTINGS
+from .blockwise_correlation import BlockwiseCorrelation
+from .price_panel import PricePanel
+from .risk_features import daily_returns
+
+CORRELATION_METHODS = ('full', 'rolling', 'ewm')
+
+
+def weighted_corr(returns: np.ndarray, weights: Optional[np.ndarray] = None,
+                  min_periods: int = 2) -> np.ndarray:
+    """
+    Pairwise-complete (weighted) Pearson correlation of every column pair
+
+    NaNs are handled with a validity mask, so the whole matrix comes out of
+    a handful of matrix products instead of a loop over pairs.
+
+    Args:
+        returns: dates x series array, NaN where missing
+        weights: Optional per-date weights (e.g. exponential decay)
+        min_periods: Pairs with fewer overlapping dates are NaN
+    """
+    valid = ~np.isnan(returns)
+    x = np.where(valid, returns, 0.0)
+    mask = valid.astype(np.float64)
+    overlap = mask.T @ mask               # overlapping dates per pair
+    if weights is not None:
+        mask = mask * weights[:, None]
+    wx = x * mask
+
+    n = mask.T @ valid                    # weighted overlap
+    sx = wx.T @ valid                     # sum of x_i where x_j valid
+    sxx = (wx * x).T @ valid              # sum of x_i^2 where x_j valid
+    sxy = wx.T @ x                        # sum of x_i * x_j
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_i = sx / n
+        mean_j = mean_i.T
+        cov = sxy / n - mean_i * mean_j
+        var_i = sxx / n - mean_i ** 2
+        corr = cov / np.sqrt(var_i * var_i.T)
+
+    corr[overlap < min_periods] = np.nan
+    corr = np.clip(corr, -1.0, 1.0)
+    np.fill_diagonal(corr, np.where(np.diag(overlap) >= min_periods, 1.0, np.nan))
+    return corr
+
+
+class CorrelationAnalyzer:
+    """Correlation matrices for the sector view and ticker drill-down"""
+
+    def __init__(self):
+        self.settings = CORRELATION_SETTINGS
+
+    def analyze_correlations(self, companies) -> Dict:
+        """
+        Args:
+            companies: List of CompanyData objects or a PricePanel
+
+        Returns:
+            {'sector': {method: DataFrame}, 'ticker': DataFrame or None,
+            'ticker_neighbors': {'tickers', 'matrix'} or None} for each method
+            in CORRELATION_METHODS. Above max_ticker_matrix tickers the dense
+            ticker matrix is replaced by a sparse top-k neighbour matrix.
+        """
+        panel = companies if isinstance(companies, PricePanel) else \
+            PricePanel.from_companies(companies, fields=('Close',))
+        returns = daily_returns(panel.field('Close'))
+        sectors, sector_returns = self.sector_returns(panel, returns)
+
+        result = {
+            'sector': {
+                method: self._frame(self.correlate(sector_returns, method), sectors)
+                for method in CORRELATION_METHODS
+            },
+            'ticker': None,
+            'ticker_neighbors': None
+        }
+        tickers = list(panel.tickers)
+        if len(panel) <= self.settings['max_ticker_matrix']:
+            if self.settings['shrinkage']:
+                matrix = self.blockwise().correlation(returns)
+            else:
+                matrix = self.correlate(returns, 'full')
+            result['ticker'] = self._frame(matrix, tickers)
+        elif len(panel) > 1:
+            result['ticker_neighbors'] = {
+                'tickers': tickers,
+                'matrix': self.blockwise().top_k(returns, self.settings['top_k'])
+            }
+        return result
+
+    def blockwise(self) -> BlockwiseCorrelation:
+        """Memory-bounded engine for large universes"""
+        return BlockwiseCorrelation(
+            dtype=self.settings['dtype'],
+            memory_budget_mb=self.settings['memory_budget_mb'],
+            shrinkage=self.settings['shrinkage']
+        )
+
+    @staticmethod
+    def sector_returns(panel: PricePanel, returns: np.ndarray):
+        """Equal-weight daily sector returns via one membership matrix product"""
+        sectors = sorted(set(c.sector for c in panel))
+        index = {sector: i for i, sector in enumerate(sectors)}
+        membership = np.zeros((len(panel), len(sectors)))
+        membership[np.arange(len(panel)), [index[c.sector] for c in panel]] = 1.0
+
+        valid = ~np.isnan(returns)
+        with np.errstate(invalid='ignore'):
+            means = (np.where(valid, returns, 0.0) @ membership) / (valid @ membership)
+        return sectors, means
+
+    def correlate(self, returns: np.ndarray, method: str = 'full') -> np.ndarray:
+        """Correlation over the full history, a trailing window, or EWM-weighted"""
+        min_periods = self.settings['min_periods']
+        if method == 'full':
+            return weighted_corr(returns, min_periods=min_periods)
+        if method == 'rolling':
+            return weighted_corr(returns[-self.settings['rolling_window']:], min_periods=min_periods)
+        if method == 'ewm':
+            age = np.arange(len(returns))[::-1]
+            weights = 0.5 ** (age / self.settings['ewm_halflife'])
+            return weighted_corr(returns, weights, min_periods=min_periods)
+        raise ValueError(f"Unknown correlation method: {method}")
+
+    @staticmethod
+    def _frame(matrix: np.ndarray, labels: List[str]) -> pd.DataFrame:
+        return pd.DataFrame(matrix, index=labels, columns=labels)
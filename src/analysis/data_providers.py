@@ -0,0 +1,188 @@
+"""
+Data Providers
+Pluggable sources for OHLCV price history and company metadata
+Used by PerformanceAnalyzer.fetch_companies
+"""
+import logging
+import pandas as pd
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+
+# Trailing UTC offset of an ISO timestamp: Z, +05:30, -0400
+UTC_OFFSET = r'(?:(?P<zulu>Z)|(?P<sign>[+-])(?P<hours>\d{2}):?(?P<minutes>\d{2}))$'
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitError(Exception):
+    """Raised by a provider when the upstream source throttles (HTTP 429)"""
+
+
+class DataProvider(ABC):
+    """Interface for price history and company metadata sources"""
+
+    name = 'base'
+
+    @abstractmethod
+    def get_history(self, ticker: str, start_date: datetime,
+                    end_date: datetime) -> pd.DataFrame:
+        """
+        Return daily OHLCV history indexed by Date
+        The end date is exclusive, matching yfinance
+        """
+
+    @abstractmethod
+    def get_info(self, ticker: str) -> Dict:
+        """Return company metadata (longName, sector, industry, currency)"""
+
+
+class YahooFinanceProvider(DataProvider):
+    """Fetch data over the network from Yahoo Finance"""
+
+    name = 'yahoo'
+
+    def get_history(self, ticker: str, start_date: datetime,
+                    end_date: datetime) -> pd.DataFrame:
+        import yfinance as yf
+        with self._translate_rate_limit():
+            return yf.Ticker(ticker).history(start=start_date, end=end_date)
+
+    def get_info(self, ticker: str) -> Dict:
+        import yfinance as yf
+        with self._translate_rate_limit():
+            return yf.Ticker(ticker).info or {}
+
+    @staticmethod
+    @contextmanager
+    def _translate_rate_limit():
+        """Surface yfinance throttling as RateLimitError so it is retried"""
+        try:
+            yield
+        except Exception as e:
+            if type(e).__name__ == 'YFRateLimitError':
+                raise RateLimitError(str(e)) from e
+            raise
+
+
+class LocalFileProvider(DataProvider):
+    """
+    Read data from a directory of Parquet/CSV files
+
+    Layout:
+        <directory>/<TICKER>.parquet or <TICKER>.csv   - Date + OHLCV columns
+        <directory>/metadata.parquet or metadata.csv   - one row per ticker
+    """
+
+    name = 'local'
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self._metadata: Optional[Dict[str, Dict]] = None
+
+    def get_history(self, ticker: str, start_date: datetime,
+                    end_date: datetime) -> pd.DataFrame:
+        path = self._find_file(ticker)
+        if path is None:
+            return pd.DataFrame(columns=PRICE_COLUMNS)
+
+        try:
+            data = self._read_table(path)
+            if 'Date' in data.columns:
+                data = data.set_index('Date')
+            data.index = parse_dates(data.index)
+        except Exception as e:
+            logger.warning("Could not read price history for %s from %s: %s", ticker, path, e)
+            raise
+        data.index.name = 'Date'
+
+        return slice_dates(data.sort_index(), start_date, end_date)
+
+    def get_info(self, ticker: str) -> Dict:
+        if self._metadata is None:
+            self._metadata = self._load_metadata()
+        return dict(self._metadata.get(ticker, {}))
+
+    def _find_file(self, ticker: str) -> Optional[Path]:
+        for suffix in ('.parquet', '.csv'):
+            path = self.directory / f"{ticker}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _load_metadata(self) -> Dict[str, Dict]:
+        path = self._find_file('metadata')
+        if path is None:
+            return {}
+
+        df = self._read_table(path)
+        df.columns = [str(c) for c in df.columns]
+        ticker_col = 'ticker' if 'ticker' in df.columns else 'Ticker'
+        return {
+            row.pop(ticker_col): {k: v for k, v in row.items() if pd.notna(v)}
+            for row in df.to_dict('records')
+        }
+
+    @staticmethod
+    def _read_table(path: Path) -> pd.DataFrame:
+        if path.suffix == '.parquet':
+            return pd.read_parquet(path)
+        return pd.read_csv(path)
+
+
+def parse_dates(values) -> pd.DatetimeIndex:
+    """
+    DatetimeIndex from a stored Date column
+
+    Timestamps written with a UTC offset (yfinance CSVs switch between
+    -05:00 and -04:00 across DST) are parsed as UTC and shifted back by
+    their own offset, giving naive exchange-local dates. Datetime columns
+    (e.g. from Parquet) are kept as they are.
+    """
+    index = pd.Index(values)
+    if isinstance(index, pd.DatetimeIndex):
+        return index
+
+    text = index.astype(str).str.strip()
+    offsets = text.str.extract(UTC_OFFSET)
+    if offsets['sign'].isna().all() and offsets['zulu'].isna().all():
+        return pd.DatetimeIndex(pd.to_datetime(text))
+
+    sign = offsets['sign'].map({'+': 1, '-': -1}).fillna(0)
+    minutes = sign * (offsets['hours'].astype(float).fillna(0) * 60
+                      + offsets['minutes'].astype(float).fillna(0))
+    utc = pd.DatetimeIndex(pd.to_datetime(text, utc=True))
+    return utc.tz_localize(None) + pd.to_timedelta(minutes.to_numpy(), unit='m')
+
+
+def slice_dates(data: pd.DataFrame, start_date: datetime,
+                end_date: datetime) -> pd.DataFrame:
+    """Select rows in [start_date, end_date), honouring a tz-aware index"""
+    start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    tz = getattr(data.index, 'tz', None)
+    if tz is not None:
+        start = start.tz_localize(tz) if start.tzinfo is None else start.tz_convert(tz)
+        end = end.tz_localize(tz) if end.tzinfo is None else end.tz_convert(tz)
+    return data[(data.index >= start) & (data.index < end)]
+
+
+PROVIDERS = {
+    YahooFinanceProvider.name: YahooFinanceProvider,
+    LocalFileProvider.name: LocalFileProvider
+}
+
+
+def create_provider(config: Dict) -> DataProvider:
+    """
+    Build a provider from a config dict
+    e.g. {'type': 'local', 'directory': 'data/prices'}
+    """
+    options = dict(config)
+    provider_type = options.pop('type', YahooFinanceProvider.name)
+    if provider_type not in PROVIDERS:
+        raise ValueError(f"Unknown data provider: {provider_type}")
+    return PROVIDERS[provider_type](**options)
@@ -0,0 +1,75 @@
+"""
+Downsampling
+Shape-preserving point reduction for chart series
+Keeps peaks and drawdown troughs that a fixed stride would drop
+"""
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: indices of n_out points that best
+    preserve the visual shape of (x, y). First and last points are kept.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n_out - 2 buckets over the interior points; the last point is its own bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    edges = np.append(edges, n)
+
+    # Bucket averages via cumulative sums (bucket i+1 is the "next" for bucket i)
+    cx = np.concatenate([[0.0], np.cumsum(x)])
+    cy = np.concatenate([[0.0], np.cumsum(y)])
+    sizes = np.maximum(edges[1:] - edges[:-1], 1)
+    avg_x = (cx[edges[1:]] - cx[edges[:-1]]) / sizes
+    avg_y = (cy[edges[1:]] - cy[edges[:-1]]) / sizes
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return np.unique(selected)
+
+
+def minmax_buckets(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Keep the minimum and maximum of each of n_out // 2 equal buckets,
+    plus the first and last points. Fully vectorized.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = n_out // 2
+    bucket = (np.arange(n) * n_buckets) // n
+    order = np.lexsort((y, bucket))
+    starts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    return np.unique(np.concatenate([[0, n - 1], order[starts], order[ends]]))
+
+
+DOWNSAMPLERS = {
+    'lttb': lambda x, y, n_out: lttb(x, y, n_out),
+    'minmax': lambda x, y, n_out: minmax_buckets(y, n_out)
+}
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int, method: str = 'lttb') -> np.ndarray:
+    """Indices of at most ~n_out points using the named method"""
+    if method not in DOWNSAMPLERS:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return DOWNSAMPLERS[method](x, y, n_out)
@@ -0,0 +1,181 @@
+"""
+Event Study
+Market-model abnormal returns around disruption events
+Batched over tickers x events on the aligned price panel
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+import sys
+sys.path.append('..')
+from config import EVENT_STUDY
+from .price_panel import PricePanel
+from .risk_features import daily_returns
+
+
+class EventStudyResult:
+    """Abnormal returns as an events x offsets x tickers float32 array"""
+
+    def __init__(self, events: List[Dict], tickers: List[str], names: List[str],
+                 sectors: List[str], offsets: np.ndarray, abnormal: np.ndarray,
+                 alpha: np.ndarray, beta: np.ndarray, residual_std: np.ndarray,
+                 windows: Dict[str, Tuple[int, int]]):
+        self.events = events
+        self.tickers = tickers
+        self.names = names
+        self.sectors = sectors
+        self.offsets = offsets
+        self.abnormal = abnormal
+        self.alpha = alpha
+        self.beta = beta
+        self.residual_std = residual_std
+        self.windows = windows
+
+    def car(self, window: Tuple[int, int]) -> np.ndarray:
+        """Cumulative abnormal return (%) over [start, end] offsets, events x tickers"""
+        start, end = window
+        span = (self.offsets >= start) & (self.offsets <= end)
+        values = self.abnormal[:, span, :]
+        car = np.nansum(values, axis=1) * 100
+        car[np.isnan(values).all(axis=1)] = np.nan
+        return car
+
+    def car_path(self, event_index: int) -> np.ndarray:
+        """Running CAR (%) across the offsets for one event, offsets x tickers"""
+        return np.nancumsum(self.abnormal[event_index], axis=0) * 100
+
+    def sector_car_paths(self, event_index: int) -> pd.DataFrame:
+        """Sector-average running CAR (%) by offset, long format for charting"""
+        paths = self.car_path(event_index)
+        fitted = ~np.isnan(self.beta[event_index])
+        frames = []
+        for sector in sorted(set(self.sectors)):
+            members = np.array([s == sector for s in self.sectors]) & fitted
+            if members.any():
+                frames.append(pd.DataFrame({
+                    'Offset': self.offsets,
+                    'Sector': sector,
+                    'CAR_pct': paths[:, members].mean(axis=1).round(2)
+                }))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def records(self) -> List[Dict]:
+        """One row per event and ticker with market-model fit and CAR per window"""
+        cars = {name: self.car(window) for name, window in self.windows.items()}
+        rows = []
+        for e, event in enumerate(self.events):
+            for i, ticker in enumerate(self.tickers):
+                if np.isnan(self.beta[e, i]):
+                    continue
+                row = {
+                    'Event': event['name'],
+                    'Event_Date': event['date'],
+                    'Ticker': ticker,
+                    'Company': self.names[i],
+                    'Sector': self.sectors[i],
+                    'Alpha': round(float(self.alpha[e, i]), 6),
+                    'Beta': round(float(self.beta[e, i]), 3)
+                }
+                for name, window in self.windows.items():
+                    car = cars[name][e, i]
+                    days = window[1] - window[0] + 1
+                    row[f'{name}_pct'] = round(float(car), 2)
+                    row[f'{name}_t'] = round(
+                        float(car / 100 / (self.residual_std[e, i] * np.sqrt(days))), 2
+                    )
+                rows.append(row)
+        return rows
+
+
+class EventStudy:
+    """Market-model event study over the aligned price panel"""
+
+    def __init__(self, settings: Optional[Dict] = None):
+        self.settings = settings or EVENT_STUDY
+
+    def analyze_events(self, companies, events: Optional[List[Dict]] = None) -> Optional[EventStudyResult]:
+        """
+        Args:
+            companies: List of CompanyData objects or a PricePanel
+            events: [{'name', 'date'}]; defaults to EVENT_STUDY['events']
+
+        Returns:
+            EventStudyResult, or None if no event falls inside the panel
+            with a full estimation window
+        """
+        settings = self.settings
+        panel = companies if isinstance(companies, PricePanel) else \
+            PricePanel.from_companies(companies, fields=('Close',))
+        events = events if events is not None else settings['events']
+
+        returns = daily_returns(panel.field('Close'))
+        market = self._market_returns(panel, returns)
+
+        # Each event is anchored on the first trading day on/after its date
+        dates = panel.dates
+        anchors = np.array([
+            dates.searchsorted(pd.Timestamp(event['date'])) for event in events
+        ], dtype=np.int64)
+        est_start, est_end = settings['estimation_window']
+        win_start = min(w[0] for w in settings['windows'].values())
+        win_end = max(w[1] for w in settings['windows'].values())
+        usable = (anchors + est_start >= 1) & (anchors + win_end < len(dates))
+        if not usable.any():
+            return None
+        events = [event for event, ok in zip(events, usable) if ok]
+        anchors = anchors[usable]
+
+        alpha, beta, resid_std = self._market_model(
+            returns, market, anchors[:, None] + np.arange(est_start, est_end + 1)
+        )
+
+        offsets = np.arange(win_start, win_end + 1)
+        rows = anchors[:, None] + offsets                       # events x offsets
+        expected = alpha[:, None, :] + beta[:, None, :] * market[rows]
+        abnormal = (returns[rows] - expected).astype(np.float32)
+
+        return EventStudyResult(
+            events, list(panel.tickers), [c.name for c in panel], [c.sector for c in panel],
+            offsets, abnormal, alpha, beta, resid_std, settings['windows']
+        )
+
+    @staticmethod
+    def _market_returns(panel: PricePanel, returns: np.ndarray) -> np.ndarray:
+        """
+        Equal-weight return of the panel, one column per ticker with that
+        ticker left out so it is not regressed on itself
+        """
+        valid = ~np.isnan(returns)
+        zeroed = np.where(valid, returns, 0.0)
+        total = zeroed.sum(axis=1, keepdims=True) - zeroed
+        count = valid.sum(axis=1, keepdims=True) - valid
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(count > 0, total / count, np.nan)
+
+    def _market_model(self, returns: np.ndarray, market: np.ndarray, rows: np.ndarray):
+        """
+        OLS of R_i = alpha + beta * R_m for every event x ticker at once
+
+        rows holds each event's estimation-window row indices. Missing
+        days are masked, so the closed-form normal equations are solved
+        from masked sums in one broadcasted pass.
+        """
+        y = returns[rows]                                       # events x days x tickers
+        x = market[rows]
+        mask = ~(np.isnan(y) | np.isnan(x))
+        y = np.where(mask, y, 0.0)
+        x = np.where(mask, x, 0.0)
+
+        n = mask.sum(axis=1)
+        sx, sy = x.sum(axis=1), y.sum(axis=1)
+        sxx, sxy = (x * x).sum(axis=1), (x * y).sum(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            beta = (n * sxy - sx * sy) / (n * sxx - sx ** 2)
+            alpha = (sy - beta * sx) / n
+            residual = np.where(mask, y - alpha[:, None, :] - beta[:, None, :] * x, 0.0)
+            resid_std = np.sqrt((residual ** 2).sum(axis=1) / (n - 2))
+
+        too_short = n < self.settings['min_estimation_days']
+        for values in (alpha, beta, resid_std):
+            values[too_short] = np.nan
+        return alpha, beta, resid_std
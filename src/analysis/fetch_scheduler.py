@@ -0,0 +1,167 @@
+"""
+Fetch Scheduler
+Rate limiting, retries and request budgeting for data providers
+Used by PerformanceAnalyzer.fetch_companies for concurrent fetching
+"""
+import random
+import threading
+import time
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Optional
+from requests.exceptions import HTTPError, RequestException
+
+from .data_providers import DataProvider, RateLimitError
+
+# Retried with backoff; requests' (and so yfinance's) errors subclass neither builtin
+TRANSIENT_ERRORS = (RateLimitError, ConnectionError, TimeoutError, RequestException)
+
+
+class RequestBudgetExceeded(Exception):
+    """Raised when a run has used up its request budget"""
+
+
+class TokenBucket:
+    """
+    Token bucket: `rate` tokens per second, up to `capacity`.
+    Thread-safe; built with a multiprocessing context, its state is also
+    shared by every worker process it is passed to.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, context=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        # [tokens, last refill time]
+        if context is None:
+            self._state = [self.capacity, time.monotonic()]
+            self._lock = threading.Lock()
+        else:
+            self._state = context.Array('d', [self.capacity, time.monotonic()], lock=False)
+            self._lock = context.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._state[0], self._state[1]
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+                self._state[1] = now
+
+                if tokens >= 1:
+                    self._state[0] = tokens - 1
+                    return
+                self._state[0] = tokens
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
+
+
+class RequestBudget:
+    """
+    Cap on the number of requests issued during one run; shared across
+    processes like TokenBucket when built with a multiprocessing context
+    """
+
+    def __init__(self, max_requests: Optional[int] = None, context=None):
+        self.max_requests = max_requests
+        if context is None:
+            self._used = [0]
+            self._lock = threading.Lock()
+        else:
+            self._used = context.Array('q', [0], lock=False)
+            self._lock = context.Lock()
+
+    @property
+    def used(self) -> int:
+        return int(self._used[0])
+
+    def consume(self):
+        with self._lock:
+            if self.max_requests is not None and self._used[0] >= self.max_requests:
+                raise RequestBudgetExceeded(
+                    f"request budget of {self.max_requests} exhausted"
+                )
+            self._used[0] += 1
+
+
+class RateLimitedProvider(DataProvider):
+    """
+    Wrap a provider with a concurrency limit, a token-bucket rate limiter,
+    retries with jittered exponential backoff and a per-run request budget
+
+    With a multiprocessing context the limits live in shared memory, so
+    worker processes handed this provider (e.g. batch shards) draw on one
+    rate, concurrency limit and budget instead of each getting their own.
+    """
+
+    def __init__(self, provider: DataProvider, max_concurrency: int = 4,
+                 requests_per_second: Optional[float] = None,
+                 burst: Optional[float] = None, max_retries: int = 3,
+                 backoff_base: float = 0.5, backoff_max: float = 30.0,
+                 request_budget: Optional[int] = None, context=None):
+        self.provider = provider
+        self.name = provider.name
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._context = context
+        self._slots = (context or threading).BoundedSemaphore(max_concurrency)
+        self._bucket = TokenBucket(requests_per_second, burst, context) \
+            if requests_per_second else None
+        self.budget = RequestBudget(request_budget, context)
+
+    @classmethod
+    def from_settings(cls, provider: DataProvider, settings: Dict,
+                      context=None) -> 'RateLimitedProvider':
+        """Build from FETCH_SETTINGS, applying the provider's own limits"""
+        if isinstance(provider, cls):
+            return provider
+
+        limits = settings.get('provider_limits', {}).get(provider.name, {})
+        return cls(
+            provider,
+            max_concurrency=limits.get('max_concurrency', 4),
+            requests_per_second=limits.get('requests_per_second'),
+            burst=limits.get('burst'),
+            max_retries=settings.get('max_retries', 3),
+            backoff_base=settings.get('backoff_base', 0.5),
+            request_budget=settings.get('request_budget'),
+            context=context
+        )
+
+    def reset_budget(self, max_requests: Optional[int] = None):
+        """Start a new run with a fresh request budget"""
+        self.budget = RequestBudget(max_requests, self._context)
+
+    def get_history(self, ticker: str, start_date: datetime,
+                    end_date: datetime) -> pd.DataFrame:
+        return self._call(self.provider.get_history, ticker, start_date, end_date)
+
+    def get_info(self, ticker: str) -> Dict:
+        return self._call(self.provider.get_info, ticker)
+
+    def _call(self, func, *args):
+        """Issue one request, retrying throttled or transient failures"""
+        for attempt in range(self.max_retries + 1):
+            self.budget.consume()
+            if self._bucket:
+                self._bucket.acquire()
+
+            try:
+                with self._slots:
+                    return func(*args)
+            except TRANSIENT_ERRORS as e:
+                if attempt == self.max_retries or not _is_transient(e):
+                    raise
+                # Full jitter keeps concurrent workers from retrying in lockstep
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                time.sleep(random.uniform(0, delay))
+
+
+def _is_transient(error: Exception) -> bool:
+    """HTTP client errors (404, 401, ...) other than 429 fail the same way again"""
+    if isinstance(error, HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status >= 500 or status == 429
+    return True
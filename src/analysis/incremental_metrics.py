@@ -0,0 +1,262 @@
+"""
+Incremental Metrics
+Online per-ticker metric state updated one bar at a time in O(1)
+Produces the same metrics dict as CompanyData / metrics_kernel.compute_metrics
+"""
+import logging
+import math
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .metrics_kernel import TRADING_DAYS, VOLATILITY_WINDOW, VOLATILITY_MIN_PERIODS
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalMetrics:
+    """
+    Running metric state for one ticker
+
+    - return: first close kept as the base
+    - volatility: sliding-window Welford mean/M2 of daily returns, with
+      a running mean of the annualized values (warm-up back-filled)
+    - drawdown: running peak and worst decline from it
+    """
+
+    __slots__ = ('window', 'min_periods', 'first_close', 'last_close', 'peak',
+                 'max_drawdown', '_returns', '_mean', '_m2', '_warmup',
+                 '_vol_sum', '_vol_count', 'bars', 'last_date')
+
+    def __init__(self, window: int = VOLATILITY_WINDOW,
+                 min_periods: int = VOLATILITY_MIN_PERIODS):
+        self.window = window
+        self.min_periods = min_periods
+        self.first_close = None
+        self.last_close = None
+        self.peak = None
+        self.max_drawdown = 0.0
+        self._returns = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._warmup = 0          # bars seen before the first volatility value
+        self._vol_sum = 0.0
+        self._vol_count = 0
+        self.bars = 0
+        self.last_date: Optional[pd.Timestamp] = None
+
+    @classmethod
+    def from_history(cls, closes: Iterable[float], dates: Optional[Iterable] = None,
+                     **kwargs) -> 'IncrementalMetrics':
+        """Seed the state from an existing close history"""
+        state = cls(**kwargs)
+        if dates is None:
+            for close in closes:
+                state.update(close)
+        else:
+            for close, date in zip(closes, dates):
+                state.update(close, date)
+        return state
+
+    def update(self, close: float, date=None):
+        """Add one new bar (date records how far the state has been refreshed)"""
+        close = float(close)
+        if math.isnan(close):
+            return
+        self.bars += 1
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+
+        if self.first_close is None:
+            self.first_close = self.last_close = self.peak = close
+            self._warmup += 1
+            return
+
+        self._push_return(close / self.last_close - 1)
+        self.last_close = close
+
+        # Rolling volatility
+        if len(self._returns) >= max(self.min_periods, 2):
+            vol = math.sqrt(max(self._m2, 0.0) / (len(self._returns) - 1)) * math.sqrt(TRADING_DAYS)
+            if self._vol_count == 0:
+                # Back-fill the warm-up bars with the first full value
+                self._vol_sum += self._warmup * vol
+                self._vol_count += self._warmup
+                self._warmup = 0
+            self._vol_sum += vol
+            self._vol_count += 1
+        else:
+            self._warmup += 1
+
+        # Drawdown from the running peak
+        self.peak = max(self.peak, close)
+        self.max_drawdown = min(self.max_drawdown, close / self.peak - 1)
+
+    def _push_return(self, value: float):
+        """Welford update for a sliding window: evict the oldest, add the newest"""
+        if len(self._returns) == self.window:
+            old = self._returns.popleft()
+            n = len(self._returns)
+            if n == 0:
+                self._mean, self._m2 = 0.0, 0.0
+            else:
+                delta = old - self._mean
+                self._mean -= delta / n
+                self._m2 -= delta * (old - self._mean)
+
+        self._returns.append(value)
+        delta = value - self._mean
+        self._mean += delta / len(self._returns)
+        self._m2 += delta * (value - self._mean)
+
+    @property
+    def metrics(self) -> dict:
+        """Current metrics in the CompanyData.metrics format"""
+        if self.first_close is None:
+            return {'return': float('nan'), 'volatility': float('nan'), 'drawdown': float('nan')}
+
+        volatility = self._vol_sum / self._vol_count if self._vol_count else float('nan')
+        return {
+            'return': round((self.last_close / self.first_close - 1) * 100, 2),
+            'volatility': round(volatility * 100, 2),
+            'drawdown': round(self.max_drawdown * 100, 2)
+        }
+
+
+class IncrementalMetricsBook:
+    """
+    IncrementalMetrics for a whole watchlist, persisted between runs
+
+    All states measure from the same start date. refresh() fetches only
+    the bars after each ticker's last_date, so a daily refresh costs one
+    short history request and a few O(1) updates per ticker.
+    """
+
+    def __init__(self, start_date: Optional[datetime] = None,
+                 window: int = VOLATILITY_WINDOW,
+                 min_periods: int = VOLATILITY_MIN_PERIODS):
+        self.start_date = pd.Timestamp(start_date) if start_date is not None else None
+        self.window = window
+        self.min_periods = min_periods
+        self.states: Dict[str, IncrementalMetrics] = {}
+
+    def seed(self, companies: List):
+        """Build state from CompanyData objects or a PricePanel"""
+        for company in companies:
+            self.states[company.ticker] = IncrementalMetrics.from_history(
+                company.data['Close'].to_numpy(),
+                trading_dates(company.data.index),
+                window=self.window,
+                min_periods=self.min_periods
+            )
+
+    def update(self, bars: Dict[str, float], date=None):
+        """Add one new close per ticker, e.g. today's bars"""
+        for ticker, close in bars.items():
+            if ticker not in self.states:
+                self.states[ticker] = IncrementalMetrics(self.window, self.min_periods)
+            self.states[ticker].update(close, date)
+
+    def refresh(self, get_history: Callable[[str, datetime, datetime], pd.DataFrame],
+                tickers: List[str], end_date: datetime, max_workers: int = 1) -> Dict[str, dict]:
+        """
+        Bring tickers up to end_date (exclusive) and return their metrics
+
+        Args:
+            get_history: DataProvider.get_history-style fetch
+            tickers: Tickers to refresh; new ones are seeded from start_date
+            end_date: Exclusive end of the refresh
+            max_workers: Concurrent fetches
+
+        Returns:
+            Metrics per refreshed ticker with state (failed new tickers are skipped)
+        """
+        if self.start_date is None:
+            raise ValueError("IncrementalMetricsBook.refresh needs a start_date")
+        end = pd.Timestamp(end_date)
+
+        def new_bars(ticker):
+            state = self.states.get(ticker)
+            last = state.last_date if state is not None else None
+            start = self.start_date if last is None else last + pd.Timedelta(days=1)
+            if start >= end:
+                return ticker, None
+            try:
+                history = get_history(ticker, start.to_pydatetime(), end.to_pydatetime())
+            except Exception as e:
+                logger.warning("Could not refresh %s: %s", ticker, e)
+                return ticker, None
+            if history is None or history.empty or 'Close' not in history.columns:
+                return ticker, None
+            dates = trading_dates(history.index)
+            keep = dates > last if last is not None else slice(None)
+            return ticker, (history['Close'].to_numpy()[keep], dates[keep])
+
+        if max_workers <= 1 or len(tickers) <= 1:
+            fetched = [new_bars(t) for t in tickers]
+        else:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                fetched = list(executor.map(new_bars, tickers))
+
+        for ticker, bars in fetched:
+            if bars is None:
+                continue
+            if ticker not in self.states or self.states[ticker].last_date is None:
+                # Undated state can't be extended; it was refetched from start_date
+                self.states[ticker] = IncrementalMetrics(self.window, self.min_periods)
+            state = self.states[ticker]
+            for close, date in zip(*bars):
+                state.update(close, date)
+
+        return {t: self.states[t].metrics for t in tickers if t in self.states}
+
+    def metrics(self) -> Dict[str, dict]:
+        return {ticker: state.metrics for ticker, state in self.states.items()}
+
+    def save(self, path):
+        """Pickle to a temp file beside path and os.replace it, so readers never see a partial book"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    @staticmethod
+    def load(path) -> 'IncrementalMetricsBook':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    @classmethod
+    def open(cls, path, start_date: datetime) -> 'IncrementalMetricsBook':
+        """The book saved at path, or a new one if missing or started on another date"""
+        try:
+            book = cls.load(path)
+        except FileNotFoundError:
+            return cls(start_date)
+        except Exception as e:
+            logger.warning("Discarding unreadable metrics book %s: %s", path, e)
+            return cls(start_date)
+        if book.start_date != pd.Timestamp(start_date) or \
+                (book.window, book.min_periods) != (VOLATILITY_WINDOW, VOLATILITY_MIN_PERIODS):
+            return cls(start_date)
+        return book
+
+
+def trading_dates(index) -> pd.DatetimeIndex:
+    """Exchange-local trading dates of a history index"""
+    index = pd.DatetimeIndex(index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.normalize()
@@ -0,0 +1,152 @@
+"""
+Metadata Store
+TTL-backed SQLite cache for company name, sector, industry and currency
+Avoids repeated calls to the slow yfinance `.info` endpoint
+"""
+import sqlite3
+import time
+import pandas as pd
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from .data_providers import DataProvider
+
+# store column -> provider info key
+INFO_FIELDS = {
+    'name': 'longName',
+    'sector': 'sector',
+    'industry': 'industry',
+    'currency': 'currency'
+}
+
+
+class MetadataStore:
+    """Company metadata keyed by ticker, with entries expiring after ttl_seconds"""
+
+    def __init__(self, path, ttl_seconds: Optional[float] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "ticker TEXT PRIMARY KEY, name TEXT, sector TEXT, "
+                "industry TEXT, currency TEXT, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS preloads ("
+                "signature TEXT PRIMARY KEY, loaded_at REAL NOT NULL)"
+            )
+
+    def get(self, ticker: str) -> Optional[Dict]:
+        """Return provider-style info for a fresh entry, else None"""
+        return self.get_many([ticker]).get(ticker)
+
+    def get_many(self, tickers: Iterable[str]) -> Dict[str, Dict]:
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+
+        columns = ', '.join(INFO_FIELDS)
+        placeholders = ', '.join('?' * len(tickers))
+        query = f"SELECT ticker, {columns} FROM metadata WHERE ticker IN ({placeholders})"
+        params: List = list(tickers)
+        if self.ttl_seconds is not None:
+            query += " AND updated_at >= ?"
+            params.append(time.time() - self.ttl_seconds)
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(query, params).fetchall()
+
+        return {
+            row[0]: {
+                info_key: value
+                for info_key, value in zip(INFO_FIELDS.values(), row[1:])
+                if value is not None
+            }
+            for row in rows
+        }
+
+    def put(self, ticker: str, info: Dict):
+        self.put_many({ticker: info})
+
+    def put_many(self, infos: Dict[str, Dict]):
+        now = time.time()
+        rows = [
+            (ticker, *(self._clean(info.get(key)) for key in INFO_FIELDS.values()), now)
+            for ticker, info in infos.items()
+        ]
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata VALUES (?, ?, ?, ?, ?, ?)", rows
+            )
+
+    def preload(self, path) -> int:
+        """
+        Bulk load metadata from a Parquet/CSV/JSON file with a ticker
+        column plus any of longName, sector, industry, currency
+
+        Each version of the file is loaded once, so its entries age out
+        after the TTL like fetched ones instead of being renewed by every
+        analyzer that preloads it.
+        Returns the number of tickers loaded (0 if this version already was)
+        """
+        path = Path(path)
+        stat = path.stat()
+        signature = f"{path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
+        with closing(self._connect()) as conn:
+            if conn.execute("SELECT 1 FROM preloads WHERE signature = ?",
+                            (signature,)).fetchone():
+                return 0
+
+        if path.suffix == '.parquet':
+            df = pd.read_parquet(path)
+        elif path.suffix == '.json':
+            df = pd.read_json(path)
+        else:
+            df = pd.read_csv(path)
+
+        ticker_col = 'ticker' if 'ticker' in df.columns else 'Ticker'
+        infos = {
+            row.pop(ticker_col): row
+            for row in df.to_dict('records')
+        }
+        self.put_many(infos)
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO preloads VALUES (?, ?)",
+                         (signature, time.time()))
+        return len(infos)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    @staticmethod
+    def _clean(value) -> Optional[str]:
+        return None if value is None or pd.isna(value) else str(value)
+
+
+class MetadataCachedProvider(DataProvider):
+    """Serve get_info from a MetadataStore, falling back to the wrapped provider"""
+
+    def __init__(self, provider: DataProvider, store: MetadataStore):
+        self.provider = provider
+        self.name = provider.name
+        self.store = store
+
+    def get_history(self, ticker: str, start_date: datetime,
+                    end_date: datetime) -> pd.DataFrame:
+        return self.provider.get_history(ticker, start_date, end_date)
+
+    def get_info(self, ticker: str) -> Dict:
+        if (info := self.store.get(ticker)) is not None:
+            return info
+
+        info = self.provider.get_info(ticker)
+        # Empty info usually means a failed lookup; don't pin it for a full TTL
+        if info:
+            self.store.put(ticker, info)
+        return info
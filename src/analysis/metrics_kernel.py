@@ -0,0 +1,140 @@
+"""
+Metrics Kernel
+Vectorized cross-ticker return, volatility and drawdown calculation
+Replaces the per-ticker pandas pipeline in PerformanceAnalyzer._fetch_stock_data
+"""
+import numpy as np
+from typing import Dict, List
+
+TRADING_DAYS = 252
+VOLATILITY_WINDOW = 30
+VOLATILITY_MIN_PERIODS = 10
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs down each column; leading NaNs stay NaN"""
+    rows = np.where(~np.isnan(values), np.arange(len(values))[:, None], 0)
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    filled = values[rows, np.arange(values.shape[1])]
+    # Row 0 is the fallback index, so only rows at or after the first valid close are real
+    filled[np.cumsum(~np.isnan(values), axis=0) == 0] = np.nan
+    return filled
+
+
+def compact(values: np.ndarray) -> np.ndarray:
+    """
+    Move each column's non-NaN values to the top, in order, NaN below
+
+    Rolling windows over the result count a ticker's own bars rather than
+    rows of the union calendar, so its metrics do not depend on which
+    other tickers (and holidays) share the panel.
+    """
+    valid = ~np.isnan(values)
+    rows = np.cumsum(valid, axis=0) - 1
+    compacted = np.full_like(values, np.nan)
+    columns = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    compacted[rows[valid], columns[valid]] = values[valid]
+    return compacted
+
+
+def rolling_std(values: np.ndarray, window: int, min_periods: int) -> np.ndarray:
+    """
+    NaN-aware rolling sample std down each column via cumulative sums
+    Matches pandas .rolling(window, min_periods).std()
+    """
+    valid = ~np.isnan(values)
+    zeroed = np.where(valid, values, 0.0)
+
+    def windowed(x):
+        c = np.cumsum(x, axis=0)
+        c[window:] = c[window:] - c[:-window].copy()
+        return c
+
+    count = windowed(valid.astype(np.float64))
+    total = windowed(zeroed)
+    total_sq = windowed(zeroed * zeroed)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var = (total_sq - total * total / count) / (count - 1)
+    var = np.maximum(var, 0.0)
+    var[(count < max(min_periods, 2))] = np.nan
+    return np.sqrt(var)
+
+
+def compute_metrics(close: np.ndarray, window: int = VOLATILITY_WINDOW,
+                    min_periods: int = VOLATILITY_MIN_PERIODS) -> Dict[str, np.ndarray]:
+    """
+    Compute metrics for every ticker in one pass over an aligned price matrix
+
+    Each column is first compacted to its own bars, so the result for a
+    ticker equals the per-ticker pandas calculation whatever the calendar
+    of the other columns.
+
+    Args:
+        close: dates x tickers closes; NaN where a ticker has no bar
+        window: rolling volatility window (trading days)
+        min_periods: minimum returns in a window for a volatility value
+
+    Returns:
+        Dict of per-ticker arrays (percent):
+            return     - first to last close
+            volatility - mean annualized rolling volatility, with the warm-up
+                         period back-filled from the first full value
+            drawdown   - worst peak-to-trough decline (running maximum)
+    """
+    close = np.asarray(close, dtype=np.float64)
+    if close.ndim == 1:
+        close = close[:, None]
+    close = compact(close)
+    n_dates, n_tickers = close.shape
+    columns = np.arange(n_tickers)
+
+    traded = ~np.isnan(close)
+    has_data = traded.any(axis=0)
+    first_row = np.argmax(traded, axis=0)
+    last_row = n_dates - 1 - np.argmax(traded[::-1], axis=0)
+    filled = forward_fill(close)
+
+    # Total return
+    total_return = (close[last_row, columns] / close[first_row, columns] - 1) * 100
+
+    # Daily returns against the previous available close
+    returns = np.full_like(close, np.nan)
+    returns[1:] = close[1:] / filled[:-1] - 1
+
+    # Rolling volatility, averaged over the ticker's own trading days
+    vol = rolling_std(returns, window, min_periods) * np.sqrt(TRADING_DAYS)
+    vol_valid = ~np.isnan(vol) & traded
+    first_vol_row = np.argmax(vol_valid, axis=0)
+    first_vol = vol[first_vol_row, columns]
+    # Trading days before the first full window take the first value (bfill)
+    warmup = traded & (np.arange(n_dates)[:, None] < first_vol_row)
+    vol_sum = np.where(vol_valid, vol, 0.0).sum(axis=0) + warmup.sum(axis=0) * first_vol
+    vol_count = vol_valid.sum(axis=0) + warmup.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volatility = np.where(vol_valid.any(axis=0), vol_sum / vol_count, np.nan) * 100
+
+    # Drawdown from the running peak
+    peak = np.fmax.accumulate(filled, axis=0)
+    with np.errstate(invalid='ignore'):
+        drawdown = np.where(traded, close / peak - 1, np.inf).min(axis=0) * 100
+    drawdown[~has_data] = np.nan
+    total_return[~has_data] = np.nan
+
+    return {
+        'return': total_return,
+        'volatility': volatility,
+        'drawdown': drawdown
+    }
+
+
+def metrics_records(metrics: Dict[str, np.ndarray]) -> List[dict]:
+    """Per-ticker metrics dicts in the CompanyData.metrics format"""
+    return [
+        {
+            'return': round(float(ret), 2),
+            'volatility': round(float(vol), 2),
+            'drawdown': round(float(dd), 2)
+        }
+        for ret, vol, dd in zip(metrics['return'], metrics['volatility'], metrics['drawdown'])
+    ]
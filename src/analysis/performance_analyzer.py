@@ -3,13 +3,12 @@ Performance Analyzer
 Handles stock data fetching and performance metrics calculation
 Extracted from sc_analyzer_new.py
 """
-import yfinance as yf
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Sequence
 from dataclasses import dataclass
-from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -17,7 +16,19 @@ import sys
 from pathlib import Path
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
-from config import SECTOR_MAP
+from config import (
+    DATA_PROVIDER,
+    FETCH_SETTINGS,
+    PRICE_CACHE,
+    METADATA_CACHE
+)
+from .data_providers import DataProvider, create_provider
+from .fetch_scheduler import RateLimitedProvider, RequestBudgetExceeded
+from .price_cache import PriceCache, CachedProvider
+from .metadata_store import MetadataStore, MetadataCachedProvider
+from .metrics_kernel import compute_metrics, metrics_records
+from .price_panel import PricePanel
+from .sector_classifier import get_classifier
 
 @dataclass
 class CompanyData:
@@ -27,107 +38,158 @@ class CompanyData:
     data: pd.DataFrame
     ticker: str
     metrics: dict
+    industry: str = ''
 
 class PerformanceAnalyzer:
     """Fetch stock data and calculate performance metrics"""
     
-    def __init__(self):
-        self._sector_map = SECTOR_MAP
+    def __init__(self, provider: Optional[DataProvider] = None,
+                 max_workers: Optional[int] = None):
+        self._classifier = get_classifier()
+        self._fetch_settings = FETCH_SETTINGS
+        self._fetcher = RateLimitedProvider.from_settings(
+            provider or create_provider(DATA_PROVIDER),
+            self._fetch_settings
+        )
+        self.provider = self._build_provider(self._fetcher)
+        self.max_workers = max_workers or self._fetch_settings['max_workers']
+    
+    def _build_provider(self, fetcher: DataProvider) -> DataProvider:
+        """
+        Layer the on-disk caches over the rate-limited fetcher, so cache
+        hits never touch the rate limiter or the request budget
+        """
+        provider = fetcher
+        
+        if METADATA_CACHE['enabled'] and fetcher.name in METADATA_CACHE['providers']:
+            store = MetadataStore(
+                project_root / METADATA_CACHE['path'],
+                ttl_seconds=METADATA_CACHE['ttl_days'] * 86400
+            )
+            if METADATA_CACHE['preload_file']:
+                store.preload(project_root / METADATA_CACHE['preload_file'])
+            provider = MetadataCachedProvider(provider, store)
+        
+        if PRICE_CACHE['enabled'] and fetcher.name in PRICE_CACHE['providers']:
+            provider = CachedProvider(
+                provider,
+                PriceCache(project_root / PRICE_CACHE['directory'], PRICE_CACHE['max_bytes']),
+                rtol=PRICE_CACHE['adjustment_rtol']
+            )
+        
+        return provider
     
     def fetch_companies(self, tickers: List[str], start_date: datetime, 
-                       end_date: datetime) -> List[CompanyData]:
+                       end_date: datetime, fields: Optional[Sequence[str]] = None,
+                       dtype=np.float64, new_run: bool = True) -> List[CompanyData]:
         """
         Process company data with error handling
         Extracted from SCAnalyzer._process_companies
+        
+        Tickers are fetched concurrently on a bounded thread pool (capped
+        by the provider's concurrency limit); results keep input order.
+        With fields, each history is cut down to those columns (other
+        fields cast to dtype, Close kept in float64 for the metrics) as soon
+        as it arrives, so full provider frames never pile up.
+        Raises RequestBudgetExceeded once the run's request budget is spent;
+        new_run=False keeps drawing on the current budget (batch shards).
         """
-        companies = []
+        if new_run:
+            self._fetcher.reset_budget(self._fetch_settings['request_budget'])
+        workers = min(self.max_workers, self._fetcher.max_concurrency, len(tickers))
+        fetch = lambda t: self._fetch_safely(t, start_date, end_date, fields, dtype)
+        
+        if workers <= 1:
+            results = [fetch(t) for t in tickers]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(fetch, tickers))
         
-        for ticker in tickers:
-            try:
-                if data := self._fetch_stock_data(ticker, start_date, end_date):
-                    companies.append(data)
-            except Exception as e:
-                warnings.warn(f"Error processing {ticker}: {str(e)}")
-                continue
-                
-        return companies
+        return self._compute_metrics([data for data in results if data])
+    
+    def fetch_panel(self, tickers: List[str], start_date: datetime, end_date: datetime,
+                    fields: Sequence[str] = ('Close', 'Volume'), dtype=np.float64) -> PricePanel:
+        """
+        fetch_companies straight into a PricePanel; the slimmed per-company
+        frames are released once the panel is built
+        """
+        companies = self.fetch_companies(tickers, start_date, end_date, fields, dtype)
+        return PricePanel.from_companies(companies, fields=fields, dtype=dtype)
+    
+    def _compute_metrics(self, companies: List[CompanyData]) -> List[CompanyData]:
+        """
+        Calculate key metrics for every company in one vectorized pass
+        over their aligned closes; companies without valid metrics are dropped
+        """
+        if not companies:
+            return companies
+        
+        panel = PricePanel.from_companies(companies, fields=('Close',))
+        metrics = compute_metrics(panel.field('Close'))
+        
+        valid = []
+        for company, record in zip(companies, metrics_records(metrics)):
+            if not np.isnan(list(record.values())).any():
+                company.metrics = record
+                valid.append(company)
+        return valid
+    
+    def _fetch_safely(self, ticker: str, start_date: datetime, end_date: datetime,
+                      fields: Optional[Sequence[str]] = None,
+                      dtype=np.float64) -> Optional[CompanyData]:
+        """Fetch one ticker, turning failures into warnings; an exhausted budget stops the run"""
+        try:
+            company = self._fetch_stock_data(ticker, start_date, end_date)
+            if company is not None and fields is not None:
+                company.data = _slim(company.data, fields, dtype)
+            return company
+        except RequestBudgetExceeded:
+            raise
+        except Exception as e:
+            warnings.warn(f"Error processing {ticker}: {str(e)}")
+            return None
     
-    @lru_cache(maxsize=100)
     def _fetch_stock_data(self, ticker: str, start_date: datetime, 
                          end_date: datetime) -> Optional[CompanyData]:
         """
-        Fetch and process stock data with caching
+        Fetch stock data and metadata (history served from the PriceCache)
         Extracted from SCAnalyzer._fetch_stock_data
         """
         try:
             # Download data
-            stock = yf.Ticker(ticker)
-            data = stock.history(start=start_date, end=end_date)
+            data = self.provider.get_history(ticker, start_date, end_date)
             
             if len(data) < 30:
                 return None
             
-            # Calculate metrics
-            data['Return'] = data['Close'].pct_change()
-            data['Volatility'] = data['Return'].rolling(30, min_periods=10).std() * np.sqrt(252)
-            data = data.fillna(method='ffill').fillna(method='bfill')
-            
-            if data.isnull().any().any():
-                return None
-            
-            # Calculate key metrics
-            returns = (data['Close'].iloc[-1] / data['Close'].iloc[0] - 1) * 100
-            volatility = float(data['Volatility'].mean() * 100)
-            drawdown = ((data['Close'].min() / data['Close'].max()) - 1) * 100
+            info = self.provider.get_info(ticker)
             
+            # Metrics are filled in for all tickers at once by _compute_metrics
             return CompanyData(
-                name=stock.info.get('longName', ticker),
-                sector=self._determine_sector(ticker, stock),
+                name=info.get('longName', ticker),
+                sector=self._determine_sector(ticker, info),
                 data=data,
                 ticker=ticker,
-                metrics={
-                    'return': round(returns, 2),
-                    'volatility': round(volatility, 2),
-                    'drawdown': round(drawdown, 2)
-                }
+                metrics={},
+                industry=info.get('industry', '') or ''
             )
             
+        except RequestBudgetExceeded:
+            raise
         except Exception:
             return None
     
-    def _determine_sector(self, ticker: str, stock: yf.Ticker) -> str:
+    def _determine_sector(self, ticker: str, info: dict) -> str:
         """
-        Determine company sector
+        Determine company sector from the ticker map, falling back to
+        keyword rules over provider metadata (a single MetadataStore
+        lookup on warm runs)
         Extracted from SCAnalyzer._determine_sector
         """
-        # Check predefined sectors
-        for sector, tickers in self._sector_map.items():
-            if ticker in tickers:
-                return sector
-        
-        # Use Yahoo Finance data
-        try:
-            sector = stock.info.get('sector', '').lower()
-            industry = stock.info.get('industry', '').lower()
-            
-            if any(word in sector + industry 
-                   for word in ['semiconductor', 'chip']):
-                return 'Semiconductors'
-            elif any(word in sector + industry 
-                    for word in ['auto', 'vehicle']):
-                return 'Automotive'
-            elif any(word in sector + industry 
-                    for word in ['electronic', 'computer']):
-                return 'Consumer Electronics'
-            elif any(word in sector + industry 
-                    for word in ['telecom', 'industrial']):
-                return 'Telecom_Industrial'
-        except:
-            pass
-        
-        return 'Other'
+        return self._classifier.classify(ticker, info)
     
-    def get_performance_dict(self, companies: List[CompanyData]) -> dict:
+    @staticmethod
+    def get_performance_dict(companies: List[CompanyData]) -> dict:
         """
         Extract performance data as dictionary
         Extracted from SCAnalyzer._get_performance_data
@@ -139,4 +201,11 @@ class PerformanceAnalyzer:
                 **company.metrics
             }
             for company in companies
-        }
\ No newline at end of file
+        }
+
+def _slim(data: pd.DataFrame, fields: Sequence[str], dtype) -> pd.DataFrame:
+    """Only the panel fields of a history; Close stays float64 for the metrics pass"""
+    columns = [field for field in dict.fromkeys(['Close', *fields]) if field in data.columns]
+    return data[columns].astype({
+        column: np.float64 if column == 'Close' else dtype for column in columns
+    })
@@ -0,0 +1,190 @@
+"""
+Analysis Pipeline
+Streamlit-independent analysis pipeline shared by the dashboard and batch mode
+Extracted from src/dashboard/app.py run_analysis
+"""
+from datetime import datetime
+from typing import Dict, List, Optional
+import sys
+sys.path.append('..')
+from config import DEPENDENCY_GRAPH, PANEL_SETTINGS, PIPELINE_SETTINGS
+from .correlation_analyzer import CorrelationAnalyzer
+from .data_providers import DataProvider
+from .dependency_graph import graph_signature
+from .event_study import EventStudy
+from .performance_analyzer import PerformanceAnalyzer, CompanyData
+from .pipeline_engine import PipelineEngine, Stage
+from .price_panel import PricePanel
+from .risk_analyzer import RiskAnalyzer
+from .risk_timeline import build_risk_timeline
+from .supply_chain_analyzer import SupplyChainAnalyzer
+from .scenario_simulator import ScenarioSimulator
+from .sector_analyzer import SectorAnalyzer
+from .time_series_analyzer import TimeSeriesAnalyzer
+
+# Stage outputs copied into the results dictionary
+RESULT_STAGES = [
+    'performance',
+    'risk_scores',
+    'risk',
+    'risk_timeline',
+    'correlation',
+    'supply_chain_impact',
+    'sector_vulnerability',
+    'scenarios',
+    'event_study',
+    'time_series_data',
+    'time_series_pyramid'
+]
+
+
+def clean_tickers(tickers: List[str]) -> List[str]:
+    return [t.strip().upper() for t in tickers if t.strip()]
+
+
+def fetch_companies(tickers: List[str], start_date: datetime, end_date: datetime,
+                    provider: Optional[DataProvider] = None) -> List[CompanyData]:
+    """Fetch price data and metrics, keeping only the panel fields of each history"""
+    return PerformanceAnalyzer(provider).fetch_companies(
+        tickers, start_date, end_date,
+        fields=PANEL_SETTINGS['fields'], dtype=PANEL_SETTINGS['dtype']
+    )
+
+
+def fetch_panel(tickers: List[str], start_date: datetime, end_date: datetime,
+                provider: Optional[DataProvider] = None) -> PricePanel:
+    """Fetch straight into the shared panel; no per-company frames are kept"""
+    panel = PerformanceAnalyzer(provider).fetch_panel(
+        tickers, start_date, end_date,
+        fields=PANEL_SETTINGS['fields'], dtype=PANEL_SETTINGS['dtype']
+    )
+    if not len(panel):
+        raise ValueError("No valid stock data collected")
+    return panel
+
+
+def build_panel(companies: List[CompanyData]) -> PricePanel:
+    """Align already-fetched histories into one compact panel shared by all analyzers"""
+    if not companies:
+        raise ValueError("No valid stock data collected")
+    return PricePanel.from_companies(
+        companies,
+        fields=PANEL_SETTINGS['fields'],
+        dtype=PANEL_SETTINGS['dtype']
+    )
+
+
+def build_engine() -> PipelineEngine:
+    """
+    Stage graph: panel (fetched, or seeded from companies) -> every analyzer.
+    The analyzers depend only on the panel, so they run concurrently;
+    risk labels are a threshold over the fitted risk_scores.
+    """
+    return PipelineEngine(
+        [
+            Stage('panel', fetch_panel, config=('tickers', 'start_date', 'end_date')),
+            Stage('performance', lambda panel: PerformanceAnalyzer.get_performance_dict(panel),
+                  inputs=('panel',)),
+            Stage('risk_scores', lambda panel, risk_model, save_risk_model:
+                  RiskAnalyzer(risk_model, save_risk_model).score_risk(panel),
+                  inputs=('panel',), config=('risk_model', 'save_risk_model')),
+            # Only this cheap quantile cut depends on the sensitivity
+            Stage('risk', lambda risk_scores, risk_threshold:
+                  RiskAnalyzer.apply_threshold(risk_scores, risk_threshold),
+                  inputs=('risk_scores',), config=('risk_threshold',)),
+            Stage('risk_timeline', build_risk_timeline, inputs=('panel',)),
+            Stage('correlation', lambda panel: CorrelationAnalyzer().analyze_correlations(panel),
+                  inputs=('panel',)),
+            # dependency_graph (edge file signature) only invalidates the memo
+            Stage('supply_chain_impact',
+                  lambda panel, dependency_graph:
+                  SupplyChainAnalyzer().analyze_supply_chain_frame(panel).to_dict('records'),
+                  inputs=('panel',), config=('dependency_graph',)),
+            Stage('sector_vulnerability', lambda panel: SectorAnalyzer().analyze_sectors(panel),
+                  inputs=('panel',)),
+            Stage('scenarios',
+                  lambda panel, dependency_graph: ScenarioSimulator(panel).run_all(),
+                  inputs=('panel',), config=('dependency_graph',)),
+            Stage('event_study', lambda panel: EventStudy().analyze_events(panel),
+                  inputs=('panel',)),
+            Stage('time_series_data', lambda panel: TimeSeriesAnalyzer().get_time_series_data(panel),
+                  inputs=('panel',)),
+            Stage('time_series_pyramid', lambda panel: TimeSeriesAnalyzer().build_pyramid(panel),
+                  inputs=('panel',))
+        ],
+        max_workers=PIPELINE_SETTINGS['max_workers'],
+        cache_size=PIPELINE_SETTINGS['cache_size'],
+        cache_bytes=PIPELINE_SETTINGS['cache_mb'] * 1024 * 1024
+    )
+
+
+# Shared so that reruns with one changed parameter reuse every other stage;
+# its memo is bounded by PIPELINE_SETTINGS['cache_mb'] across all sessions
+ENGINE = build_engine()
+
+
+def _assemble_results(outputs: Dict, tickers: List[str], start_date: datetime,
+                      end_date: datetime) -> Dict:
+    """Results dictionary consumed by the dashboard and exports"""
+    panel = outputs['panel']
+    return {
+        'metadata': {
+            'tickers': tickers,
+            'period': f"{start_date} to {end_date}",
+            'analysis_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'total_companies': len(panel)
+        },
+        **{name: outputs[name] for name in RESULT_STAGES},
+        'companies': [c.ticker for c in panel]
+    }
+
+
+def analyze_companies(companies: List[CompanyData], tickers: List[str],
+                      start_date: datetime, end_date: datetime,
+                      risk_threshold: float = 0.3,
+                      risk_model: Optional[str] = None,
+                      save_risk_model: Optional[str] = None) -> Dict:
+    """
+    Run every analyzer over already-fetched companies
+
+    save_risk_model persists the risk model fitted on this universe;
+    without it fits stay in memory. Only the panel built from companies is
+    kept (and memoized), not their per-company frames.
+    """
+    outputs = ENGINE.run(
+        {
+            'risk_threshold': risk_threshold,
+            'risk_model': risk_model,
+            'save_risk_model': save_risk_model,
+            'dependency_graph': graph_signature(DEPENDENCY_GRAPH)
+        },
+        seeds={'panel': build_panel(companies)},
+        targets=RESULT_STAGES
+    )
+    return _assemble_results(outputs, tickers, start_date, end_date)
+
+
+def run_pipeline(tickers: List[str], start_date: datetime, end_date: datetime,
+                 risk_threshold: float = 0.3,
+                 provider: Optional[DataProvider] = None,
+                 risk_model: Optional[str] = None) -> Dict:
+    """Fetch and analyze a ticker universe end to end"""
+    tickers = clean_tickers(tickers)
+    config = {
+        'tickers': tickers,
+        'start_date': start_date,
+        'end_date': end_date,
+        'risk_threshold': risk_threshold,
+        'risk_model': risk_model,
+        'save_risk_model': None,
+        'dependency_graph': graph_signature(DEPENDENCY_GRAPH)
+    }
+
+    if provider is not None:
+        # A custom provider isn't part of the fingerprint, so fetch it directly
+        companies = fetch_companies(tickers, start_date, end_date, provider)
+        return analyze_companies(companies, tickers, start_date, end_date,
+                                 risk_threshold, risk_model)
+
+    outputs = ENGINE.run(config, targets=RESULT_STAGES)
+    return _assemble_results(outputs, tickers, start_date, end_date)
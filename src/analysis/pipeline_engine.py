@@ -0,0 +1,272 @@
+"""
+Pipeline Engine
+Dependency-aware stage executor with content-hash memoization
+Independent stages run concurrently; unchanged stages are served from cache
+"""
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .price_panel import PricePanel
+
+# Fields hashed for company records (CompanyData, PanelCompany) besides their data
+COMPANY_FIELDS = ('ticker', 'name', 'sector', 'industry', 'metrics')
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    One pipeline step
+
+    func is called with each input stage's output and each config key as
+    keyword arguments, e.g. func(panel=..., risk_threshold=0.3)
+    """
+    name: str
+    func: Callable[..., Any]
+    inputs: Tuple[str, ...] = ()
+    config: Tuple[str, ...] = ()
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def content_hash(value: Any) -> str:
+    """
+    Stable hash of a config value or seed object
+
+    Equal content always hashes equal: plain values as canonical JSON,
+    pandas and NumPy data by their values, containers element by element,
+    price panels by their blocks and company records (ticker + data) by
+    their fields. Pickle bytes are not used, since its memo makes equal
+    objects serialize differently.
+    """
+    digest = hashlib.sha256()
+    _feed(digest, value)
+    return digest.hexdigest()
+
+
+def _feed(digest, value: Any):
+    if isinstance(value, pd.DataFrame):
+        digest.update(b'DataFrame')
+        _feed(digest, [str(column) for column in value.columns])
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, (pd.Series, pd.Index)):
+        digest.update(type(value).__name__.encode())
+        digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray):
+        digest.update(f"ndarray{value.dtype.str}{value.shape}".encode())
+        if value.dtype == object:
+            _feed(digest, value.tolist())
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, dict):
+        digest.update(f"dict{len(value)}".encode())
+        for key in sorted(value, key=str):
+            _feed(digest, key)
+            _feed(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"{type(value).__name__}{len(value)}".encode())
+        for item in value:
+            _feed(digest, item)
+    elif isinstance(value, PricePanel):
+        # Field blocks hashed directly, not through per-company frames
+        digest.update(b'PricePanel')
+        _feed(digest, value.dates)
+        _feed(digest, value.fields)
+        for company in value:
+            _feed(digest, [getattr(company, field) for field in COMPANY_FIELDS])
+    elif hasattr(value, 'ticker') and hasattr(value, 'data'):
+        digest.update(type(value).__name__.encode())
+        for field in COMPANY_FIELDS:
+            _feed(digest, getattr(value, field, None))
+        _feed(digest, value.data)
+    else:
+        digest.update(json.dumps(value, sort_keys=True, default=_json_default).encode())
+
+
+def approx_nbytes(value: Any, seen: Optional[set] = None) -> int:
+    """Rough memory held by a stage output (shared objects counted once)"""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(index=True) if isinstance(value, pd.Series)
+                   else value.memory_usage())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(approx_nbytes(k, seen) + approx_nbytes(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(approx_nbytes(item, seen) for item in value)
+    if hasattr(value, '__dict__'):
+        return sys.getsizeof(value) + approx_nbytes(vars(value), seen)
+    slots = [slot for cls in type(value).__mro__ for slot in getattr(cls, '__slots__', ())]
+    if slots:
+        return sys.getsizeof(value) + sum(
+            approx_nbytes(getattr(value, slot, None), seen) for slot in slots
+        )
+    return sys.getsizeof(value)
+
+
+class PipelineEngine:
+    """
+    Run stages in dependency order on a worker pool.
+
+    Each stage's fingerprint hashes its name, its config values and the
+    fingerprints of its inputs, so changing one parameter only invalidates
+    the stages downstream of it. Outputs are kept in an LRU memo keyed by
+    fingerprint, bounded by entry count and by their approximate size.
+    """
+
+    def __init__(self, stages: List[Stage], max_workers: int = 4, cache_size: int = 64,
+                 cache_bytes: Optional[int] = None):
+        self.stages = {stage.name: stage for stage in stages}
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self.cache_bytes = cache_bytes
+        self._memo: 'OrderedDict[str, Any]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.last_run = {'computed': [], 'cached': []}
+        self._validate()
+
+    def run(self, config: Dict[str, Any], seeds: Optional[Dict[str, Any]] = None,
+            targets: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Execute the stages needed for targets (default: all)
+
+        Args:
+            config: Values for the stages' config keys
+            seeds: Precomputed stage outputs (e.g. already-fetched companies)
+            targets: Stage names to produce
+
+        Returns:
+            Dict of stage name -> output
+        """
+        seeds = seeds or {}
+        needed = self._required(targets or list(self.stages), seeds)
+        outputs = dict(seeds)
+        fingerprints = {name: content_hash(value) for name, value in seeds.items()}
+        self.last_run = {'computed': [], 'cached': []}
+
+        pending = set(needed)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in sorted(pending):
+                    stage = self.stages[name]
+                    if not all(dep in outputs for dep in stage.inputs):
+                        continue
+                    pending.discard(name)
+
+                    fingerprint = self._fingerprint(stage, config, fingerprints)
+                    fingerprints[name] = fingerprint
+                    hit, value = self._lookup(fingerprint)
+                    if hit:
+                        outputs[name] = value
+                        self.last_run['cached'].append(name)
+                        continue
+
+                    kwargs = {dep: outputs[dep] for dep in stage.inputs}
+                    kwargs.update({key: config[key] for key in stage.config})
+                    running[executor.submit(stage.func, **kwargs)] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    outputs[name] = future.result()
+                    self._store(fingerprints[name], outputs[name])
+                    self.last_run['computed'].append(name)
+
+        return outputs
+
+    def clear(self):
+        with self._lock:
+            self._memo.clear()
+            self._sizes.clear()
+
+    @property
+    def memo_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def _fingerprint(self, stage: Stage, config: Dict, fingerprints: Dict[str, str]) -> str:
+        return content_hash({
+            'stage': stage.name,
+            'config': {key: content_hash(config[key]) for key in stage.config},
+            'inputs': {dep: fingerprints[dep] for dep in stage.inputs}
+        })
+
+    def _lookup(self, fingerprint: str):
+        with self._lock:
+            if fingerprint in self._memo:
+                self._memo.move_to_end(fingerprint)
+                return True, self._memo[fingerprint]
+        return False, None
+
+    def _store(self, fingerprint: str, value: Any):
+        if self.cache_size <= 0:
+            return
+        size = approx_nbytes(value) if self.cache_bytes is not None else 0
+        if self.cache_bytes is not None and size > self.cache_bytes:
+            return
+        with self._lock:
+            self._memo[fingerprint] = value
+            self._sizes[fingerprint] = size
+            self._memo.move_to_end(fingerprint)
+            while len(self._memo) > self.cache_size or \
+                    (self.cache_bytes is not None and self.memo_bytes > self.cache_bytes):
+                evicted, _ = self._memo.popitem(last=False)
+                del self._sizes[evicted]
+
+    def _required(self, targets: List[str], seeds: Dict[str, Any]) -> set:
+        """Targets plus their transitive inputs, stopping at seeded stages"""
+        needed, stack = set(), [t for t in targets if t not in seeds]
+        while stack:
+            name = stack.pop()
+            if name in needed:
+                continue
+            needed.add(name)
+            stack.extend(dep for dep in self.stages[name].inputs if dep not in seeds)
+        return needed
+
+    def _validate(self):
+        """Reject unknown inputs and dependency cycles"""
+        for stage in self.stages.values():
+            for dep in stage.inputs:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dep}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle through stage '{name}'")
+            visiting.add(name)
+            for dep in self.stages[name].inputs:
+                visit(dep)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self.stages:
+            visit(name)
@@ -0,0 +1,177 @@
+"""
+Price Cache
+Persistent per-ticker OHLCV store with incremental delta fetching
+Replaces the in-process lru_cache on PerformanceAnalyzer._fetch_stock_data
+"""
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from urllib.parse import quote
+
+from .data_providers import DataProvider, slice_dates
+
+COVERAGE_KEY = b'coverage'
+
+
+class PriceCache:
+    """
+    One Parquet file per ticker holding the fetched history plus the date
+    range it covers (stored in the file's schema metadata).
+
+    Writes go to a temp file and are swapped in with os.replace, so
+    concurrent runs sharing the directory never see a partial file.
+    When the directory grows past max_bytes, least recently used
+    tickers are evicted.
+    """
+
+    def __init__(self, directory, max_bytes: Optional[int] = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def load(self, ticker: str) -> Optional[Tuple[pd.DataFrame, pd.Timestamp, pd.Timestamp]]:
+        """Return (data, coverage_start, coverage_end) or None on a miss"""
+        path = self._path(ticker)
+        try:
+            table = pq.read_table(path)
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, OSError, pa.ArrowInvalid):
+            return None
+
+        coverage = json.loads((table.schema.metadata or {}).get(COVERAGE_KEY, b'{}'))
+        if not coverage:
+            return None
+
+        data = table.to_pandas()
+        return data, pd.Timestamp(coverage['start']), pd.Timestamp(coverage['end'])
+
+    def store(self, ticker: str, data: pd.DataFrame,
+              start: pd.Timestamp, end: pd.Timestamp):
+        """Atomically write a ticker's history and its covered range"""
+        table = pa.Table.from_pandas(data, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[COVERAGE_KEY] = json.dumps({
+            'start': start.isoformat(),
+            'end': end.isoformat()
+        }).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path)
+            os.replace(tmp_path, self._path(ticker))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        self._evict()
+
+    def size_bytes(self) -> int:
+        return sum(f.stat().st_size for f in self.directory.glob('*.parquet'))
+
+    def _evict(self):
+        """Drop least recently used tickers until under max_bytes"""
+        if self.max_bytes is None:
+            return
+
+        files = []
+        for path in self.directory.glob('*.parquet'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def _path(self, ticker: str) -> Path:
+        return self.directory / f"{quote(ticker, safe='')}.parquet"
+
+
+class CachedProvider(DataProvider):
+    """
+    Serve history from a PriceCache, fetching only the ranges not yet covered
+
+    A request inside the cached range is a pure slice; a request extending
+    past either end fetches just the missing head and/or tail, each
+    overlapping the cache by one bar. Providers such as yfinance return
+    split- and dividend-adjusted history, so when an overlapping close no
+    longer matches the cached one (beyond rtol) the cached history is stale
+    and the ticker's whole range is refetched instead of stitched.
+    """
+
+    def __init__(self, provider: DataProvider, cache: PriceCache, rtol: float = 1e-6):
+        self.provider = provider
+        self.name = provider.name
+        self.cache = cache
+        self.rtol = rtol
+
+    def get_history(self, ticker: str, start_date: datetime,
+                    end_date: datetime) -> pd.DataFrame:
+        start, end = pd.Timestamp(start_date), pd.Timestamp(end_date)
+        # Bars after today don't exist yet; never mark them as covered
+        end = min(end, pd.Timestamp.now().normalize())
+
+        cached = self.cache.load(ticker)
+        if cached is None:
+            data, cov_start, cov_end = None, start, end
+            pieces = [self.provider.get_history(ticker, start, end)]
+        else:
+            data, cov_start, cov_end = cached
+            if cov_start <= start and end <= cov_end:
+                return slice_dates(data, start, end)
+
+            pieces = [data]
+            if start < cov_start:
+                # Through the first cached bar (the end date is exclusive)
+                head_end = data.index[0] + pd.Timedelta(days=1) if len(data) else cov_start
+                pieces.append(self.provider.get_history(ticker, start, max(head_end, cov_start)))
+            if end > cov_end:
+                # From the last cached bar
+                tail_start = data.index[-1] if len(data) else cov_end
+                pieces.append(self.provider.get_history(ticker, min(tail_start, cov_end), end))
+
+            if not all(self._matches(data, piece) for piece in pieces[1:]):
+                # Re-adjusted upstream since it was cached: replace, don't stitch
+                data, cov_start, cov_end = None, min(start, cov_start), max(end, cov_end)
+                pieces = [self.provider.get_history(ticker, cov_start, cov_end)]
+
+        pieces = [p for p in pieces if p is not None and not p.empty]
+        if not pieces:
+            return pd.DataFrame() if data is None else slice_dates(data, start, end)
+
+        merged = pd.concat(pieces)
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        self.cache.store(ticker, merged, min(start, cov_start), max(end, cov_end))
+
+        return slice_dates(merged, start, end)
+
+    def _matches(self, cached: pd.DataFrame, fresh: Optional[pd.DataFrame]) -> bool:
+        """Whether a delta fetch agrees with the cache on the bars they share"""
+        if fresh is None or fresh.empty or cached.empty or 'Close' not in fresh.columns:
+            return True
+        shared = cached.index.intersection(fresh.index)
+        if shared.empty:
+            # The overlapping bar is gone, so the join can't be checked
+            return False
+        return bool(np.allclose(
+            fresh.loc[shared, 'Close'].to_numpy(dtype=float),
+            cached.loc[shared, 'Close'].to_numpy(dtype=float),
+            rtol=self.rtol, atol=0, equal_nan=True
+        ))
+
+    def get_info(self, ticker: str) -> Dict:
+        return self.provider.get_info(ticker)
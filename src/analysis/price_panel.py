@@ -0,0 +1,126 @@
+"""
+Price Panel
+Aligned dates x tickers NumPy blocks replacing per-company DataFrames
+Accepted directly by the Risk, Supply Chain, Sector and Time Series analyzers
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List, Optional, Sequence
+
+
+class PanelCompany:
+    """Compact company record pointing at its column in a PricePanel"""
+
+    __slots__ = ('ticker', 'name', 'sector', 'metrics', 'panel', 'column', 'industry')
+
+    def __init__(self, ticker: str, name: str, sector: str, metrics: dict,
+                 panel: 'PricePanel', column: int, industry: str = ''):
+        self.ticker = ticker
+        self.name = name
+        self.sector = sector
+        self.metrics = metrics
+        self.panel = panel
+        self.column = column
+        self.industry = industry
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """This company's rows as a DataFrame (built on demand)"""
+        return self.panel.company_frame(self.column)
+
+    def __repr__(self):
+        return f"PanelCompany(ticker={self.ticker!r}, sector={self.sector!r})"
+
+
+class PricePanel:
+    """
+    One dates x tickers array per price field on a shared calendar.
+    Dates a ticker did not trade on are NaN.
+
+    Iterating the panel yields PanelCompany records, so it can be passed
+    anywhere a list of CompanyData is expected.
+    """
+
+    def __init__(self, dates: pd.DatetimeIndex, tickers: Sequence[str],
+                 fields: Dict[str, np.ndarray], names: Sequence[str],
+                 sectors: Sequence[str], metrics: Sequence[dict],
+                 industries: Optional[Sequence[str]] = None):
+        self.dates = dates
+        self.tickers = list(tickers)
+        self.fields = fields
+        industries = industries if industries is not None else [''] * len(self.tickers)
+        self.companies: List[PanelCompany] = [
+            PanelCompany(ticker, name, sector, metric, self, column, industry)
+            for column, (ticker, name, sector, metric, industry)
+            in enumerate(zip(self.tickers, names, sectors, metrics, industries))
+        ]
+        self._columns = {ticker: column for column, ticker in enumerate(self.tickers)}
+
+    @classmethod
+    def from_companies(cls, companies: List, fields: Sequence[str] = ('Close', 'Volume'),
+                       dtype=np.float64) -> 'PricePanel':
+        """Align CompanyData histories onto the union of their trading dates"""
+        indexes = [cls._calendar(company.data.index) for company in companies]
+        dates = pd.DatetimeIndex(
+            np.unique(np.concatenate([index.values for index in indexes]))
+            if indexes else [],
+            name='Date'
+        )
+
+        blocks = {
+            field: np.full((len(dates), len(companies)), np.nan, dtype=dtype)
+            for field in fields
+        }
+        for column, (company, index) in enumerate(zip(companies, indexes)):
+            rows = dates.get_indexer(index)
+            for field in fields:
+                if field in company.data.columns:
+                    blocks[field][rows, column] = company.data[field].to_numpy()
+
+        return cls(
+            dates,
+            [c.ticker for c in companies],
+            blocks,
+            [c.name for c in companies],
+            [c.sector for c in companies],
+            [c.metrics for c in companies],
+            [getattr(c, 'industry', '') for c in companies]
+        )
+
+    @staticmethod
+    def _calendar(index: pd.Index) -> pd.DatetimeIndex:
+        """Exchange-local trading dates, so listings in different timezones align"""
+        index = pd.DatetimeIndex(index)
+        if index.tz is not None:
+            index = index.tz_localize(None)
+        return index.normalize()
+
+    def field(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    def column(self, ticker: str) -> int:
+        return self._columns[ticker]
+
+    def company_frame(self, column: int) -> pd.DataFrame:
+        """Rows where the ticker has a close, as a DataFrame"""
+        frame = pd.DataFrame(
+            {name: block[:, column] for name, block in self.fields.items()},
+            index=self.dates
+        )
+        return frame[~np.isnan(self.fields['Close'][:, column])]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(block.nbytes for block in self.fields.values()) + self.dates.nbytes
+
+    def bytes_per_ticker(self) -> float:
+        return self.nbytes / max(1, len(self.tickers))
+
+    def __iter__(self) -> Iterator[PanelCompany]:
+        return iter(self.companies)
+
+    def __len__(self) -> int:
+        return len(self.companies)
+
+    def __getitem__(self, item):
+        return self.companies[item]
@@ -0,0 +1,146 @@
+"""
+Resolution Pyramid
+Precomputed daily / weekly / monthly OHLC and normalized close per ticker
+Lets the chart layer pick the coarsest level that still fills the plot width
+"""
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .metrics_kernel import forward_fill
+
+OHLC_FIELDS = ('Open', 'High', 'Low', 'Close')
+
+# level name -> pandas period frequency (None = daily bars as-is)
+PYRAMID_LEVELS = {
+    'daily': None,
+    'weekly': 'W',
+    'monthly': 'M'
+}
+
+
+class PyramidLevel:
+    """Bars at one resolution: dates x tickers arrays plus bar end dates"""
+
+    def __init__(self, name: str, dates: pd.DatetimeIndex, ohlc: Dict[str, np.ndarray],
+                 normalized: np.ndarray):
+        self.name = name
+        self.dates = dates
+        self.ohlc = ohlc
+        self.normalized = normalized
+
+    def points_in(self, start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> int:
+        return int(self.window_mask(start, end).sum())
+
+    def window_mask(self, start, end) -> np.ndarray:
+        mask = np.ones(len(self.dates), dtype=bool)
+        if start is not None:
+            mask &= self.dates >= pd.Timestamp(start)
+        if end is not None:
+            mask &= self.dates <= pd.Timestamp(end)
+        return mask
+
+
+class ResolutionPyramid:
+    """Daily, weekly and monthly bars built once from a PricePanel"""
+
+    def __init__(self, levels: Dict[str, PyramidLevel], tickers: List[str],
+                 names: List[str], sectors: List[str]):
+        self.levels = levels
+        self.tickers = tickers
+        self.names = names
+        self.sectors = sectors
+
+    @classmethod
+    def from_panel(cls, panel, dtype=np.float32) -> 'ResolutionPyramid':
+        """
+        Bars for the OHLC fields the panel carries (PANEL_SETTINGS['fields']);
+        missing fields are left out of each level's ohlc, not faked from Close
+        """
+        daily = {
+            field: panel.field(field).astype(np.float64)
+            for field in OHLC_FIELDS if field in panel.fields
+        }
+        close = daily['Close']
+
+        # Base 100 from each ticker's first close
+        traded = ~np.isnan(close)
+        first = close[np.argmax(traded, axis=0), np.arange(close.shape[1])]
+
+        levels = {}
+        for name, freq in PYRAMID_LEVELS.items():
+            if freq is None:
+                dates, ohlc = panel.dates, daily
+            else:
+                dates, ohlc = cls._aggregate(panel.dates, daily, freq)
+            levels[name] = PyramidLevel(
+                name,
+                dates,
+                {field: values.astype(dtype) for field, values in ohlc.items()},
+                (ohlc['Close'] / first * 100).astype(dtype)
+            )
+
+        return cls(levels, list(panel.tickers),
+                   [c.name for c in panel], [c.sector for c in panel])
+
+    @staticmethod
+    def _aggregate(dates: pd.DatetimeIndex, daily: Dict[str, np.ndarray], freq: str):
+        """OHLC per period with reduceat; periods a ticker didn't trade stay NaN"""
+        codes = dates.to_period(freq).asi8
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(dates)] - 1
+
+        traded = ~np.isnan(daily['Close'])
+        empty = np.add.reduceat(traded.astype(np.int32), starts, axis=0) == 0
+
+        # First / last valid bar inside each period
+        reducers = {
+            'Open': lambda values: forward_fill(values[::-1])[::-1][starts],
+            'High': lambda values: np.fmax.reduceat(values, starts, axis=0),
+            'Low': lambda values: np.fmin.reduceat(values, starts, axis=0),
+            'Close': lambda values: forward_fill(values)[ends]
+        }
+        ohlc = {field: reducers[field](values) for field, values in daily.items()}
+        for values in ohlc.values():
+            values[empty] = np.nan
+
+        # Label each bar with the last trading date in its period
+        return dates[ends], ohlc
+
+    def select_level(self, width_px: int, start: Optional[datetime] = None,
+                     end: Optional[datetime] = None) -> PyramidLevel:
+        """Coarsest level with at least one point per pixel in the window"""
+        for name in reversed(list(self.levels)):
+            if self.levels[name].points_in(start, end) >= width_px:
+                return self.levels[name]
+        return self.levels['daily']
+
+    def chart_frame(self, width_px: int, start: Optional[datetime] = None,
+                    end: Optional[datetime] = None,
+                    tickers: Optional[List[str]] = None) -> pd.DataFrame:
+        """Long-format frame (time_series_data layout) for the chosen level"""
+        level = self.select_level(width_px, start, end)
+        rows = np.flatnonzero(level.window_mask(start, end))
+        columns = np.arange(len(self.tickers))
+        if tickers is not None:
+            wanted = set(tickers)
+            columns = np.array([i for i, t in enumerate(self.tickers) if t in wanted], dtype=int)
+
+        values = level.normalized[np.ix_(rows, columns)]
+        row_idx, col_idx = np.nonzero(~np.isnan(values))
+        ticker_cols = columns[col_idx]
+
+        return pd.DataFrame({
+            'Date': level.dates[rows[row_idx]],
+            'Normalized_Price': np.round(values[row_idx, col_idx].astype(np.float64), 2),
+            'Company': np.asarray(self.names, dtype=object)[ticker_cols],
+            'Ticker': np.asarray(self.tickers, dtype=object)[ticker_cols],
+            'Sector': np.asarray(self.sectors, dtype=object)[ticker_cols]
+        }).sort_values(['Ticker', 'Date'], kind='stable', ignore_index=True)
+
+    @property
+    def date_range(self):
+        dates = self.levels['daily'].dates
+        return (dates[0], dates[-1]) if len(dates) else (None, None)
@@ -3,15 +3,42 @@ Risk Analyzer
 Handles risk assessment using Isolation Forest
 Extracted from sc_analyzer_new.py
 """
+import os
+import tempfile
 import numpy as np
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Optional
+
+import joblib
 from sklearn.ensemble import IsolationForest
-from typing import List, Dict
+import sys
+sys.path.append('..')
+from config import RISK_MODEL
+from .risk_features import FEATURE_NAMES, FEATURE_SCHEMA_VERSION, compute_risk_features
+
+project_root = Path(__file__).parent.parent.parent
+
+
+def default_model_path() -> Path:
+    """RISK_MODEL['path'] resolved against the project root"""
+    return project_root / RISK_MODEL['path']
+
 
 class RiskAnalyzer:
     """Analyze company risks using machine learning"""
     
-    def __init__(self):
-        pass
+    def __init__(self, model_path: Optional[str] = None, save_path: Optional[str] = None):
+        """
+        Args:
+            model_path: Saved model to score against; None fits a new model
+                on each analyzed universe
+            save_path: Persist a newly fitted model here (explicit save only;
+                fits are otherwise kept in memory)
+        """
+        self.model_path = model_path
+        self.save_path = save_path
+        self.model = self.load_model(model_path) if model_path else None
     
     def analyze_risk(self, companies: List, threshold: float = 0.3) -> Dict[str, Dict]:
         """
@@ -19,42 +46,142 @@ class RiskAnalyzer:
         Extracted from SCAnalyzer._analyze_risk
         
         Args:
-            companies: List of CompanyData objects
+            companies: List of CompanyData objects or a PricePanel
             threshold: Risk detection sensitivity (0.1-0.5)
             
         Returns:
             Dictionary of risk assessments by ticker
         """
-        if len(companies) < 3:
+        return self.apply_threshold(self.score_risk(companies), threshold)
+    
+    def score_risk(self, companies: List) -> Dict[str, Dict]:
+        """
+        Fit the Isolation Forest once and return continuous anomaly scores
+
+        Features are listed in risk_features.FEATURE_NAMES. With a saved
+        model the companies are scored without refitting. The sensitivity
+        is applied afterwards by apply_threshold, so changing it never
+        refits the model.
+        
+        Args:
+            companies: List of CompanyData objects or a PricePanel
+            
+        Returns:
+            Dictionary of {name, sector, anomaly_score} by ticker; lower
+            scores are more anomalous
+        """
+        if self.model is None and len(companies) < 3:
             return {}
         
-        # Prepare feature matrix
-        features = []
-        valid_companies = []
+        valid_companies, features = self._valid_features(companies)
         
-        for company in companies:
-            vol = company.metrics['volatility']
-            dd = abs(company.metrics['drawdown'])
-            
-            if not np.isnan([vol, dd]).any():
-                features.append([vol, dd])
-                valid_companies.append(company)
+        if self.model is not None:
+            # Saved model: score without refitting
+            detector = self.model['detector']
+        else:
+            if len(features) < 3:
+                return {}
+            # Tree construction doesn't depend on contamination, so one fit
+            # serves every sensitivity
+            detector = self.fit_model(features)
         
-        if len(features) < 3:
+        if not len(features):
             return {}
-        
-        # Run isolation forest
-        detector = IsolationForest(
-            contamination=min(threshold, 0.5),
-            random_state=42
-        )
-        scores = detector.fit_predict(np.array(features))
+        scores = detector.decision_function(features)
         
         return {
             company.ticker: {
                 'name': company.name,
                 'sector': company.sector,
-                'score': 'High' if score == -1 else 'Low'
+                'anomaly_score': float(score)
             }
             for company, score in zip(valid_companies, scores)
-        }
\ No newline at end of file
+        }
+    
+    def fit_model(self, features: np.ndarray) -> IsolationForest:
+        """Fit the forest on all cores, saving it only when a save_path was given"""
+        detector = IsolationForest(
+            n_estimators=RISK_MODEL['n_estimators'],
+            contamination='auto',
+            n_jobs=RISK_MODEL['n_jobs'],
+            random_state=42
+        )
+        detector.fit(features)
+        
+        if self.save_path:
+            self.save_model(detector, self.save_path, n_samples=len(features))
+        return detector
+    
+    @staticmethod
+    def save_model(detector: IsolationForest, path: str, n_samples: int = 0):
+        """
+        Write the fitted forest with its feature schema
+        
+        The model is dumped to a temp file beside path and swapped in with
+        os.replace, so a concurrent batch --risk-model never reads a
+        partially written file.
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            joblib.dump({
+                'detector': detector,
+                'schema_version': FEATURE_SCHEMA_VERSION,
+                'feature_names': list(FEATURE_NAMES),
+                'n_samples': n_samples,
+                'fitted_at': datetime.now().isoformat(timespec='seconds')
+            }, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+    
+    @staticmethod
+    def load_model(path: str) -> Dict:
+        """Load a saved model, rejecting ones built on another feature schema"""
+        model = joblib.load(path)
+        if model.get('schema_version') != FEATURE_SCHEMA_VERSION \
+                or model.get('feature_names') != FEATURE_NAMES:
+            raise ValueError(
+                f"Risk model {path} uses feature schema {model.get('schema_version')}, "
+                f"expected {FEATURE_SCHEMA_VERSION}; refit it"
+            )
+        return model
+    
+    @staticmethod
+    def _valid_features(companies):
+        """Companies with a complete feature row, and those rows"""
+        companies, features = compute_risk_features(companies)
+        complete = ~np.isnan(features).any(axis=1)
+        return [c for c, ok in zip(companies, complete) if ok], features[complete]
+    
+    @staticmethod
+    def apply_threshold(risk_scores: Dict[str, Dict], threshold: float = 0.3) -> Dict[str, Dict]:
+        """
+        Label the lowest-scoring `threshold` fraction as High risk
+        
+        Equivalent to refitting with contamination=threshold: sklearn
+        flags samples scoring below that percentile of the training scores.
+        
+        Args:
+            risk_scores: Output of score_risk
+            threshold: Risk detection sensitivity (0.1-0.5)
+            
+        Returns:
+            Dictionary of risk assessments by ticker
+        """
+        if not risk_scores:
+            return {}
+        
+        scores = np.array([r['anomaly_score'] for r in risk_scores.values()])
+        cut = np.quantile(scores, min(threshold, 0.5))
+        
+        return {
+            ticker: {
+                **risk,
+                'score': 'High' if risk['anomaly_score'] < cut else 'Low'
+            }
+            for ticker, risk in risk_scores.items()
+        }
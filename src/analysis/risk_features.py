@@ -0,0 +1,118 @@
+"""
+Risk Features
+Vectorized per-ticker risk features computed from the price panel
+Feeds the Isolation Forest in RiskAnalyzer
+"""
+import numpy as np
+from typing import List, Tuple
+
+from .metrics_kernel import TRADING_DAYS, compact, forward_fill
+from .price_panel import PricePanel
+
+# Bump whenever features are added, removed or redefined; saved models
+# with a different version are rejected
+FEATURE_SCHEMA_VERSION = 3
+
+FEATURE_NAMES = [
+    'volatility',              # mean annualized rolling volatility (%)
+    'abs_drawdown',            # worst peak-to-trough decline (%)
+    'downside_deviation',      # annualized std of negative returns (%)
+    'max_drawdown_duration',   # longest stretch below a prior peak (trading days)
+    'skew',                    # skewness of daily returns
+    'beta'                     # beta to the equal-weight semiconductor basket
+]
+
+BASKET_SECTOR = 'Semiconductors'
+
+
+def daily_returns(close: np.ndarray) -> np.ndarray:
+    """Returns against the previous available close; NaN where not traded"""
+    close = np.asarray(close, dtype=np.float64)
+    returns = np.full_like(close, np.nan)
+    returns[1:] = close[1:] / forward_fill(close)[:-1] - 1
+    return returns
+
+
+def basket_returns(panel: PricePanel, returns: np.ndarray) -> np.ndarray:
+    """
+    Equal-weight BASKET_SECTOR daily returns (whole universe if none), one
+    column per ticker with that ticker left out of its own basket
+    """
+    in_basket = np.array([c.sector == BASKET_SECTOR for c in panel])
+    if not in_basket.any():
+        in_basket[:] = True
+    valid = ~np.isnan(returns) & in_basket
+    zeroed = np.where(valid, returns, 0.0)
+    total = zeroed.sum(axis=1, keepdims=True) - zeroed
+    count = valid.sum(axis=1, keepdims=True) - valid
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def max_drawdown_duration(close: np.ndarray) -> np.ndarray:
+    """Longest run of a ticker's own bars spent below the running peak, per column"""
+    close = compact(np.asarray(close, dtype=np.float64))
+    peak = np.fmax.accumulate(close, axis=0)
+    rows = np.arange(len(close))[:, None]
+
+    with np.errstate(invalid='ignore'):
+        at_peak = ~(close < peak)
+    last_peak = np.maximum.accumulate(np.where(at_peak, rows, 0), axis=0)
+    duration = np.where(np.isnan(close), 0, rows - last_peak)
+    return duration.max(axis=0).astype(np.float64)
+
+
+def compute_risk_features(companies) -> Tuple[List, np.ndarray]:
+    """
+    Build the feature matrix for every company
+
+    Args:
+        companies: PricePanel, or list of CompanyData (aligned first)
+
+    Returns:
+        (companies, features) with one row per company in FEATURE_NAMES order;
+        rows with any missing feature are NaN
+    """
+    panel = companies if isinstance(companies, PricePanel) else \
+        PricePanel.from_companies(companies, fields=('Close',))
+    if not len(panel):
+        return [], np.empty((0, len(FEATURE_NAMES)))
+
+    returns = daily_returns(panel.field('Close'))
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=0)
+    zeroed = np.where(valid, returns, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Downside deviation
+        downside = np.sqrt((np.minimum(zeroed, 0.0) ** 2).sum(axis=0) / count) \
+            * np.sqrt(TRADING_DAYS) * 100
+
+        # Skewness (population moments)
+        mean = zeroed.sum(axis=0) / count
+        centered = np.where(valid, returns - mean, 0.0)
+        m2 = (centered ** 2).sum(axis=0) / count
+        m3 = (centered ** 3).sum(axis=0) / count
+        skew = m3 / m2 ** 1.5
+
+        # Beta to the equal-weight sector basket without the ticker itself
+        basket = basket_returns(panel, returns)
+        pair = valid & ~np.isnan(basket)
+        b = np.where(pair, basket, 0.0)
+        r = np.where(pair, returns, 0.0)
+        n = pair.sum(axis=0)
+        cov = (r * b).sum(axis=0) / n - (r.sum(axis=0) / n) * (b.sum(axis=0) / n)
+        var = (b * b).sum(axis=0) / n - (b.sum(axis=0) / n) ** 2
+        beta = cov / var
+
+    features = np.column_stack([
+        [c.metrics.get('volatility', np.nan) for c in panel],
+        [abs(c.metrics.get('drawdown', np.nan)) for c in panel],
+        downside,
+        max_drawdown_duration(panel.field('Close')),
+        skew,
+        beta
+    ]).astype(np.float64)
+    features[~np.isfinite(features)] = np.nan
+
+    return list(panel), features
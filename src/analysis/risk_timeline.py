@@ -0,0 +1,174 @@
+"""
+Risk Timeline
+Rolling-window anomaly scores for every ticker and date
+Window features come from prefix sums over each ticker's own bars, so each
+window costs O(1) per ticker
+"""
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from sklearn.ensemble import IsolationForest
+import sys
+sys.path.append('..')
+from config import RISK_TIMELINE
+from .metrics_kernel import TRADING_DAYS, compact
+from .price_panel import PricePanel
+from .risk_features import basket_returns, daily_returns
+
+ROLLING_FEATURE_NAMES = [
+    'volatility',            # annualized std of returns in the window (%)
+    'downside_deviation',    # annualized std of negative returns (%)
+    'skew',                  # skewness of returns
+    'beta',                  # beta to the semiconductor basket
+    'window_return'          # compounded return over the window (%)
+]
+
+
+class RiskTimeline:
+    """Anomaly scores as a dates x tickers float32 matrix; NaN = no full window"""
+
+    def __init__(self, dates: pd.DatetimeIndex, tickers: List[str], names: List[str],
+                 sectors: List[str], scores: np.ndarray, window: int):
+        self.dates = dates
+        self.tickers = tickers
+        self.names = names
+        self.sectors = sectors
+        self.scores = scores
+        self.window = window
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def frame(self, tickers: Optional[List[str]] = None) -> pd.DataFrame:
+        """Scores as a DataFrame indexed by date with one column per ticker"""
+        df = pd.DataFrame(self.scores, index=self.dates, columns=self.tickers)
+        return df if tickers is None else df[list(tickers)]
+
+    def most_anomalous(self, n: int) -> List[str]:
+        """Tickers with the lowest score reached at any point"""
+        with np.errstate(invalid='ignore'):
+            worst = np.where(np.isnan(self.scores), np.inf, self.scores).min(axis=0)
+        return [self.tickers[i] for i in np.argsort(worst, kind='stable')[:n]]
+
+
+def _window_sums(values: np.ndarray, valid: np.ndarray, window: int,
+                 rows: np.ndarray) -> np.ndarray:
+    """
+    Sum over each column's last `window` valid bars up to each of `rows`,
+    from one prefix sum of the column compacted to its own bars
+    """
+    own = np.nan_to_num(compact(np.where(valid, values, np.nan)))
+    prefix = np.zeros((len(values) + 1,) + values.shape[1:])
+    np.cumsum(own, axis=0, out=prefix[1:])
+    seen = np.cumsum(valid, axis=0)[rows]
+    return np.take_along_axis(prefix, seen, axis=0) - \
+        np.take_along_axis(prefix, np.maximum(seen - window, 0), axis=0)
+
+
+def rolling_features(panel: PricePanel, window: int, step: int = 1,
+                     min_periods: Optional[int] = None):
+    """
+    Window features for every ticker at every `step`-th date
+
+    Each window holds the ticker's own last `window` returns, so other
+    listings' trading days and holidays don't change its length. Moments
+    are summed about the ticker's mean return to avoid cancellation.
+
+    Returns:
+        (rows, features) where rows index panel.dates and features has shape
+        (len(rows), tickers, len(ROLLING_FEATURE_NAMES)), NaN where the ticker
+        did not trade or its window has fewer than min_periods returns
+    """
+    min_periods = min_periods or window
+    returns = daily_returns(panel.field('Close'))
+    rows = np.arange(window, len(returns), step)
+    if not len(rows):
+        return rows, np.empty((0, len(panel), len(ROLLING_FEATURE_NAMES)))
+
+    valid = ~np.isnan(returns)
+    with np.errstate(invalid='ignore'):
+        center = np.nan_to_num(np.nanmean(returns, axis=0))
+    d = np.where(valid, returns - center, 0.0)
+    r = np.where(valid, returns, 0.0)
+    basket = basket_returns(panel, returns)
+    pair = valid & ~np.isnan(basket)
+    b = np.where(pair, basket, 0.0)
+    rp = np.where(pair, returns, 0.0)
+
+    def sums(values):
+        return _window_sums(values, valid, window, rows)
+
+    n = sums(np.ones_like(r))
+    s1, s2, s3 = sums(d), sums(d ** 2), sums(d ** 3)
+    down = sums(np.minimum(r, 0.0) ** 2)
+    log_growth = sums(np.log1p(r))
+    n_pair = sums(pair.astype(np.float64))
+    sb, sbb, srb, sr = sums(b), sums(b * b), sums(rp * b), sums(rp)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = s1 / n
+        m2 = s2 / n - mean ** 2
+        m3 = s3 / n - 3 * mean * s2 / n + 2 * mean ** 3
+        volatility = np.sqrt(m2 * n / (n - 1)) * np.sqrt(TRADING_DAYS) * 100
+        downside = np.sqrt(down / n) * np.sqrt(TRADING_DAYS) * 100
+        skew = m3 / m2 ** 1.5
+        cov = srb / n_pair - (sr / n_pair) * (sb / n_pair)
+        var = sbb / n_pair - (sb / n_pair) ** 2
+        beta = cov / var
+        window_return = np.expm1(log_growth) * 100
+
+    features = np.stack([volatility, downside, skew, beta, window_return], axis=-1)
+    features[(n < min_periods) | ~valid[rows]] = np.nan
+    features[~np.isfinite(features)] = np.nan
+    return rows, features.astype(np.float32)
+
+
+def build_risk_timeline(panel: PricePanel, window: Optional[int] = None,
+                        step: Optional[int] = None) -> Optional[RiskTimeline]:
+    """
+    Fit one Isolation Forest on a sample of all windows and score every
+    window in parallel row chunks
+
+    Returns:
+        RiskTimeline, or None when the history is shorter than one window
+    """
+    settings = RISK_TIMELINE
+    window = window or settings['window']
+    step = step or settings['step']
+
+    rows, features = rolling_features(panel, window, step)
+    flat = features.reshape(-1, len(ROLLING_FEATURE_NAMES))
+    complete = np.flatnonzero(~np.isnan(flat).any(axis=1))
+    if len(complete) < 3:
+        return None
+
+    rng = np.random.default_rng(42)
+    sample = complete
+    if len(sample) > settings['fit_sample']:
+        sample = rng.choice(complete, settings['fit_sample'], replace=False)
+
+    detector = IsolationForest(
+        n_estimators=settings['n_estimators'],
+        contamination='auto',
+        n_jobs=settings['max_workers'],
+        random_state=42
+    )
+    detector.fit(flat[sample])
+
+    chunks = np.array_split(complete, max(1, -(-len(complete) // settings['chunk_rows'])))
+    with ThreadPoolExecutor(max_workers=settings['max_workers']) as executor:
+        scored = list(executor.map(lambda idx: detector.decision_function(flat[idx]), chunks))
+
+    scores = np.full(len(flat), np.nan, dtype=np.float32)
+    for idx, values in zip(chunks, scored):
+        scores[idx] = values
+
+    return RiskTimeline(
+        panel.dates[rows],
+        list(panel.tickers),
+        [c.name for c in panel],
+        [c.sector for c in panel],
+        scores.reshape(len(rows), len(panel)),
+        window
+    )
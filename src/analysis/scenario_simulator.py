@@ -0,0 +1,319 @@
+"""
+Scenario Simulator
+Monte Carlo disruption scenarios over correlated return paths
+Streaming drawdown percentiles from fixed-bin histograms merged across processes
+"""
+import logging
+import multiprocessing
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import sys
+sys.path.append('..')
+from config import DEPENDENCY_GRAPH, SCENARIO_SETTINGS
+from .blockwise_correlation import BlockwiseCorrelation
+from .dependency_graph import DependencyGraph, load_dependency_graph
+from .price_panel import PricePanel
+from .risk_features import daily_returns
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class Scenario:
+    """
+    A disruption overlay on top of the historical return distribution
+
+    shocks maps a sector or ticker to a cumulative return shock (e.g.
+    {'Semiconductors': -0.30}) spread evenly over the first duration_days
+    of the horizon. With propagate, shocked suppliers pass the hit on to
+    their customers through the dependency graph.
+    """
+    name: str
+    shocks: Dict[str, float] = field(default_factory=dict)
+    duration_days: int = 0
+    propagate: bool = True
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> 'Scenario':
+        return cls(
+            name=spec['name'],
+            shocks=dict(spec.get('shocks', {})),
+            duration_days=int(spec.get('duration_days', 0)),
+            propagate=bool(spec.get('propagate', True))
+        )
+
+
+class DrawdownHistogram:
+    """
+    Fixed-bin histograms of max drawdown (0-100%) for several series.
+    Counts add across batches and processes, so percentiles never need
+    the individual paths.
+    """
+
+    def __init__(self, n_series: int, bins: int):
+        self.bins = bins
+        self.counts = np.zeros((n_series, bins), dtype=np.int64)
+        self.total = np.zeros(n_series)
+
+    def add(self, drawdowns: np.ndarray):
+        """drawdowns: (paths, series) as fractions in [0, 1]"""
+        n_series = self.counts.shape[0]
+        idx = np.minimum((drawdowns * self.bins).astype(np.int64), self.bins - 1)
+        idx += np.arange(n_series) * self.bins
+        self.counts += np.bincount(idx.ravel(), minlength=n_series * self.bins) \
+            .reshape(n_series, self.bins)
+        self.total += drawdowns.sum(axis=0, dtype=np.float64)
+
+    def merge(self, other: 'DrawdownHistogram'):
+        self.counts += other.counts
+        self.total += other.total
+
+    @property
+    def n_paths(self) -> int:
+        return int(self.counts[0].sum()) if len(self.counts) else 0
+
+    def mean(self) -> np.ndarray:
+        return self.total / max(self.n_paths, 1) * 100
+
+    def percentile(self, q: float) -> np.ndarray:
+        """Drawdown (%) at percentile q, interpolated inside the bin"""
+        cumulative = np.cumsum(self.counts, axis=1)
+        target = q / 100 * cumulative[:, -1]
+        bin_idx = np.array([np.searchsorted(row, t) for row, t in zip(cumulative, target)])
+        bin_idx = np.minimum(bin_idx, self.bins - 1)
+        rows = np.arange(len(bin_idx))
+        below = np.where(bin_idx > 0, cumulative[rows, bin_idx - 1], 0)
+        in_bin = np.maximum(self.counts[rows, bin_idx], 1)
+        fraction = np.clip((target - below) / in_bin, 0, 1)
+        return (bin_idx + fraction) / self.bins * 100
+
+
+# float32 (paths, days, series) arrays alive at once in a batch: the log
+# returns plus the cumulative sum and running peak inside _max_drawdown
+BATCH_ARRAYS = 3
+
+
+def _max_drawdown(log_returns: np.ndarray) -> np.ndarray:
+    """Max drawdown fraction per (path, series) of (paths, days, series) log returns"""
+    cumulative = np.cumsum(log_returns, axis=1)
+    peak = np.maximum.accumulate(cumulative, axis=1)
+    np.maximum(peak, 0, out=peak)
+    np.subtract(cumulative, peak, out=peak)
+    return -np.expm1(np.min(peak, axis=1))
+
+
+def _simulate_chunk(task) -> DrawdownHistogram:
+    """Worker entry point: simulate n_paths in memory-bounded batches"""
+    (seed, n_paths, mean, cholesky, overlay, duration, horizon,
+     membership, bins, batch_size) = task
+    rng = np.random.default_rng(seed)
+    n_tickers = len(mean)
+    weights = (membership / membership.sum(axis=0)).astype(np.float32)
+
+    histogram = DrawdownHistogram(n_tickers + membership.shape[1], bins)
+    for start in range(0, n_paths, batch_size):
+        size = min(batch_size, n_paths - start)
+        log_returns = rng.standard_normal((size * horizon, n_tickers), dtype=np.float32) @ cholesky.T
+        log_returns = log_returns.reshape(size, horizon, n_tickers)
+        log_returns += mean
+        log_returns[:, :duration] += overlay
+        ticker_drawdowns = _max_drawdown(log_returns)
+
+        # Equal-weight sector portfolios from simple returns
+        np.expm1(log_returns, out=log_returns)
+        portfolio = np.log1p(log_returns @ weights)
+        del log_returns
+        histogram.add(np.hstack([ticker_drawdowns, _max_drawdown(portfolio)]))
+    return histogram
+
+
+class ScenarioSimulator:
+    """Correlated return paths fitted to the panel's history"""
+
+    def __init__(self, companies, graph: Optional[DependencyGraph] = None,
+                 settings: Optional[Dict] = None):
+        """
+        Args:
+            companies: List of CompanyData objects or a PricePanel
+            graph: Dependency graph for propagating shocks; defaults to
+                DEPENDENCY_GRAPH['edge_file']
+        """
+        self.settings = settings or SCENARIO_SETTINGS
+        self.panel = companies if isinstance(companies, PricePanel) else \
+            PricePanel.from_companies(companies, fields=('Close',))
+        self.graph = graph if graph is not None else load_dependency_graph(DEPENDENCY_GRAPH)
+
+        self.tickers = list(self.panel.tickers)
+        self.ticker_sectors = [c.sector for c in self.panel]
+        self.sectors = sorted(set(self.ticker_sectors))
+        self.membership = np.zeros((len(self.tickers), len(self.sectors)), dtype=np.float32)
+        self.membership[np.arange(len(self.tickers)),
+                        [self.sectors.index(s) for s in self.ticker_sectors]] = 1
+
+        log_returns = np.log1p(daily_returns(self.panel.field('Close')))
+        with np.errstate(invalid='ignore'):
+            self.mean = np.nan_to_num(np.nanmean(log_returns, axis=0)).astype(np.float32)
+        # Shrunk covariance is positive definite even for short histories
+        covariance = BlockwiseCorrelation('float64', shrinkage='ledoit_wolf').covariance(log_returns)
+        self.cholesky = self._cholesky(covariance).astype(np.float32)
+
+    def run(self, scenario: Scenario, n_paths: Optional[int] = None,
+            seed: Optional[int] = None) -> List[Dict]:
+        """
+        Simulate the scenario and summarize max drawdown over the horizon
+
+        Paths are split into fixed-size tasks, each with its own child of
+        one SeedSequence, so results depend only on seed and n_paths, not
+        on the number of worker processes.
+
+        Returns:
+            One record per sector and per ticker with mean and percentile
+            drawdowns (%)
+        """
+        histograms = self._simulate([self._tasks(scenario, n_paths, seed)])
+        return self._summarize(scenario, histograms[0])
+
+    def run_all(self, scenarios: Optional[List[Dict]] = None,
+                n_paths: Optional[int] = None) -> List[Dict]:
+        """Every configured scenario, concatenated; one process pool serves them all"""
+        specs = scenarios if scenarios is not None else self.settings['scenarios']
+        scenarios = [Scenario.from_dict(spec) for spec in specs]
+        histograms = self._simulate([self._tasks(scenario, n_paths) for scenario in scenarios])
+        records = []
+        for scenario, histogram in zip(scenarios, histograms):
+            records.extend(self._summarize(scenario, histogram))
+        return records
+
+    def _tasks(self, scenario: Scenario, n_paths: Optional[int] = None,
+               seed: Optional[int] = None) -> List[tuple]:
+        """The scenario's paths as fixed-size, independently seeded tasks"""
+        settings = self.settings
+        n_paths = n_paths or settings['n_paths']
+        horizon = settings['horizon_days']
+        duration = min(scenario.duration_days, horizon)
+        overlay = self._overlay(scenario, duration)
+
+        per_task = settings['paths_per_task']
+        sizes = [min(per_task, n_paths - start) for start in range(0, n_paths, per_task)]
+        seeds = np.random.SeedSequence(settings['seed'] if seed is None else seed).spawn(len(sizes))
+        return [
+            (child, size, self.mean, self.cholesky, overlay, duration, horizon,
+             self.membership, settings['bins'], self._batch_size(horizon))
+            for child, size in zip(seeds, sizes)
+        ]
+
+    def _simulate(self, task_lists: List[List[tuple]]) -> List[DrawdownHistogram]:
+        """Run every task list's tasks, in one pool if any, and merge each list"""
+        tasks = [task for task_list in task_lists for task in task_list]
+        workers = self._workers(tasks)
+        if workers > 1:
+            try:
+                return self._merge(task_lists, self._pooled(tasks, workers))
+            except BrokenProcessPool:
+                # e.g. spawned children re-running a script with no main guard
+                logger.warning("Scenario worker pool failed; simulating in-process")
+        return self._merge(task_lists, map(_simulate_chunk, tasks))
+
+    def _workers(self, tasks: List[tuple]) -> int:
+        """
+        Processes to use: 1 when the paths x tickers are too few to repay
+        starting a pool, otherwise max_workers capped at the core count
+        """
+        settings = self.settings
+        work = sum(task[1] for task in tasks) * len(self.tickers)
+        if work < settings['min_pool_work']:
+            return 1
+        cores = os.cpu_count() or 1
+        return min(settings['max_workers'] or cores, cores, len(tasks))
+
+    def _pooled(self, tasks: List[tuple], workers: int) -> List[DrawdownHistogram]:
+        # Never fork: run() is called from pipeline threads next to BLAS and
+        # Streamlit threads, and a forked child can inherit a held lock
+        context = multiprocessing.get_context(self.settings['start_method'])
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            return list(executor.map(_simulate_chunk, tasks))
+
+    @staticmethod
+    def _merge(task_lists: List[List[tuple]], partials) -> List[DrawdownHistogram]:
+        """Fold the partial histograms, in task order, into one per task list"""
+        partials = iter(partials)
+        histograms = []
+        for task_list in task_lists:
+            histogram = None
+            for partial in islice(partials, len(task_list)):
+                if histogram is None:
+                    histogram = partial
+                else:
+                    histogram.merge(partial)
+            histograms.append(histogram)
+        return histograms
+
+    def _overlay(self, scenario: Scenario, duration: int) -> np.ndarray:
+        """Per-ticker daily log-return drift applied during the shock window"""
+        total = np.zeros(len(self.tickers))
+        if not duration or not scenario.shocks:
+            return total.astype(np.float32)
+
+        for i, (ticker, sector) in enumerate(zip(self.tickers, self.ticker_sectors)):
+            total[i] = scenario.shocks.get(ticker, scenario.shocks.get(sector, 0.0))
+
+        if scenario.propagate and self.graph is not None:
+            # Graph impacts are in percent of the supplier shock's magnitude
+            received = self.graph.propagate_to(
+                self.tickers, -total * 100,
+                tiers=DEPENDENCY_GRAPH['tiers'], decay=DEPENDENCY_GRAPH['decay']
+            )
+            total = total - received / 100
+
+        total = np.clip(total, -0.99, None)
+        return (np.log1p(total) / duration).astype(np.float32)
+
+    def _summarize(self, scenario: Scenario, histogram: DrawdownHistogram) -> List[Dict]:
+        # Histogram columns are tickers then sectors; report sectors first
+        n_tickers = len(self.tickers)
+        labels = [(n_tickers + i, 'Sector', s) for i, s in enumerate(self.sectors)] + \
+            [(i, 'Ticker', t) for i, t in enumerate(self.tickers)]
+        mean = histogram.mean()
+        percentiles = {q: histogram.percentile(q) for q in self.settings['percentiles']}
+        return [
+            {
+                'Scenario': scenario.name,
+                'Level': level,
+                'Name': name,
+                'Paths': histogram.n_paths,
+                'Mean_Drawdown_pct': round(float(mean[i]), 2),
+                **{f'P{q:g}_Drawdown_pct': round(float(values[i]), 2)
+                   for q, values in percentiles.items()}
+            }
+            for i, level, name in labels
+        ]
+
+    def _batch_size(self, horizon: int) -> int:
+        """
+        Paths per batch so a worker's working set fits memory_budget_mb
+
+        Counts BATCH_ARRAYS float32 (paths, days, tickers + sectors) arrays
+        and the per-path histogram indexes, after the fixed histogram,
+        Cholesky factor and weights.
+        """
+        n_tickers, n_sectors = len(self.tickers), len(self.sectors)
+        n_series = n_tickers + n_sectors
+        fixed = n_series * self.settings['bins'] * 8 + n_tickers * (n_tickers + n_sectors) * 4
+        per_path = horizon * n_series * 4 * BATCH_ARRAYS + n_series * 8 * 2
+        budget = self.settings['memory_budget_mb'] * 1024 * 1024 - fixed
+        return max(1, int(budget // per_path))
+
+    @staticmethod
+    def _cholesky(covariance: np.ndarray) -> np.ndarray:
+        jitter = 0.0
+        scale = np.mean(np.diag(covariance)) or 1.0
+        for _ in range(6):
+            try:
+                return np.linalg.cholesky(covariance + jitter * np.eye(len(covariance)))
+            except np.linalg.LinAlgError:
+                jitter = max(jitter * 10, scale * 1e-10)
+        raise ValueError("Covariance is not positive definite")
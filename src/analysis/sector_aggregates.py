@@ -0,0 +1,181 @@
+"""
+Sector Aggregates
+Mergeable partial aggregates rolled up company -> industry -> sector
+Batch shards and daily deltas combine in O(industries) without revisiting companies
+"""
+import math
+import pickle
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+
+class RunningStats:
+    """
+    Count, sum, sum of squares, min and max of one value.
+
+    add/remove/merge are O(1). Min and max cannot be un-done, so after a
+    remove they stay bounds of every value ever added rather than exact.
+    """
+
+    __slots__ = ('count', 'total', 'total_sq', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def remove(self, value: float):
+        self.count -= 1
+        self.total -= value
+        self.total_sq -= value * value
+
+    def merge(self, other: 'RunningStats'):
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count > 0 else math.nan
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation"""
+        if self.count <= 0:
+            return math.nan
+        mean = self.mean
+        return math.sqrt(max(self.total_sq / self.count - mean * mean, 0.0))
+
+
+class SectorAggregate:
+    """Impact and return statistics plus threshold counters for one group"""
+
+    __slots__ = ('impact', 'returns', 'critical', 'severe')
+
+    def __init__(self):
+        self.impact = RunningStats()
+        self.returns = RunningStats()
+        self.critical = 0
+        self.severe = 0
+
+    @property
+    def count(self) -> int:
+        return self.impact.count
+
+    def add(self, impact: float, ret: float, critical: float, severe: float):
+        self.impact.add(impact)
+        self.returns.add(ret)
+        tier = _tier(impact, critical, severe)
+        self.critical += tier == 'critical'
+        self.severe += tier == 'severe'
+
+    def remove(self, impact: float, ret: float, critical: float, severe: float):
+        self.impact.remove(impact)
+        self.returns.remove(ret)
+        tier = _tier(impact, critical, severe)
+        self.critical -= tier == 'critical'
+        self.severe -= tier == 'severe'
+
+    def merge(self, other: 'SectorAggregate'):
+        self.impact.merge(other.impact)
+        self.returns.merge(other.returns)
+        self.critical += other.critical
+        self.severe += other.severe
+
+
+def _tier(impact: float, critical: float, severe: float) -> str:
+    if impact >= critical:
+        return 'critical'
+    if impact >= severe:
+        return 'severe'
+    return ''
+
+
+class SectorAggregateBook:
+    """
+    SectorAggregates keyed by (sector, industry).
+
+    Sector figures are rolled up from their industries on demand, in the
+    order sectors first appeared. A book built from removals and adds is
+    a delta (counts may be negative) that merges into a full book.
+    """
+
+    def __init__(self, critical: float, severe: float):
+        self.critical = critical
+        self.severe = severe
+        self.industries: Dict[Tuple[str, str], SectorAggregate] = {}
+
+    @classmethod
+    def from_companies(cls, companies: List, critical: float, severe: float) -> 'SectorAggregateBook':
+        book = cls(critical, severe)
+        for company in companies:
+            book.add(company)
+        return book
+
+    @staticmethod
+    def _values(company) -> Tuple[Tuple[str, str], float, float]:
+        key = (company.sector, getattr(company, 'industry', '') or '')
+        return key, abs(company.metrics['drawdown']), company.metrics['return']
+
+    def add(self, company):
+        """Add a CompanyData / PanelCompany with computed metrics"""
+        key, impact, ret = self._values(company)
+        if key not in self.industries:
+            self.industries[key] = SectorAggregate()
+        self.industries[key].add(impact, ret, self.critical, self.severe)
+
+    def remove(self, company):
+        """Remove a company with the metrics it was added with"""
+        key, impact, ret = self._values(company)
+        if key not in self.industries:
+            self.industries[key] = SectorAggregate()
+        self.industries[key].remove(impact, ret, self.critical, self.severe)
+        if self.industries[key].count == 0:
+            del self.industries[key]
+
+    def update(self, old, new):
+        """Replace a company's previous metrics with its new ones"""
+        self.remove(old)
+        self.add(new)
+
+    def merge(self, other: 'SectorAggregateBook'):
+        """Fold in another shard or delta, O(industries)"""
+        if (other.critical, other.severe) != (self.critical, self.severe):
+            raise ValueError("Cannot merge sector aggregates built with different thresholds")
+        for key, aggregate in other.industries.items():
+            if key not in self.industries:
+                self.industries[key] = SectorAggregate()
+            self.industries[key].merge(aggregate)
+            if self.industries[key].count == 0:
+                del self.industries[key]
+
+    def sectors(self) -> Iterator[Tuple[str, SectorAggregate]]:
+        """Sector totals rolled up from their industries"""
+        rolled: Dict[str, SectorAggregate] = {}
+        for (sector, _), aggregate in self.industries.items():
+            if sector not in rolled:
+                rolled[sector] = SectorAggregate()
+            rolled[sector].merge(aggregate)
+        return iter(rolled.items())
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @staticmethod
+    def load(path) -> 'SectorAggregateBook':
+        with open(path, 'rb') as f:
+            return pickle.load(f)
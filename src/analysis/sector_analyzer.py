@@ -8,6 +8,7 @@ from typing import List, Dict
 import sys
 sys.path.append('..')
 from config import IMPACT_THRESHOLDS, RISK_LEVEL_THRESHOLDS
+from .sector_aggregates import SectorAggregate, SectorAggregateBook
 
 class SectorAnalyzer:
     """Analyze sector vulnerabilities"""
@@ -22,48 +23,62 @@ class SectorAnalyzer:
         Extracted from SCAnalyzer._analyze_sectors
         
         Args:
-            companies: List of CompanyData objects
+            companies: List of CompanyData objects or a PricePanel
             
         Returns:
             List of sector vulnerability dictionaries
         """
-        sector_data = {}
+        return self.sector_records(self.aggregate(companies))
+    
+    def analyze_industries(self, companies: List) -> List[Dict]:
+        """
+        Industry-level breakdown within each sector
         
-        for company in companies:
-            if company.sector not in sector_data:
-                sector_data[company.sector] = {
-                    'impacts': [],
-                    'returns': [],
-                    'companies': 0,
-                    'critical': 0,
-                    'severe': 0
-                }
-            
-            data = sector_data[company.sector]
-            impact = abs(company.metrics['drawdown'])
-            
-            data['impacts'].append(impact)
-            data['returns'].append(company.metrics['return'])
-            data['companies'] += 1
+        Args:
+            companies: List of CompanyData objects or a PricePanel
             
-            if impact >= self._impact_thresholds['Critical']:
-                data['critical'] += 1
-            elif impact >= self._impact_thresholds['Severe']:
-                data['severe'] += 1
-        
+        Returns:
+            List of industry vulnerability dictionaries
+        """
+        return self.industry_records(self.aggregate(companies))
+    
+    def aggregate(self, companies: List) -> SectorAggregateBook:
+        """
+        Mergeable per-industry aggregates; shards or daily deltas built
+        with this method can be combined with SectorAggregateBook.merge
+        """
+        return SectorAggregateBook.from_companies(
+            companies,
+            critical=self._impact_thresholds['Critical'],
+            severe=self._impact_thresholds['Severe']
+        )
+    
+    def sector_records(self, book: SectorAggregateBook) -> List[Dict]:
+        """Sector vulnerability dictionaries from (possibly merged) aggregates"""
         return [
-            {
-                'Sector': sector,
-                'Companies_Analyzed': data['companies'],
-                'Avg_Financial_Impact_pct': round(np.mean(data['impacts']), 1),
-                'Avg_Return_Pct': round(np.mean(data['returns']), 1),
-                'Critical_Impact_Companies': data['critical'],
-                'Severe_Impact_Companies': data['severe'],
-                'Supply_Chain_Risk_Level': self._get_risk_level(np.mean(data['impacts']))
-            }
-            for sector, data in sector_data.items()
+            {'Sector': sector, **self._record(aggregate)}
+            for sector, aggregate in book.sectors()
         ]
     
+    def industry_records(self, book: SectorAggregateBook) -> List[Dict]:
+        """Industry vulnerability dictionaries from (possibly merged) aggregates"""
+        return [
+            {'Sector': sector, 'Industry': industry or 'Unknown', **self._record(aggregate)}
+            for (sector, industry), aggregate in book.industries.items()
+        ]
+    
+    def _record(self, aggregate: SectorAggregate) -> Dict:
+        # np.round, as on the original np.mean results: it rounds the scaled
+        # value half-to-even, which differs from round() on exact halves
+        return {
+            'Companies_Analyzed': aggregate.count,
+            'Avg_Financial_Impact_pct': float(np.round(aggregate.impact.mean, 1)),
+            'Avg_Return_Pct': float(np.round(aggregate.returns.mean, 1)),
+            'Critical_Impact_Companies': aggregate.critical,
+            'Severe_Impact_Companies': aggregate.severe,
+            'Supply_Chain_Risk_Level': self._get_risk_level(aggregate.impact.mean)
+        }
+    
     def _get_risk_level(self, impact: float) -> str:
         """
         Get sector risk level
@@ -72,4 +87,4 @@ class SectorAnalyzer:
         for level, threshold in self._risk_thresholds.items():
             if impact >= threshold:
                 return level
-        return 'Low'
\ No newline at end of file
+        return 'Low'
@@ -0,0 +1,142 @@
+"""
+Sector Classifier
+Ticker -> sector from an inverted SECTOR_MAP index and one compiled keyword matcher
+Classifies a whole universe from a metadata file in one bulk call
+"""
+import hashlib
+import json
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional
+import sys
+sys.path.append('..')
+from config import SECTOR_MAP, SECTOR_KEYWORDS, DEFAULT_SECTOR
+
+
+def rules_version(sector_map: Dict[str, List[str]], keyword_rules: Dict[str, List[str]],
+                  default: str) -> str:
+    """Digest of the rule set; results cached under one version are reused only by it"""
+    payload = json.dumps([sector_map, keyword_rules, default])
+    return hashlib.sha1(payload.encode()).hexdigest()[:12]
+
+
+class SectorClassifier:
+    """
+    Same decisions as the original per-ticker scans, built once:
+
+    - ticker -> sector dict inverted from SECTOR_MAP (first listing wins)
+    - every keyword in one regex; a lookahead at each position finds
+      overlapping matches and rule order decides between sectors
+    - keyword results memoized per distinct sector + industry text
+    """
+
+    def __init__(self, sector_map: Optional[Dict[str, List[str]]] = None,
+                 keyword_rules: Optional[Dict[str, List[str]]] = None,
+                 default: str = DEFAULT_SECTOR):
+        self.sector_map = sector_map if sector_map is not None else SECTOR_MAP
+        self.keyword_rules = keyword_rules if keyword_rules is not None else SECTOR_KEYWORDS
+        self.default = default
+        self.version = rules_version(self.sector_map, self.keyword_rules, default)
+
+        self.index: Dict[str, str] = {}
+        for sector, tickers in self.sector_map.items():
+            for ticker in tickers:
+                self.index.setdefault(ticker, sector)
+
+        self._sectors = list(self.keyword_rules)
+        alternatives = [
+            f"(?P<r{rank}>{'|'.join(re.escape(word) for word in words)})"
+            for rank, words in enumerate(self.keyword_rules.values()) if words
+        ]
+        self._matcher = re.compile(f"(?=(?:{'|'.join(alternatives)}))") if alternatives else None
+        self._text_cache: Dict[str, str] = {}
+        self._file_cache: Dict[tuple, pd.Series] = {}
+
+    def classify(self, ticker: str, info: Optional[Dict] = None) -> str:
+        """Sector for one ticker, from SECTOR_MAP or its provider metadata"""
+        sector = self.index.get(ticker)
+        if sector is not None:
+            return sector
+        info = info or {}
+        sector, industry = info.get('sector', ''), info.get('industry', '')
+        if not isinstance(sector, str) or not isinstance(industry, str):
+            # The original scan failed on non-text metadata and fell back to the default
+            return self.default
+        return self.match_text(sector.lower() + industry.lower())
+
+    def match_text(self, text: str) -> str:
+        """Sector of the highest-priority keyword found in lowercased text"""
+        cached = self._text_cache.get(text)
+        if cached is not None:
+            return cached
+
+        sector = self.default
+        if self._matcher is not None:
+            best = len(self._sectors)
+            for match in self._matcher.finditer(text):
+                rank = int(match.lastgroup[1:])
+                if rank < best:
+                    best = rank
+                    if rank == 0:
+                        break
+            if best < len(self._sectors):
+                sector = self._sectors[best]
+        self._text_cache[text] = sector
+        return sector
+
+    def classify_frame(self, metadata: pd.DataFrame) -> pd.Series:
+        """
+        Bulk classification of a metadata table
+
+        Args:
+            metadata: One row per ticker with ticker/Ticker and optional
+                sector and industry columns (provider metadata layout);
+                empty cells count as missing fields, as in MetadataStore
+
+        Returns:
+            Series of sectors indexed by ticker
+        """
+        ticker_col = 'ticker' if 'ticker' in metadata.columns else 'Ticker'
+        tickers = metadata[ticker_col].astype(str)
+
+        text = self._column_text(metadata, 'sector') + self._column_text(metadata, 'industry')
+        codes, uniques = pd.factorize(text)
+        matched = np.array([self.match_text(t) for t in uniques], dtype=object)[codes]
+
+        mapped = tickers.map(self.index).to_numpy(dtype=object)
+        sectors = np.where(pd.isna(mapped), matched, mapped)
+        return pd.Series(sectors, index=pd.Index(tickers.to_numpy(), name='Ticker'), name='Sector')
+
+    def classify_file(self, path) -> pd.Series:
+        """classify_frame over a metadata.csv / metadata.parquet, cached until the file changes"""
+        path = Path(path)
+        key = (str(path.resolve()), path.stat().st_mtime_ns)
+        if key not in self._file_cache:
+            metadata = pd.read_parquet(path) if path.suffix == '.parquet' else pd.read_csv(path)
+            metadata.columns = [str(c) for c in metadata.columns]
+            self._file_cache[key] = self.classify_frame(metadata)
+        return self._file_cache[key]
+
+    @staticmethod
+    def _column_text(metadata: pd.DataFrame, column: str) -> pd.Series:
+        if column not in metadata.columns:
+            return pd.Series('', index=metadata.index)
+        return metadata[column].fillna('').astype(str).str.lower()
+
+
+# One classifier per rule-set version, so its memoized results survive analyzer instances
+_CLASSIFIERS: Dict[str, SectorClassifier] = {}
+
+
+def get_classifier(sector_map: Optional[Dict[str, List[str]]] = None,
+                   keyword_rules: Optional[Dict[str, List[str]]] = None,
+                   default: str = DEFAULT_SECTOR) -> SectorClassifier:
+    """The shared classifier for this rule set (config rules by default)"""
+    sector_map = sector_map if sector_map is not None else SECTOR_MAP
+    keyword_rules = keyword_rules if keyword_rules is not None else SECTOR_KEYWORDS
+    version = rules_version(sector_map, keyword_rules, default)
+    if version not in _CLASSIFIERS:
+        _CLASSIFIERS[version] = SectorClassifier(sector_map, keyword_rules, default)
+    return _CLASSIFIERS[version]
@@ -3,20 +3,34 @@ Supply Chain Analyzer
 Handles supply chain impact assessment and resilience scoring
 Extracted from sc_analyzer_new.py
 """
-from typing import List, Dict
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Optional
 import sys
 sys.path.append('..')
 from config import (
     SEMICONDUCTOR_DEPENDENCY,
     IMPACT_THRESHOLDS,
     STRATEGIC_RECOMMENDATIONS,
-    RECOVERY_TIME_RULES
+    RECOVERY_TIME_RULES,
+    DEPENDENCY_GRAPH
 )
+from .dependency_graph import DependencyGraph, load_dependency_graph
 
 class SupplyChainAnalyzer:
     """Analyze supply chain impacts and resilience"""
     
-    def __init__(self):
+    def __init__(self, graph: Optional[DependencyGraph] = None, use_graph: bool = True):
+        """
+        Args:
+            graph: Supplier -> customer graph; defaults to DEPENDENCY_GRAPH['edge_file']
+            use_graph: False to score direct impact only, without propagation
+        """
+        if not use_graph:
+            self._graph = None
+        else:
+            self._graph = graph if graph is not None else load_dependency_graph(DEPENDENCY_GRAPH)
+        self._graph_settings = DEPENDENCY_GRAPH
         self._dependency_map = SEMICONDUCTOR_DEPENDENCY
         self._impact_thresholds = IMPACT_THRESHOLDS
         self._recommendations = STRATEGIC_RECOMMENDATIONS
@@ -28,19 +42,26 @@ class SupplyChainAnalyzer:
         Extracted from SCAnalyzer._analyze_supply_chain
         
         Args:
-            companies: List of CompanyData objects
+            companies: List of CompanyData objects or a PricePanel
             
         Returns:
             List of supply chain impact dictionaries
         """
-        return [
-            {
+        companies = list(companies)
+        direct = [abs(company.metrics['drawdown']) for company in companies]
+        propagated = self._propagated_impact(companies, direct)
+        
+        records = []
+        for company, own, received in zip(companies, direct, propagated):
+            impact = min(100.0, round(own + received, 2)) if received else own
+            records.append({
                 'Company': company.name,
                 'Ticker': company.ticker,
                 'Sector': company.sector,
                 'Semiconductor_Dependency': self._get_dependency(company.sector),
-                'Financial_Impact_pct': abs(company.metrics['drawdown']),
-                'Impact_Severity': self._get_severity(abs(company.metrics['drawdown'])),
+                'Financial_Impact_pct': impact,
+                'Propagated_Impact_pct': round(received, 2),
+                'Impact_Severity': self._get_severity(impact),
                 'Estimated_Recovery_Months': self._estimate_recovery(
                     company.metrics['return'],
                     company.metrics['volatility']
@@ -51,11 +72,122 @@ class SupplyChainAnalyzer:
                 ),
                 'Strategic_Recommendation': self._get_recommendation(
                     company.sector,
-                    abs(company.metrics['drawdown'])
+                    impact
                 )
-            }
-            for company in companies
-        ]
+            })
+        return records
+    
+    def analyze_supply_chain_frame(self, companies: List, as_arrow: bool = False):
+        """
+        Columnar analyze_supply_chain for large universes
+        
+        Args:
+            companies: List of CompanyData objects or a PricePanel
+            as_arrow: Return a pyarrow.Table instead of a DataFrame
+            
+        Returns:
+            DataFrame with one row per company, identical to the records
+            from analyze_supply_chain
+        """
+        companies = list(companies)
+        frame = self.score_columns(
+            tickers=[company.ticker for company in companies],
+            names=[company.name for company in companies],
+            sectors=[company.sector for company in companies],
+            returns=np.array([company.metrics['return'] for company in companies], dtype=np.float64),
+            volatility=np.array([company.metrics['volatility'] for company in companies], dtype=np.float64),
+            drawdown=np.array([company.metrics['drawdown'] for company in companies], dtype=np.float64)
+        )
+        if as_arrow:
+            import pyarrow as pa
+            return pa.Table.from_pandas(frame, preserve_index=False)
+        return frame
+    
+    def score_columns(self, tickers: List[str], names: List[str], sectors: List[str],
+                      returns: np.ndarray, volatility: np.ndarray,
+                      drawdown: np.ndarray) -> pd.DataFrame:
+        """
+        Vectorized impact, severity, recovery, resilience and recommendation
+        from metric arrays, using the same rules as the per-company helpers
+        """
+        direct = np.abs(drawdown)
+        propagated = self._propagated_impact_columns(tickers, direct)
+        combined = np.round(direct + propagated, 2)
+        impact = np.where(propagated != 0, np.where(combined < 100.0, combined, 100.0), direct)
+        
+        sector_codes, sector_labels = pd.factorize(np.asarray(sectors, dtype=object))
+        
+        return pd.DataFrame({
+            'Company': names,
+            'Ticker': tickers,
+            'Sector': sectors,
+            'Semiconductor_Dependency': np.array(
+                [self._get_dependency(sector) for sector in sector_labels], dtype=object
+            )[sector_codes],
+            'Financial_Impact_pct': impact,
+            'Propagated_Impact_pct': np.round(propagated, 2),
+            'Impact_Severity': np.select(
+                [impact >= threshold for threshold in self._impact_thresholds.values()],
+                list(self._impact_thresholds), default='Low'
+            ).astype(object),
+            'Estimated_Recovery_Months': np.select(
+                [returns > threshold for threshold, _ in self._recovery_rules],
+                [label for _, label in self._recovery_rules], default='18+ months'
+            ).astype(object),
+            'Supply_Chain_Resilience': self._resilience_columns(returns, drawdown),
+            'Strategic_Recommendation': self._recommendation_columns(
+                sector_codes, sector_labels, impact
+            )
+        })
+    
+    def _propagated_impact_columns(self, tickers: List[str], direct: np.ndarray) -> np.ndarray:
+        if self._graph is None:
+            return np.zeros(len(tickers))
+        return self._graph.propagate_to(
+            tickers, direct,
+            tiers=self._graph_settings['tiers'],
+            decay=self._graph_settings['decay']
+        )
+    
+    @staticmethod
+    def _resilience_columns(returns: np.ndarray, drawdown: np.ndarray) -> np.ndarray:
+        """_calculate_resilience over arrays (Python max/min/round semantics)"""
+        def py_max(a, b):
+            return np.where(b > a, b, a)
+        
+        def py_min(a, b):
+            return np.where(b < a, b, a)
+        
+        return_boost = py_max(0.0, returns * 0.5)
+        drawdown_penalty = py_min(40.0, np.abs(drawdown) * 0.8)
+        score = py_max(0.0, py_min(100.0, 50 + return_boost - drawdown_penalty))
+        return _round_like_python(score, 1)
+    
+    def _recommendation_columns(self, sector_codes: np.ndarray, sector_labels,
+                                impact: np.ndarray) -> np.ndarray:
+        """_get_recommendation via a sectors x tiers lookup table"""
+        table = np.empty((len(sector_labels), 3), dtype=object)
+        for code, sector in enumerate(sector_labels):
+            recs = self._recommendations.get(sector, self._recommendations['default'])
+            low = recs.get('low', 'Monitor supply chain risks')
+            table[code] = [low, recs.get('medium', low), recs.get('high', low)]
+        
+        tier = np.select([impact >= 45, impact >= 25], [2, 1], default=0)
+        return table[sector_codes, tier]
+    
+    def _propagated_impact(self, companies: List, direct: List[float]) -> np.ndarray:
+        """
+        Drawdown shocks of the analyzed suppliers pushed through the
+        dependency graph to their customers (0 without a graph)
+        """
+        if self._graph is None:
+            return np.zeros(len(companies))
+        return self._graph.propagate_to(
+            [company.ticker for company in companies],
+            np.array(direct, dtype=np.float64),
+            tiers=self._graph_settings['tiers'],
+            decay=self._graph_settings['decay']
+        )
     
     def _get_dependency(self, sector: str) -> str:
         """
@@ -108,4 +240,18 @@ class SupplyChainAnalyzer:
             return sector_recs.get('high', sector_recs.get('low', 'Monitor supply chain risks'))
         elif impact >= 25:
             return sector_recs.get('medium', sector_recs.get('low', 'Monitor supply chain risks'))
-        return sector_recs.get('low', 'Monitor supply chain risks')
\ No newline at end of file
+        return sector_recs.get('low', 'Monitor supply chain risks')
+
+
+def _round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    np.round, except values whose scaled fraction sits at a half are
+    rounded with Python's correctly-rounded round()
+    """
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    with np.errstate(invalid='ignore'):
+        ties = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6
+    for i in np.flatnonzero(ties):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
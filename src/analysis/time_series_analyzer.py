@@ -3,61 +3,116 @@ Time Series Analyzer
 Handles time series data and recovery pattern analysis
 Extracted from sc_analyzer_new.py
 """
+import numpy as np
 import pandas as pd
-from typing import List
+from typing import List, Optional, Tuple
+import sys
+sys.path.append('..')
+from config import TIME_SERIES_SETTINGS
+from .downsampling import downsample
+from .price_panel import PanelCompany, PricePanel
+from .resolution_pyramid import OHLC_FIELDS, ResolutionPyramid
 
 class TimeSeriesAnalyzer:
     """Analyze time series and recovery patterns"""
     
     def __init__(self):
-        pass
+        self._settings = TIME_SERIES_SETTINGS
     
-    def get_time_series_data(self, companies: List, max_companies: int = 6) -> pd.DataFrame:
+    def get_time_series_data(self, companies: List, max_companies: Optional[int] = None,
+                             point_budget: Optional[int] = None,
+                             method: Optional[str] = None) -> pd.DataFrame:
         """
         Get actual normalized price data for time series visualization
         Extracted from SCAnalyzer.get_time_series_data
         
         Args:
-            companies: List of CompanyData objects
-            max_companies: Maximum companies to include
+            companies: List of CompanyData objects or a PricePanel
+            max_companies: Maximum companies to include (None = all)
+            point_budget: Maximum points per company after downsampling
+            method: Downsampling method ('lttb' or 'minmax')
             
         Returns:
-            DataFrame with normalized price time series
+            Long-format DataFrame with normalized price time series
         """
+        max_companies = max_companies or self._settings['max_companies']
+        point_budget = point_budget or self._settings['point_budget']
+        method = method or self._settings['method']
+        
         try:
-            time_series_data = []
-            
             # Select diverse companies
-            selected_companies = self._select_diverse_companies(companies, max_companies)
+            selected_companies = (
+                self._select_diverse_companies(companies, max_companies)
+                if max_companies else list(companies)
+            )
+            
+            columns = {'Date': [], 'Normalized_Price': [], 'Company': [],
+                       'Ticker': [], 'Sector': []}
             
             for company in selected_companies:
-                if hasattr(company, 'data') and not company.data.empty:
-                    # Use actual historical data
-                    data = company.data.reset_index()
-                    
-                    # Normalize prices to base 100
-                    base_price = data['Close'].iloc[0]
-                    data['Normalized_Price'] = (data['Close'] / base_price) * 100
-                    
-                    # Sample data points for cleaner visualization (max 100 points)
-                    if len(data) > 100:
-                        data = data.iloc[::len(data)//100]
-                    
-                    for _, row in data.iterrows():
-                        time_series_data.append({
-                            'Date': row['Date'],
-                            'Normalized_Price': round(row['Normalized_Price'], 2),
-                            'Company': company.name,
-                            'Ticker': company.ticker,
-                            'Sector': company.sector
-                        })
+                dates, close = self._close_series(company)
+                if not len(close):
+                    continue
+                
+                # Normalize prices to base 100
+                normalized = close / close[0] * 100
+                
+                # Shape-preserving downsampling keeps peaks and troughs
+                days = dates.asi8 / 86_400e9
+                keep = downsample(days, normalized, point_budget, method)
+                
+                columns['Date'].append(dates[keep])
+                columns['Normalized_Price'].append(np.round(normalized[keep], 2))
+                for key, value in (('Company', company.name), ('Ticker', company.ticker),
+                                   ('Sector', company.sector)):
+                    columns[key].append(np.repeat(np.array([value], dtype=object), len(keep)))
+            
+            if not columns['Date']:
+                return pd.DataFrame()
             
-            return pd.DataFrame(time_series_data)
+            return pd.DataFrame({
+                'Date': np.concatenate([d.values for d in columns['Date']]),
+                **{key: np.concatenate(values) for key, values in columns.items() if key != 'Date'}
+            })
             
         except Exception as e:
             print(f"Error generating time series data: {str(e)}")
             return pd.DataFrame()
     
+    def build_pyramid(self, companies) -> Optional[ResolutionPyramid]:
+        """
+        Precompute daily / weekly / monthly bars for charting
+        
+        Args:
+            companies: PricePanel (or list of CompanyData, aligned first)
+            
+        Returns:
+            ResolutionPyramid, or None if there is no price data
+        """
+        try:
+            panel = companies if isinstance(companies, PricePanel) else \
+                PricePanel.from_companies(companies, fields=OHLC_FIELDS)
+            if not len(panel):
+                return None
+            return ResolutionPyramid.from_panel(panel)
+        except Exception as e:
+            print(f"Error building time series pyramid: {str(e)}")
+            return None
+    
+    def _close_series(self, company) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Trading dates and closes, read straight from the panel when available"""
+        if isinstance(company, PanelCompany):
+            close = company.panel.field('Close')[:, company.column]
+            valid = ~np.isnan(close)
+            return company.panel.dates[valid], close[valid].astype(np.float64)
+        
+        if not hasattr(company, 'data') or company.data.empty:
+            return pd.DatetimeIndex([]), np.array([])
+        dates = pd.DatetimeIndex(company.data.index)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        return dates, company.data['Close'].to_numpy(dtype=np.float64)
+    
     def _select_diverse_companies(self, companies: List, max_companies: int) -> List:
         """
         Select diverse companies for visualization
@@ -14,13 +14,10 @@ project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
 from config import DEFAULT_TICKERS, DATE_RANGE, COLORS
-from src.analysis.performance_analyzer import PerformanceAnalyzer
+from src.analysis.pipeline import run_pipeline
 from src.analysis.risk_analyzer import RiskAnalyzer
-from src.analysis.supply_chain_analyzer import SupplyChainAnalyzer
-from src.analysis.sector_analyzer import SectorAnalyzer
-from src.analysis.time_series_analyzer import TimeSeriesAnalyzer
 from src.dashboard.dashboard_components import DashboardComponents
-from src.dashboard.export_utils import ExportUtils
+from src.dashboard.export_utils import ExportUtils, EXPORT_FORMATS
 
 # Page config
 st.set_page_config(
@@ -41,43 +38,21 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 @st.cache_data
-def run_analysis(tickers: list, start_date: datetime, end_date: datetime, 
-                risk_threshold: float) -> dict:
-    """Run complete analysis pipeline"""
+def run_analysis(tickers: list, start_date: datetime, end_date: datetime) -> dict:
+    """
+    Run complete analysis pipeline
+    Risk sensitivity is not part of the cache key; it is applied to the
+    cached anomaly scores on every rerun
+    """
     with st.spinner('Analyzing supply chain impacts...'):
-        # Clean tickers
-        tickers = [t.strip().upper() for t in tickers if t.strip()]
-        
-        # Initialize analyzers
-        perf_analyzer = PerformanceAnalyzer()
-        risk_analyzer = RiskAnalyzer()
-        sc_analyzer = SupplyChainAnalyzer()
-        sector_analyzer = SectorAnalyzer()
-        ts_analyzer = TimeSeriesAnalyzer()
-        
-        # Fetch data
-        companies = perf_analyzer.fetch_companies(tickers, start_date, end_date)
-        
-        if not companies:
-            raise ValueError("No valid stock data collected")
-        
-        # Run analyses
-        results = {
-            'metadata': {
-                'tickers': tickers,
-                'period': f"{start_date} to {end_date}",
-                'analysis_date': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'total_companies': len(companies)
-            },
-            'performance': perf_analyzer.get_performance_dict(companies),
-            'risk': risk_analyzer.analyze_risk(companies, risk_threshold),
-            'supply_chain_impact': sc_analyzer.analyze_supply_chain(companies),
-            'sector_vulnerability': sector_analyzer.analyze_sectors(companies),
-            'time_series_data': ts_analyzer.get_time_series_data(companies),
-            'companies': [c.ticker for c in companies]
-        }
-        
-        return results
+        return run_pipeline(tickers, start_date, end_date)
+
+def _to_csv(data, data_key: str) -> str:
+    """CSV for one results table, built when its download is clicked"""
+    df = pd.DataFrame(data)
+    if data_key == 'performance':
+        df = df.T
+    return df.to_csv(index=False)
 
 def main():
     """Main application function"""
@@ -113,7 +88,7 @@ def main():
     col1, col2 = st.sidebar.columns(2)
     if col1.button("Run Analysis", type="primary", use_container_width=True):
         try:
-            results = run_analysis(tickers, start_date, end_date, risk_threshold)
+            results = run_analysis(tickers, start_date, end_date)
             st.session_state.results = results
             st.success("Analysis completed successfully!")
         except Exception as e:
@@ -125,61 +100,60 @@ def main():
     
     # Display results
     if results := st.session_state.get('results'):
+        # Moving the slider only re-cuts the cached scores: no refit, no refetch
+        results['risk'] = RiskAnalyzer.apply_threshold(
+            results.get('risk_scores', {}), risk_threshold
+        )
+        
         # Export options
         st.sidebar.markdown("---")
         st.sidebar.subheader("Export Results")
         
-        if st.sidebar.button("Export All Data to Excel", use_container_width=True):
-            if excel_file := ExportUtils.create_excel_export(results):
-                st.sidebar.download_button(
-                    "⬇ Download Excel",
-                    excel_file,
-                    file_name=f"supply_chain_analysis_{datetime.now():%Y%m%d_%H%M}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
-                )
+        export_format = st.sidebar.selectbox(
+            "Export format",
+            list(EXPORT_FORMATS),
+            format_func=lambda fmt: EXPORT_FORMATS[fmt][0],
+            key='export_format'
+        )
+        export_label, suffix, mime = EXPORT_FORMATS[export_format]
+        # Built only when clicked; Streamlit serves the finished file from memory
+        st.sidebar.download_button(
+            f"⬇ Download All Data ({export_label})",
+            lambda: ExportUtils.create_export(results, export_format),
+            file_name=f"supply_chain_analysis_{datetime.now():%Y%m%d_%H%M}{suffix}",
+            mime=mime,
+            use_container_width=True
+        )
         
-        # Individual CSV exports
+        # Individual CSV exports, serialized only when clicked
         for label, data_key in [
             ("Supply Chain Impact", 'supply_chain_impact'),
             ("Sector Vulnerability", 'sector_vulnerability'),
             ("Performance Data", 'performance')
         ]:
             if data := results.get(data_key):
-                df = pd.DataFrame(data)
-                if data_key == 'performance':
-                    df = df.T
                 st.sidebar.download_button(
                     f"{label}",
-                    df.to_csv(index=False),
+                    lambda data=data, data_key=data_key: _to_csv(data, data_key),
                     file_name=f"{data_key}.csv",
                     mime="text/csv",
                     use_container_width=True
                 )
         
-        # Analysis tabs
-        tabs = st.tabs([
-            "Summary",
-            "Performance",
-            "Risk",
-            "Supply Chain",
-            "Recommendations"
-        ])
-        
-        with tabs[0]:
-            dashboard.display_executive_summary(results)
-        
-        with tabs[1]:
-            dashboard.display_performance_analysis(results)
-        
-        with tabs[2]:
-            dashboard.display_risk_analysis(results)
-        
-        with tabs[3]:
-            dashboard.display_supply_chain_analysis(results)
+        # Analysis tabs; only the selected tab runs (and builds its figures)
+        tab_views = [
+            ("Summary", dashboard.display_executive_summary),
+            ("Performance", dashboard.display_performance_analysis),
+            ("Risk", dashboard.display_risk_analysis),
+            ("Supply Chain", dashboard.display_supply_chain_analysis),
+            ("Recommendations", dashboard.display_strategic_recommendations)
+        ]
+        tabs = st.tabs([name for name, _ in tab_views], key='analysis_tab', on_change='rerun')
         
-        with tabs[4]:
-            dashboard.display_strategic_recommendations(results)
+        for tab, (_, display) in zip(tabs, tab_views):
+            if tab.open:
+                with tab:
+                    display(results)
     
     else:
         st.info("""
@@ -198,7 +172,7 @@ def main():
         • Machine learning risk detection
         • Interactive visualizations
         • Multi-sector correlation analysis
-        • Excel/CSV export options
+        • Excel/Parquet/Arrow/CSV export options
         """)
 
 if __name__ == "__main__":
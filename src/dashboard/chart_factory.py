@@ -6,20 +6,25 @@ Extracted from sc_dashboard_new.py
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
+from typing import Optional, Tuple
 import sys
 sys.path.append('../..')
-from config import COLORS
+from config import COLORS, DASHBOARD_SETTINGS, RISK_TIMELINE, TIME_SERIES_SETTINGS
 
 class ChartFactory:
     """Create standardized Plotly charts"""
     
     def __init__(self):
         self.colors = COLORS
+        self.webgl_threshold = DASHBOARD_SETTINGS['webgl_point_threshold']
     
     def create_plot(self, data: pd.DataFrame, plot_type: str, **kwargs):
         """
         Create standardized plots
         Extracted from sc_dashboard_new.py create_plot
+        
+        Scatter and line charts with more than webgl_point_threshold
+        points render with WebGL traces
         """
         plots = {
             'scatter': px.scatter,
@@ -27,8 +32,22 @@ class ChartFactory:
             'pie': px.pie,
             'line': px.line
         }
+        if plot_type in ('scatter', 'line'):
+            kwargs = self._render_options(len(data), kwargs)
         return plots[plot_type](data, **kwargs)
     
+    def _render_options(self, n_points: int, kwargs: dict) -> dict:
+        """WebGL above the threshold; WebGL has no spline lines, so those become linear"""
+        if 'render_mode' in kwargs:
+            return kwargs
+        if n_points > self.webgl_threshold:
+            kwargs = {**kwargs, 'render_mode': 'webgl'}
+            if kwargs.get('line_shape') == 'spline':
+                kwargs['line_shape'] = 'linear'
+        else:
+            kwargs = {**kwargs, 'render_mode': 'svg'}
+        return kwargs
+    
     def create_correlation_heatmap(self, correlation_df: pd.DataFrame, title: str = "Correlation Matrix"):
         """Create correlation heatmap using Plotly"""
         fig = go.Figure(data=go.Heatmap(
@@ -53,13 +72,28 @@ class ChartFactory:
         
         return fig
     
-    def create_time_series_chart(self, ts_df: pd.DataFrame, group_col: str = 'Sector'):
-        """Create time series recovery pattern chart"""
-        fig = px.line(
+    def create_time_series_chart(self, ts_df: pd.DataFrame, group_col: str = 'Sector',
+                                 pyramid=None, width_px: Optional[int] = None,
+                                 date_window: Optional[Tuple] = None):
+        """
+        Create time series recovery pattern chart
+        
+        With a ResolutionPyramid, the data comes from the coarsest level
+        that still gives one point per pixel over date_window
+        """
+        if pyramid is not None:
+            start, end = date_window or (None, None)
+            ts_df = pyramid.chart_frame(
+                width_px or TIME_SERIES_SETTINGS['chart_width_px'], start, end
+            )
+        
+        fig = self.create_plot(
             ts_df,
+            plot_type='line',
             x='Date',
             y='Normalized_Price',
             color=group_col,
+            line_group='Ticker' if 'Ticker' in ts_df.columns else None,
             title="Stock Price Recovery Patterns (Normalized to Base 100)",
             labels={'Normalized_Price': 'Price Index (Base 100)', 'Date': 'Date'},
             line_shape='spline',
@@ -73,4 +107,27 @@ class ChartFactory:
             height=500
         )
         
-        return fig
\ No newline at end of file
+        return fig
+    
+    def create_risk_timeline_heatmap(self, timeline, max_tickers: Optional[int] = None):
+        """Heatmap of rolling anomaly scores for the most anomalous tickers"""
+        tickers = timeline.most_anomalous(max_tickers or RISK_TIMELINE['chart_tickers'])
+        df = timeline.frame(tickers)
+        
+        fig = go.Figure(data=go.Heatmap(
+            z=df.values.T,
+            x=df.index,
+            y=df.columns,
+            colorscale='RdYlGn',
+            zmid=0,
+            colorbar=dict(title="Anomaly Score")
+        ))
+        
+        fig.update_layout(
+            title=f"Rolling Risk Timeline ({timeline.window}-day windows, lower = more anomalous)",
+            xaxis_title="Date",
+            yaxis_title="Ticker",
+            height=max(400, 18 * len(tickers))
+        )
+        
+        return fig
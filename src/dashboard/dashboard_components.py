@@ -5,12 +5,20 @@ Extracted from sc_dashboard_new.py
 """
 import streamlit as st
 import pandas as pd
-import numpy as np
-from typing import Dict
+from typing import Callable, Dict, Hashable, Optional, Sequence
 from .chart_factory import ChartFactory
+from .figure_cache import FigureCache
+from .table_backend import IndexedTable
 import sys
 sys.path.append('../..')
-from config import COLORS
+from config import COLORS, DASHBOARD_SETTINGS, IMPACT_THRESHOLDS, RECOVERY_TIME_RULES
+
+# Ordinal result columns, in ascending order, so tables sort by rank
+CATEGORY_ORDERS = {
+    'Impact_Severity': list(reversed(IMPACT_THRESHOLDS)),
+    'Estimated_Recovery_Months': [label for _, label in RECOVERY_TIME_RULES],
+    'Risk_Score': ['Low', 'High']
+}
 
 class DashboardComponents:
     """Reusable dashboard UI components"""
@@ -19,6 +27,19 @@ class DashboardComponents:
         self.chart_factory = ChartFactory()
         self.colors = COLORS
     
+    def _cached(self, results: Dict, key: Hashable, build: Callable):
+        """Figure or table for these results, built once per analysis"""
+        return FigureCache.for_results(results).get(key, build)
+    
+    def _supply_chain_frame(self, results: Dict) -> pd.DataFrame:
+        return self._cached(results, 'supply_chain_df',
+                            lambda: pd.DataFrame(results.get('supply_chain_impact', [])))
+    
+    @staticmethod
+    def _risk_labels_key(risk_data: Dict) -> int:
+        """Changes whenever the sensitivity slider relabels a ticker"""
+        return hash(tuple(risk.get('score') for risk in risk_data.values()))
+    
     def display_executive_summary(self, results: Dict):
         """
         Display executive summary section
@@ -28,7 +49,7 @@ class DashboardComponents:
         
         sc_data = results.get('supply_chain_impact', [])
         if sc_data:
-            df = pd.DataFrame(sc_data)
+            df = self._supply_chain_frame(results)
             
             period = results.get('metadata', {}).get('period', 'N/A')
             formatted_period = "N/A"
@@ -82,7 +103,7 @@ class DashboardComponents:
             severity_counts.columns = ['Severity', 'Count']
             
             if not severity_counts.empty:
-                fig = self.chart_factory.create_plot(
+                fig = self._cached(results, 'summary_severity_pie', lambda: self.chart_factory.create_plot(
                     data=severity_counts,
                     plot_type='pie',
                     values='Count',
@@ -90,12 +111,12 @@ class DashboardComponents:
                     title="Distribution of Supply Chain Impact Severity",
                     color='Severity',
                     color_discrete_map=self.colors
-                )
+                ))
                 st.plotly_chart(fig, use_container_width=True)
     
     def _display_metrics(self, results: Dict):
         """Display key performance metrics"""
-        sc_data = pd.DataFrame(results.get('supply_chain_impact', []))
+        sc_data = self._supply_chain_frame(results)
         if sc_data.empty:
             st.warning("No supply chain data available for summary")
             return
@@ -122,7 +143,7 @@ class DashboardComponents:
             st.warning("No performance data available")
             return
         
-        df = pd.DataFrame([
+        df = self._cached(results, 'performance_df', lambda: pd.DataFrame([
             {
                 'Company': data['name'],
                 'Ticker': ticker,
@@ -133,22 +154,13 @@ class DashboardComponents:
                 'Abs_Drawdown': abs(data['drawdown'])
             }
             for ticker, data in perf_data.items()
-        ])
+        ]))
         
         # Performance charts
-        fig1 = self.chart_factory.create_plot(
-            df,
-            plot_type='bar',
-            x='Company',
-            y='Return (%)',
-            color='Sector',
-            title="Total Returns by Company",
-            hover_data=['Ticker', 'Drawdown (%)']
-        )
-        fig1.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig1, use_container_width=True)
+        st.plotly_chart(self._cached(results, 'performance_returns', lambda: self._returns_bar(df)),
+                        use_container_width=True)
         
-        fig2 = self.chart_factory.create_plot(
+        fig2 = self._cached(results, 'performance_risk_return', lambda: self.chart_factory.create_plot(
             df,
             plot_type='scatter',
             x='Volatility (%)',
@@ -158,12 +170,124 @@ class DashboardComponents:
             hover_data=['Company', 'Ticker'],
             title="Risk-Return Profile: Volatility vs Return",
             size_max=30
-        )
+        ))
         st.plotly_chart(fig2, use_container_width=True)
         
-        display_df = df.drop('Abs_Drawdown', axis=1).copy()
-        display_df.index = range(1, len(display_df) + 1)
-        st.dataframe(display_df, use_container_width=True)
+        self._display_table(
+            results, 'performance_table', 'performance_table',
+            lambda: df.drop('Abs_Drawdown', axis=1),
+            index_columns=['Sector', 'Return (%)', 'Volatility (%)', 'Drawdown (%)']
+        )
+        
+        if (event_study := results.get('event_study')) is not None:
+            self._display_event_study(results, event_study)
+    
+    def _returns_bar(self, df: pd.DataFrame):
+        fig = self.chart_factory.create_plot(
+            df,
+            plot_type='bar',
+            x='Company',
+            y='Return (%)',
+            color='Sector',
+            title="Total Returns by Company",
+            hover_data=['Ticker', 'Drawdown (%)']
+        )
+        fig.update_layout(xaxis_tickangle=-45)
+        return fig
+    
+    def _display_table(self, results: Dict, name: str, key: Hashable,
+                       build: Callable[[], pd.DataFrame], index_columns: Sequence[str],
+                       filter_columns: Sequence[str] = ('Sector',),
+                       style: Optional[Callable] = None, **dataframe_kwargs):
+        """
+        Results table served from an IndexedTable, one page per rerun
+        
+        The table and its sorted indexes are built once per results; filters,
+        sort and page are widgets keyed by name, and only the selected page
+        is sent to st.dataframe. Tables that fit on one page are shown whole.
+        """
+        page_size = DASHBOARD_SETTINGS['table_page_size']
+        table = self._cached(results, ('indexed_table', key),
+                             lambda: IndexedTable(build(), index_columns, CATEGORY_ORDERS))
+        
+        if len(table) <= page_size:
+            page_df, _ = table.query(page_size=page_size)
+        else:
+            controls = st.columns(len(filter_columns) + 3)
+            filters = {}
+            for column, control in zip(filter_columns, controls):
+                if chosen := control.multiselect(column, table.values(column),
+                                                 key=f"{name}_{column}_filter"):
+                    filters[column] = chosen
+            sort_by = controls[-3].selectbox(
+                "Sort by",
+                options=[None] + list(index_columns),
+                format_func=lambda c: "Original order" if c is None else c,
+                key=f"{name}_sort"
+            )
+            descending = controls[-2].toggle("Descending", key=f"{name}_descending")
+            
+            positions = table.select(filters, sort_by=sort_by, ascending=not descending)
+            n_pages = max(1, -(-len(positions) // page_size))
+            page_key = f"{name}_page"
+            # Filtering can leave the remembered page past the end
+            if st.session_state.get(page_key, 1) > n_pages:
+                st.session_state[page_key] = n_pages
+            page = controls[-1].number_input("Page", min_value=1, max_value=n_pages,
+                                             step=1, key=page_key)
+            
+            page_df = table.page(positions, page - 1, page_size)
+            if page_df.empty:
+                st.caption(f"No rows match the filters (of {len(table):,})")
+            else:
+                st.caption(f"Rows {page_df.index[0]:,}-{page_df.index[-1]:,} of {len(positions):,}"
+                           + (f" (filtered from {len(table):,})" if filters else ""))
+        
+        st.dataframe(style(page_df) if style else page_df,
+                     use_container_width=True, **dataframe_kwargs)
+    
+    def _display_event_study(self, results: Dict, event_study):
+        """Sector CAR paths and per-company CARs around one event"""
+        st.subheader("Event Study: Abnormal Returns Around Disruptions")
+        
+        event_index = st.selectbox(
+            "Event",
+            options=range(len(event_study.events)),
+            format_func=lambda i: f"{event_study.events[i]['name']} ({event_study.events[i]['date']})",
+            key='event_study_event'
+        )
+        
+        fig = self._cached(results, ('event_car_paths', event_index),
+                           lambda: self._event_car_chart(event_study, event_index))
+        if fig is not None:
+            st.plotly_chart(fig, use_container_width=True)
+        
+        event_name = event_study.events[event_index]['name']
+        car_df = self._cached(results, ('event_cars', event_index), lambda: pd.DataFrame(
+            [r for r in event_study.records() if r['Event'] == event_name]
+        ))
+        if not car_df.empty:
+            st.dataframe(
+                car_df.drop(columns=['Event', 'Event_Date', 'Alpha']),
+                use_container_width=True,
+                hide_index=True
+            )
+    
+    def _event_car_chart(self, event_study, event_index: int):
+        paths = event_study.sector_car_paths(event_index)
+        if paths.empty:
+            return None
+        fig = self.chart_factory.create_plot(
+            paths,
+            plot_type='line',
+            x='Offset',
+            y='CAR_pct',
+            color='Sector',
+            title="Cumulative Abnormal Return by Sector (market model)",
+            labels={'Offset': 'Trading days from event', 'CAR_pct': 'CAR (%)'}
+        )
+        fig.add_vline(x=0, line_dash='dash', line_color='gray')
+        return fig
     
     def display_risk_analysis(self, results: Dict):
         """Display risk analysis section"""
@@ -173,7 +297,8 @@ class DashboardComponents:
             st.warning("No risk assessment data available")
             return
         
-        df = pd.DataFrame([
+        labels = self._risk_labels_key(risk_data)
+        df = self._cached(results, ('risk_df', labels), lambda: pd.DataFrame([
             {
                 'Company': perf['name'],
                 'Ticker': ticker,
@@ -184,9 +309,9 @@ class DashboardComponents:
                 'Risk_Score': risk_data.get(ticker, {}).get('score', 'Unknown')
             }
             for ticker, perf in perf_data.items()
-        ])
+        ]))
         
-        fig = self.chart_factory.create_plot(
+        fig = self._cached(results, ('risk_scatter', labels), lambda: self.chart_factory.create_plot(
             df,
             plot_type='scatter',
             x='Volatility (%)',
@@ -196,30 +321,40 @@ class DashboardComponents:
             hover_data=['Company', 'Sector', 'Return (%)'],
             title="Risk Analysis: Volatility vs Drawdown",
             color_discrete_map={'High': self.colors['High'], 'Low': self.colors['Low']}
-        )
+        ))
         st.plotly_chart(fig, use_container_width=True)
         
-        risk_counts = df['Risk_Score'].value_counts().reset_index()
-        risk_counts.columns = ['Risk_Score', 'Count']
-        fig = self.chart_factory.create_plot(
-            risk_counts,
-            plot_type='pie',
-            values='Count',
-            names='Risk_Score',
-            title="Risk Score Distribution",
-            color='Risk_Score',
-            color_discrete_map={'High': self.colors['High'], 'Low': self.colors['Low']}
-        )
+        fig = self._cached(results, ('risk_pie', labels), lambda: self._risk_pie(df))
         st.plotly_chart(fig, use_container_width=True)
         
+        if (timeline := results.get('risk_timeline')) is not None:
+            st.subheader("Risk Timeline")
+            fig = self._cached(results, 'risk_timeline',
+                               lambda: self.chart_factory.create_risk_timeline_heatmap(timeline))
+            st.plotly_chart(fig, use_container_width=True)
+
         st.subheader("Sector Correlation Analysis")
-        correlation_data = self._create_dynamic_correlation_matrix(results)
-        
-        if not correlation_data.empty:
-            fig = self.chart_factory.create_correlation_heatmap(
-                correlation_data,
-                "Sector Performance Correlation Matrix"
+        sector_correlations = (results.get('correlation') or {}).get('sector', {})
+        
+        if sector_correlations:
+            method = st.radio(
+                "Correlation Window",
+                options=list(sector_correlations),
+                format_func=lambda m: {'full': 'Full Period', 'rolling': 'Recent (Rolling)',
+                                       'ewm': 'Exponentially Weighted'}.get(m, m),
+                horizontal=True,
+                key='correlation_method'
             )
+            correlation_data = sector_correlations[method]
+        else:
+            correlation_data = pd.DataFrame()
+        
+        if len(correlation_data) >= 2:
+            fig = self._cached(results, ('correlation_heatmap', method),
+                               lambda: self.chart_factory.create_correlation_heatmap(
+                                   correlation_data,
+                                   "Sector Daily Return Correlation Matrix"
+                               ))
             st.plotly_chart(fig, use_container_width=True)
             
             st.info("""
@@ -229,52 +364,24 @@ class DashboardComponents:
             - Values close to 0 (white): No correlation
             """)
         
-        display_df = df.copy()
-        display_df.index = range(1, len(display_df) + 1)
-        st.dataframe(display_df, use_container_width=True)
+        self._display_table(
+            results, 'risk_table', ('risk_table', labels), lambda: df,
+            index_columns=['Sector', 'Risk_Score', 'Volatility (%)', 'Drawdown (%)'],
+            filter_columns=('Sector', 'Risk_Score')
+        )
     
-    def _create_dynamic_correlation_matrix(self, results: Dict) -> pd.DataFrame:
-        """Create correlation matrix based on actual returns data"""
-        try:
-            perf_data = results.get('performance', {})
-            if not perf_data:
-                return pd.DataFrame()
-            
-            sector_returns = {}
-            for ticker, data in perf_data.items():
-                sector = data['sector']
-                if sector not in sector_returns:
-                    sector_returns[sector] = []
-                sector_returns[sector].append(data['return'])
-            
-            sectors = list(sector_returns.keys())
-            n_sectors = len(sectors)
-            
-            if n_sectors < 2:
-                return pd.DataFrame()
-            
-            correlation_matrix = np.zeros((n_sectors, n_sectors))
-            
-            for i in range(n_sectors):
-                for j in range(n_sectors):
-                    if i == j:
-                        correlation_matrix[i, j] = 1.0
-                    else:
-                        returns_i = np.array(sector_returns[sectors[i]])
-                        returns_j = np.array(sector_returns[sectors[j]])
-                        
-                        min_len = min(len(returns_i), len(returns_j))
-                        if min_len > 1:
-                            corr = np.corrcoef(returns_i[:min_len], returns_j[:min_len])[0, 1]
-                            correlation_matrix[i, j] = corr if not np.isnan(corr) else 0.0
-                        else:
-                            correlation_matrix[i, j] = 0.0
-            
-            return pd.DataFrame(correlation_matrix, index=sectors, columns=sectors)
-            
-        except Exception as e:
-            st.warning(f"Could not generate correlation matrix: {str(e)}")
-            return pd.DataFrame()
+    def _risk_pie(self, df: pd.DataFrame):
+        risk_counts = df['Risk_Score'].value_counts().reset_index()
+        risk_counts.columns = ['Risk_Score', 'Count']
+        return self.chart_factory.create_plot(
+            risk_counts,
+            plot_type='pie',
+            values='Count',
+            names='Risk_Score',
+            title="Risk Score Distribution",
+            color='Risk_Score',
+            color_discrete_map={'High': self.colors['High'], 'Low': self.colors['Low']}
+        )
     
     def display_supply_chain_analysis(self, results: Dict):
         """Display supply chain impact analysis"""
@@ -284,7 +391,7 @@ class DashboardComponents:
             st.warning("No supply chain impact data available")
             return
         
-        df = pd.DataFrame(sc_data)
+        df = self._supply_chain_frame(results)
         severity_counts = df['Impact_Severity'].value_counts()
         
         col1, col2 = st.columns(2)
@@ -294,7 +401,7 @@ class DashboardComponents:
         
         with col1:
             if not severity_counts.empty:
-                fig = self.chart_factory.create_plot(
+                fig = self._cached(results, 'sc_severity_pie', lambda: self.chart_factory.create_plot(
                     severity_df,
                     plot_type='pie',
                     values='Count',
@@ -302,12 +409,12 @@ class DashboardComponents:
                     title="Supply Chain Impact Severity",
                     color='Severity',
                     color_discrete_map=self.colors
-                )
+                ))
                 st.plotly_chart(fig, use_container_width=True)
         
         with col2:
             if not severity_counts.empty:
-                fig = self.chart_factory.create_plot(
+                fig = self._cached(results, 'sc_severity_bar', lambda: self.chart_factory.create_plot(
                     severity_df,
                     plot_type='bar',
                     x='Severity',
@@ -315,72 +422,117 @@ class DashboardComponents:
                     title="Impact Severity Count",
                     color='Severity',
                     color_discrete_map=self.colors
-                )
+                ))
                 st.plotly_chart(fig, use_container_width=True)
         
-        sectors = df['Sector'].unique()
-        if len(sectors) > 0:
-            sector_impact = df.groupby('Sector').agg({
-                'Financial_Impact_pct': 'mean',
-                'Supply_Chain_Resilience': 'mean',
-                'Company': 'count'
-            }).round(1)
-            
-            sector_impact_df = sector_impact.reset_index()
-            if not sector_impact_df.empty:
-                fig = self.chart_factory.create_plot(
-                    sector_impact_df,
-                    plot_type='bar',
-                    x='Sector',
-                    y='Financial_Impact_pct',
-                    title="Average Financial Impact by Sector (%)",
-                    color='Financial_Impact_pct',
-                    color_continuous_scale='reds',
-                    hover_data=['Supply_Chain_Resilience']
-                )
-                st.plotly_chart(fig, use_container_width=True)
+        if (fig := self._cached(results, 'sc_sector_impact', lambda: self._sector_impact_bar(df))) is not None:
+            st.plotly_chart(fig, use_container_width=True)
+        
+        if scenarios := results.get('scenarios'):
+            st.subheader("Disruption Scenarios (Monte Carlo)")
+            n_paths, sector_df = self._cached(results, 'scenario_table', lambda: self._scenario_table(scenarios))
+            st.caption(f"Max drawdown over the simulated horizon, "
+                       f"{n_paths:,} paths per scenario")
+            st.dataframe(sector_df, use_container_width=True, hide_index=True)
         
         st.subheader("Recovery Trajectory Comparison")
         
         time_series_data = results.get('time_series_data')
-        
-        if time_series_data is not None:
-            if isinstance(time_series_data, list):
-                ts_df = pd.DataFrame(time_series_data)
-            elif isinstance(time_series_data, pd.DataFrame):
-                ts_df = time_series_data
-            else:
-                ts_df = pd.DataFrame()
-            
-            if not ts_df.empty and 'Date' in ts_df.columns:
-                ts_df['Date'] = pd.to_datetime(ts_df['Date'])
-                
-                group_col = 'Sector' if 'Sector' in ts_df.columns else 'Company'
-                
-                fig = self.chart_factory.create_time_series_chart(ts_df, group_col)
+        pyramid = results.get('time_series_pyramid')
+        
+        if pyramid is not None:
+            first_date, last_date = (d.date() for d in pyramid.date_range)
+            date_window = st.slider(
+                "Date Window",
+                min_value=first_date,
+                max_value=last_date,
+                value=(first_date, last_date),
+                key='time_series_window'
+            )
+            fig = self._cached(results, ('time_series', date_window),
+                               lambda: self.chart_factory.create_time_series_chart(
+                                   None, 'Sector', pyramid=pyramid, date_window=date_window
+                               ))
+            st.plotly_chart(fig, use_container_width=True)
+        elif time_series_data is not None:
+            fig = self._cached(results, 'time_series',
+                               lambda: self._time_series_fallback(time_series_data))
+            if fig is not None:
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.warning("Time series data unavailable or incomplete.")
         else:
             st.warning("No time series data available.")
         
-        display_df = df[[
-            'Company', 'Ticker', 'Sector', 'Semiconductor_Dependency',
-            'Financial_Impact_pct', 'Impact_Severity', 'Estimated_Recovery_Months',
-            'Supply_Chain_Resilience', 'Strategic_Recommendation'
-        ]]
-        
-        display_df.index = range(1, len(display_df) + 1)
-        st.dataframe(
-            display_df.style.applymap(
-                lambda x: f"background-color: {self.colors.get(x, '#65a30d')}; color: white" 
-                if x in self.colors else '',
-                subset=['Impact_Severity']
-            ),
-            use_container_width=True,
+        self._display_table(
+            results, 'sc_table', 'sc_table',
+            lambda: df[[
+                'Company', 'Ticker', 'Sector', 'Semiconductor_Dependency',
+                'Financial_Impact_pct', 'Propagated_Impact_pct', 'Impact_Severity',
+                'Estimated_Recovery_Months',
+                'Supply_Chain_Resilience', 'Strategic_Recommendation'
+            ]],
+            index_columns=['Sector', 'Impact_Severity', 'Supply_Chain_Resilience',
+                           'Financial_Impact_pct', 'Estimated_Recovery_Months'],
+            filter_columns=('Sector', 'Impact_Severity'),
+            style=self._severity_style,
             height=400
         )
     
+    def _severity_style(self, display_df: pd.DataFrame):
+        return display_df.style.applymap(
+            lambda x: f"background-color: {self.colors.get(x, '#65a30d')}; color: white" 
+            if x in self.colors else '',
+            subset=['Impact_Severity']
+        )
+    
+    def _sector_impact_bar(self, df: pd.DataFrame):
+        if not len(df['Sector'].unique()):
+            return None
+        sector_impact = df.groupby('Sector').agg({
+            'Financial_Impact_pct': 'mean',
+            'Supply_Chain_Resilience': 'mean',
+            'Company': 'count'
+        }).round(1)
+        
+        sector_impact_df = sector_impact.reset_index()
+        if sector_impact_df.empty:
+            return None
+        return self.chart_factory.create_plot(
+            sector_impact_df,
+            plot_type='bar',
+            x='Sector',
+            y='Financial_Impact_pct',
+            title="Average Financial Impact by Sector (%)",
+            color='Financial_Impact_pct',
+            color_continuous_scale='reds',
+            hover_data=['Supply_Chain_Resilience']
+        )
+    
+    @staticmethod
+    def _scenario_table(scenarios):
+        """(paths per scenario, sector-level drawdown table)"""
+        scenario_df = pd.DataFrame(scenarios)
+        sector_df = scenario_df[scenario_df['Level'] == 'Sector'].drop(columns=['Level', 'Paths'])
+        return int(scenario_df['Paths'].iloc[0]), sector_df.rename(columns={'Name': 'Sector'})
+    
+    def _time_series_fallback(self, time_series_data):
+        """Chart from the downsampled time_series_data when no pyramid is available"""
+        if isinstance(time_series_data, list):
+            ts_df = pd.DataFrame(time_series_data)
+        elif isinstance(time_series_data, pd.DataFrame):
+            ts_df = time_series_data.copy()
+        else:
+            ts_df = pd.DataFrame()
+        
+        if ts_df.empty or 'Date' not in ts_df.columns:
+            return None
+        ts_df['Date'] = pd.to_datetime(ts_df['Date'])
+        
+        group_col = 'Sector' if 'Sector' in ts_df.columns else 'Company'
+        
+        return self.chart_factory.create_time_series_chart(ts_df, group_col)
+    
     def display_strategic_recommendations(self, results: Dict):
         """Display strategic recommendations"""
         st.subheader("Strategic Recommendations")
@@ -389,7 +541,7 @@ class DashboardComponents:
             st.warning("No data available for recommendations")
             return
         
-        df = pd.DataFrame(sc_data)
+        df = self._supply_chain_frame(results)
         
         for sector in sorted(df['Sector'].unique()):
             sector_companies = df[df['Sector'] == sector]
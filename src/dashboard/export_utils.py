@@ -1,49 +1,252 @@
 """
 Export Utilities
-Handles Excel and CSV export functionality
-Extracted from sc_dashboard_new.py
+Handles Excel, Parquet, Arrow IPC and zipped CSV export functionality
+Streams tables chunk by chunk into a file instead of building them in memory
 """
+import io
+import tempfile
+import zipfile
+import numpy as np
 import pandas as pd
-from io import BytesIO
-from typing import Dict, Optional
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Union
+import sys
+sys.path.append('..')
+from config import EXPORT_SETTINGS
+
+# format -> (label, file suffix, mime type)
+EXPORT_FORMATS = {
+    'xlsx': ('Excel', '.xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': ('Parquet (zip)', '.zip', 'application/zip'),
+    'arrow': ('Arrow IPC (zip)', '.zip', 'application/zip'),
+    'csv': ('CSV (zip)', '.zip', 'application/zip')
+}
+
+# Rows per worksheet, including the header
+EXCEL_MAX_ROWS = 1_048_576
 
 class ExportUtils:
     """Handle data export operations"""
     
     @staticmethod
-    def create_excel_export(results: Dict) -> Optional[BytesIO]:
+    def create_excel_export(results: Dict) -> Optional[bytes]:
         """
         Create consolidated Excel export
         Extracted from sc_dashboard_new.py create_excel_export
         """
         try:
-            output = BytesIO()
-            with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-                sheets = {
-                    'Analysis_Metadata': lambda: pd.DataFrame([results['metadata']]),
-                    'Performance_Analysis': lambda: pd.DataFrame(results['performance']).T.reset_index(),
-                    'Risk_Assessment': lambda: pd.DataFrame(results['risk']).T.reset_index(),
-                    'Supply_Chain_Impact': lambda: pd.DataFrame(results['supply_chain_impact']),
-                    'Sector_Vulnerability': lambda: pd.DataFrame(results['sector_vulnerability']),
-                    'Analysis_Summary': lambda: pd.DataFrame([ExportUtils._create_analysis_summary(results)])
-                }
-                
-                for sheet_name, data_func in sheets.items():
-                    try:
-                        df = data_func()
-                        if isinstance(df, pd.DataFrame) and not df.empty:
-                            if 'index' in df.columns:
-                                df.columns = ['Ticker' if c == 'index' else c for c in df.columns]
-                            df.to_excel(writer, sheet_name=sheet_name, index=False)
-                    except Exception as e:
-                        print(f"Skipping {sheet_name}: {str(e)}")
-            
-            output.seek(0)
-            return output
+            return ExportUtils.create_export(results, 'xlsx')
         except Exception as e:
             print(f"Error creating Excel file: {str(e)}")
             return None
     
+    @staticmethod
+    def create_export(results: Dict, fmt: str = 'xlsx',
+                      settings: Optional[Dict] = None) -> bytes:
+        """
+        Export every result table as one file's bytes
+        
+        The tables are streamed into a temp file chunk by chunk, so only the
+        finished file is ever held in memory. st.download_button keeps that
+        in memory anyway; use write_export to go straight to disk.
+        
+        Args:
+            results: Pipeline results dictionary
+            fmt: One of EXPORT_FORMATS
+            settings: Defaults to EXPORT_SETTINGS
+        
+        Returns:
+            The exported file's contents
+        """
+        settings = settings or EXPORT_SETTINGS
+        with tempfile.TemporaryFile(dir=settings['temp_dir']) as output:
+            ExportUtils.write_export(results, output, fmt, settings)
+            output.seek(0)
+            return output.read()
+    
+    @staticmethod
+    def write_export(results: Dict, output: Union[str, Path, BinaryIO], fmt: str = 'xlsx',
+                     settings: Optional[Dict] = None):
+        """
+        Stream every result table into a path or writable binary file
+        
+        Args:
+            results: Pipeline results dictionary
+            output: Destination path or seekable binary file
+            fmt: One of EXPORT_FORMATS
+            settings: Defaults to EXPORT_SETTINGS
+        """
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        settings = settings or EXPORT_SETTINGS
+        if isinstance(output, (str, Path)):
+            with open(output, 'wb') as file:
+                ExportUtils.write_export(results, file, fmt, settings)
+            return
+        
+        tables = ExportUtils.export_tables(results, settings)
+        if fmt == 'xlsx':
+            ExportUtils._write_excel(tables, output, settings['temp_dir'])
+        elif fmt == 'csv':
+            ExportUtils._write_csv_zip(tables, output)
+        else:
+            ExportUtils._write_columnar_zip(tables, output, fmt, settings['temp_dir'])
+    
+    @staticmethod
+    def export_tables(results: Dict,
+                      settings: Optional[Dict] = None) -> Dict[str, Callable[[], Iterator[pd.DataFrame]]]:
+        """Table name -> callable yielding the table in DataFrame chunks"""
+        settings = settings or EXPORT_SETTINGS
+        chunk_rows = settings['chunk_rows']
+        
+        builders = {
+            'Analysis_Metadata': lambda: pd.DataFrame([{
+                k: ', '.join(v) if isinstance(v, list) else v
+                for k, v in results['metadata'].items()
+            }]),
+            'Performance_Analysis': lambda: pd.DataFrame(results['performance']).T.reset_index(),
+            'Risk_Assessment': lambda: pd.DataFrame(results['risk']).T.reset_index(),
+            'Supply_Chain_Impact': lambda: pd.DataFrame(results['supply_chain_impact']),
+            'Sector_Vulnerability': lambda: pd.DataFrame(results['sector_vulnerability']),
+            'Analysis_Summary': lambda: pd.DataFrame([ExportUtils._create_analysis_summary(results)])
+        }
+        tables = {name: ExportUtils._single(name, build) for name, build in builders.items()}
+        
+        time_series = results.get('time_series_data')
+        if isinstance(time_series, pd.DataFrame) and not time_series.empty:
+            tables['Time_Series'] = lambda: (
+                time_series.iloc[start:start + chunk_rows]
+                for start in range(0, len(time_series), chunk_rows)
+            )
+        
+        pyramid = results.get('time_series_pyramid')
+        if settings['include_price_history'] and pyramid is not None:
+            tables['Price_History'] = lambda: ExportUtils._price_history_chunks(pyramid, chunk_rows)
+        
+        return tables
+    
+    @staticmethod
+    def _single(name: str, build: Callable[[], pd.DataFrame]) -> Callable[[], Iterator[pd.DataFrame]]:
+        """A small table as one chunk; tables that fail to build are skipped"""
+        def chunks():
+            try:
+                df = build()
+            except Exception as e:
+                print(f"Skipping {name}: {str(e)}")
+                return
+            if isinstance(df, pd.DataFrame) and not df.empty:
+                if 'index' in df.columns:
+                    df.columns = ['Ticker' if c == 'index' else c for c in df.columns]
+                yield df
+        return chunks
+    
+    @staticmethod
+    def _price_history_chunks(pyramid, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        """Daily closes in long format, a group of tickers (about chunk_rows rows) at a time"""
+        level = pyramid.levels['daily']
+        n_dates = len(level.dates)
+        if not n_dates:
+            return
+        per_chunk = max(1, chunk_rows // n_dates)
+        tickers = np.asarray(pyramid.tickers, dtype=object)
+        names = np.asarray(pyramid.names, dtype=object)
+        sectors = np.asarray(pyramid.sectors, dtype=object)
+        
+        for start in range(0, len(tickers), per_chunk):
+            columns = slice(start, start + per_chunk)
+            # Ticker-major order: transpose so each ticker's dates are contiguous
+            close = level.ohlc['Close'][:, columns].T
+            normalized = level.normalized[:, columns].T
+            ticker_idx, date_idx = np.nonzero(~np.isnan(close))
+            if not len(ticker_idx):
+                continue
+            yield pd.DataFrame({
+                'Date': level.dates[date_idx],
+                'Ticker': tickers[columns][ticker_idx],
+                'Company': names[columns][ticker_idx],
+                'Sector': sectors[columns][ticker_idx],
+                'Close': close[ticker_idx, date_idx].astype(np.float64).round(4),
+                'Normalized_Price': normalized[ticker_idx, date_idx].astype(np.float64).round(2)
+            })
+    
+    @staticmethod
+    def _write_excel(tables: Dict[str, Callable], output: BinaryIO, temp_dir: Optional[str]):
+        """
+        xlsxwriter in constant_memory mode: rows are written in order and
+        flushed, so memory stays flat however long the sheet is. Tables
+        over the Excel row limit continue on numbered sheets.
+        """
+        import xlsxwriter
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd',
+            'tmpdir': temp_dir
+        })
+        try:
+            for name, chunks in tables.items():
+                sheet, part, row = None, 0, EXCEL_MAX_ROWS
+                for chunk in chunks():
+                    header = list(chunk.columns)
+                    values = chunk.astype(object).where(chunk.notna(), None)
+                    for record in values.itertuples(index=False, name=None):
+                        if row >= EXCEL_MAX_ROWS:
+                            part += 1
+                            sheet = workbook.add_worksheet(name if part == 1 else f"{name[:28]}_{part}")
+                            sheet.write_row(0, 0, header)
+                            row = 1
+                        sheet.write_row(row, 0, record)
+                        row += 1
+        finally:
+            workbook.close()
+    
+    @staticmethod
+    def _write_csv_zip(tables: Dict[str, Callable], output: BinaryIO):
+        """One CSV per table, each streamed into its zip entry chunk by chunk"""
+        with zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, chunks in tables.items():
+                text = None
+                for chunk in chunks():
+                    header = text is None
+                    if header:
+                        entry = archive.open(f"{name}.csv", 'w', force_zip64=True)
+                        text = io.TextIOWrapper(entry, encoding='utf-8', newline='')
+                    chunk.to_csv(text, index=False, header=header)
+                if text is not None:
+                    text.close()
+    
+    @staticmethod
+    def _write_columnar_zip(tables: Dict[str, Callable], output: BinaryIO, fmt: str,
+                            temp_dir: Optional[str]):
+        """
+        One Parquet or Arrow IPC file per table. Each is written batch by
+        batch to a scratch file and then copied into the zip.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        suffix = '.parquet' if fmt == 'parquet' else '.arrow'
+        
+        with tempfile.TemporaryDirectory(dir=temp_dir) as scratch, \
+                zipfile.ZipFile(output, 'w', compression=zipfile.ZIP_STORED) as archive:
+            for name, chunks in tables.items():
+                path = Path(scratch) / f"{name}{suffix}"
+                writer, schema = None, None
+                try:
+                    for chunk in chunks():
+                        if writer is None:
+                            batch = pa.Table.from_pandas(chunk, preserve_index=False)
+                            schema = batch.schema
+                            writer = pq.ParquetWriter(path, schema) if fmt == 'parquet' \
+                                else pa.ipc.new_file(str(path), schema)
+                        else:
+                            batch = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+                        writer.write_table(batch)
+                finally:
+                    if writer is not None:
+                        writer.close()
+                if writer is not None:
+                    archive.write(path, f"{name}{suffix}")
+                    path.unlink()
+    
     @staticmethod
     def _create_analysis_summary(results: Dict) -> Dict:
         """
@@ -59,9 +262,9 @@ class ExportUtils:
         if sc_data := results.get('supply_chain_impact'):
             df = pd.DataFrame(sc_data)
             summary.update({f'{k}_companies': v for k, v in df['Sector'].value_counts().items()})
-            
+        
         if risk_data := results.get('risk'):
             risk_dist = pd.DataFrame(risk_data).T['score'].value_counts()
             summary.update({f'risk_{k.lower()}': v for k, v in risk_dist.items()})
         
-        return summary
\ No newline at end of file
+        return summary
@@ -0,0 +1,62 @@
+"""
+Figure Cache
+Plotly figures and derived tables memoized per results fingerprint
+Kept in st.session_state so reruns of the same analysis skip rebuilding them
+"""
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, MutableMapping, Optional
+import sys
+sys.path.append('../..')
+from config import DASHBOARD_SETTINGS
+
+SESSION_KEY = 'figure_cache'
+
+
+def results_fingerprint(results: Dict) -> str:
+    """Identifies one analysis run (tickers, period and run timestamp)"""
+    metadata = results.get('metadata', {})
+    payload = json.dumps(metadata, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+class FigureCache:
+    """
+    LRU of built artifacts for a single results fingerprint.
+    A new analysis (new fingerprint) starts from an empty cache.
+    """
+
+    def __init__(self, fingerprint: str, max_entries: int):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+
+    @classmethod
+    def for_results(cls, results: Dict, store: Optional[MutableMapping] = None,
+                    settings: Optional[Dict] = None) -> 'FigureCache':
+        """The session's cache, reset when the results change"""
+        if store is None:
+            import streamlit as st
+            store = st.session_state
+        settings = settings or DASHBOARD_SETTINGS
+        fingerprint = results_fingerprint(results)
+        cache = store.get(SESSION_KEY)
+        if cache is None or cache.fingerprint != fingerprint:
+            cache = cls(fingerprint, settings['figure_cache_entries'])
+            store[SESSION_KEY] = cache
+        return cache
+
+    def get(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Cached artifact for key, building it on first use"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        value = build()
+        self._entries[key] = value
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def __len__(self):
+        return len(self._entries)
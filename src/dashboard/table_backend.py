@@ -0,0 +1,142 @@
+"""
+Table Backend
+Result tables with sorted indexes on key columns, served one page at a time
+Filtering, sorting and paging run server-side so only the visible page reaches the browser
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class IndexedTable:
+    """
+    A DataFrame plus, per indexed column, a stable argsort of its rows.
+
+    Sorting by an indexed column reuses its order; range filters are two
+    binary searches into it; equality filters on categorical columns go
+    through integer codes. Categorical columns sort alphabetically unless
+    given an explicit order (e.g. Low < Moderate < Severe < Critical).
+    Other columns are indexed on first use.
+    """
+
+    def __init__(self, df: pd.DataFrame, index_columns: Sequence[str] = (),
+                 category_orders: Optional[Dict[str, Sequence]] = None):
+        """
+        Args:
+            df: Table to serve
+            index_columns: Columns to index up front
+            category_orders: column -> categories in ascending order; values
+                not listed sort alphabetically after them
+        """
+        self.df = df.reset_index(drop=True)
+        self._category_orders = dict(category_orders or {})
+        self._order: Dict[str, np.ndarray] = {}
+        self._descending_order: Dict[str, np.ndarray] = {}
+        self._sorted_values: Dict[str, np.ndarray] = {}
+        self._codes: Dict[str, Tuple[np.ndarray, pd.Index]] = {}
+        for column in index_columns:
+            self._index(column)
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.df.columns)
+
+    def _index(self, column: str) -> np.ndarray:
+        """Row positions in ascending order of column (NaN last), built once"""
+        if column not in self._order:
+            values = self.df[column]
+            if values.dtype == object or isinstance(values.dtype, pd.CategoricalDtype):
+                codes, uniques = self._factorize(column, values)
+                self._codes[column] = (codes, uniques)
+                order = np.argsort(np.where(codes < 0, len(uniques), codes), kind='stable')
+                self._sorted_values[column] = codes[order]
+            else:
+                numeric = values.to_numpy(dtype=np.float64, na_value=np.nan)
+                order = np.argsort(numeric, kind='stable')
+                self._sorted_values[column] = numeric[order]
+            self._order[column] = order
+        return self._order[column]
+
+    def _factorize(self, column: str, values: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+        """Codes into the column's distinct values in sort order; -1 for NaN"""
+        codes, uniques = pd.factorize(values, sort=True)
+        ranked = self._category_orders.get(column)
+        if ranked is None:
+            return codes, uniques
+        present, known = set(uniques), set(ranked)
+        uniques = pd.Index([value for value in ranked if value in present] +
+                           [value for value in uniques if value not in known])
+        return uniques.get_indexer(values), uniques
+
+    def values(self, column: str) -> List:
+        """Distinct values of a categorical column, in sort order"""
+        self._index(column)
+        return list(self._codes[column][1])
+
+    def select(self, filters: Optional[Dict[str, Sequence]] = None,
+               ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+               sort_by: Optional[str] = None, ascending: bool = True) -> np.ndarray:
+        """
+        Row positions matching every filter, in sort order
+
+        Args:
+            filters: column -> allowed values (categorical columns)
+            ranges: column -> (low, high) inclusive bounds, None for open
+            sort_by: Column to order by; None keeps the original order
+            ascending: Sort direction (NaN stays last either way)
+        """
+        mask = None
+        for column, allowed in (filters or {}).items():
+            self._index(column)
+            codes, uniques = self._codes[column]
+            wanted = uniques.get_indexer(pd.Index(list(allowed)))
+            column_mask = np.isin(codes, wanted[wanted >= 0])
+            mask = column_mask if mask is None else mask & column_mask
+
+        for column, (low, high) in (ranges or {}).items():
+            order = self._index(column)
+            sorted_values = self._sorted_values[column]
+            start = 0 if low is None else np.searchsorted(sorted_values, low, side='left')
+            # NaN sorts last, so searching for +inf stops before the NaN block
+            end = np.searchsorted(sorted_values, np.inf if high is None else high, side='right')
+            column_mask = np.zeros(len(self.df), dtype=bool)
+            column_mask[order[start:end]] = True
+            mask = column_mask if mask is None else mask & column_mask
+
+        if sort_by is None:
+            return np.arange(len(self.df)) if mask is None else np.flatnonzero(mask)
+
+        order = self._index(sort_by)
+        if not ascending:
+            order = self._descending(sort_by)
+        return order if mask is None else order[mask[order]]
+
+    def _descending(self, column: str) -> np.ndarray:
+        """Row positions in descending order, ties in row order and NaN rows last"""
+        if column not in self._descending_order:
+            if column in self._codes:
+                codes = self._codes[column][0]
+                keys = np.where(codes < 0, np.nan, -codes.astype(np.float64))
+            else:
+                keys = -self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            self._descending_order[column] = np.argsort(keys, kind='stable')
+        return self._descending_order[column]
+
+    def page(self, positions: np.ndarray, page: int, page_size: int) -> pd.DataFrame:
+        """Rows for one zero-based page of a selection, numbered from 1 within it"""
+        start = page * page_size
+        rows = positions[start:start + page_size]
+        frame = self.df.iloc[rows]
+        frame.index = range(start + 1, start + 1 + len(rows))
+        return frame
+
+    def query(self, filters: Optional[Dict[str, Sequence]] = None,
+              ranges: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+              sort_by: Optional[str] = None, ascending: bool = True,
+              page: int = 0, page_size: int = 100) -> Tuple[pd.DataFrame, int]:
+        """One page of the filtered, sorted table plus the total matching rows"""
+        positions = self.select(filters, ranges, sort_by, ascending)
+        return self.page(positions, page, page_size), len(positions)
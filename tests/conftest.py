@@ -0,0 +1,9 @@
+"""
+Shared test setup
+Puts the project root on sys.path so `config` and `src.analysis` import as in the app
+"""
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
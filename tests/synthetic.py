@@ -0,0 +1,90 @@
+"""
+Synthetic Data
+Deterministic price histories on mixed exchange calendars, plus the baseline
+per-ticker pandas metrics the vectorized paths are checked against
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from src.analysis.performance_analyzer import CompanyData, PerformanceAnalyzer
+
+US_HOLIDAYS = ['2023-01-16', '2023-02-20', '2023-04-07', '2023-05-29', '2023-07-04',
+               '2023-09-04', '2023-11-23', '2023-12-25']
+IN_HOLIDAYS = ['2023-01-26', '2023-03-07', '2023-03-30', '2023-04-04', '2023-04-07',
+               '2023-04-14', '2023-05-01', '2023-06-29', '2023-08-15', '2023-09-19',
+               '2023-10-02', '2023-10-24', '2023-11-14', '2023-11-27', '2023-12-25']
+
+# ticker -> (name, sector, industry, calendar, first trading date)
+UNIVERSE = {
+    'NVDA': ('NVIDIA', 'Semiconductors', 'Semiconductors', 'US', '2023-01-03'),
+    'AMD': ('AMD', 'Semiconductors', 'Semiconductors', 'US', '2023-01-03'),
+    'TSM': ('TSMC', 'Semiconductors', 'Foundries', 'US', '2023-03-01'),
+    'F': ('Ford', 'Automotive', 'Auto Manufacturers', 'US', '2023-01-03'),
+    'MARUTI.NS': ('Maruti Suzuki', 'Automotive', 'Auto Manufacturers', 'IN', '2023-01-02'),
+    'TATAMOTORS.NS': ('Tata Motors', 'Automotive', 'Auto Parts', 'IN', '2023-01-02'),
+    'AAPL': ('Apple', 'Consumer Electronics', 'Consumer Electronics', 'US', '2023-01-03'),
+    'DIXON.NS': ('Dixon', 'Consumer Electronics', 'Electronic Components', 'IN', '2023-02-15'),
+}
+
+
+def trading_dates(calendar: str, start: str, end: str = '2023-12-29') -> pd.DatetimeIndex:
+    holidays = pd.DatetimeIndex(US_HOLIDAYS if calendar == 'US' else IN_HOLIDAYS)
+    dates = pd.bdate_range(start, end)
+    return dates[~dates.isin(holidays)]
+
+
+def price_frame(dates: pd.DatetimeIndex, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.cumprod(1 + rng.normal(0.0003, 0.02, len(dates)))
+    spread = np.abs(rng.normal(0, 0.01, len(dates))) * close
+    return pd.DataFrame({
+        'Open': close + rng.normal(0, 0.5, len(dates)),
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1_000, 100_000, len(dates)).astype(float)
+    }, index=pd.Index(dates, name='Date'))
+
+
+def mixed_calendar_companies() -> List[CompanyData]:
+    """US and NSE listings with different holidays and listing dates, no metrics yet"""
+    companies = []
+    for seed, (ticker, (name, sector, industry, calendar, start)) in enumerate(UNIVERSE.items()):
+        companies.append(CompanyData(
+            name=name,
+            sector=sector,
+            data=price_frame(trading_dates(calendar, start), seed),
+            ticker=ticker,
+            metrics={},
+            industry=industry
+        ))
+    return companies
+
+
+def analyzed_companies() -> List[CompanyData]:
+    """mixed_calendar_companies with metrics filled in by PerformanceAnalyzer"""
+    analyzer = PerformanceAnalyzer.__new__(PerformanceAnalyzer)
+    return analyzer._compute_metrics(mixed_calendar_companies())
+
+
+def write_prices(directory, companies: List[CompanyData]):
+    """One CSV per ticker, as LocalFileProvider reads them"""
+    for company in companies:
+        company.data.to_csv(directory / f"{company.ticker}.csv")
+
+
+def reference_metrics(close: pd.Series) -> Dict[str, float]:
+    """
+    The per-ticker pandas calculation from the original _fetch_stock_data,
+    with drawdown measured from the running peak
+    """
+    data = pd.DataFrame({'Close': close})
+    data['Return'] = data['Close'].pct_change()
+    data['Volatility'] = data['Return'].rolling(30, min_periods=10).std() * np.sqrt(252)
+    data = data.ffill().bfill()
+    return {
+        'return': round((data['Close'].iloc[-1] / data['Close'].iloc[0] - 1) * 100, 2),
+        'volatility': round(float(data['Volatility'].mean() * 100), 2),
+        'drawdown': round(((data['Close'] / data['Close'].cummax()) - 1).min() * 100, 2)
+    }
@@ -0,0 +1,83 @@
+"""
+Blockwise correlation tests
+Ledoit-Wolf shrinkage and top-k neighbours under a budget that forces tiling
+"""
+import numpy as np
+import pytest
+from sklearn.covariance import ledoit_wolf
+
+from src.analysis.blockwise_correlation import BlockwiseCorrelation
+
+N_DATES, N_TICKERS, K = 250, 60, 5
+# Leaves room for only a few columns per tile beside the panel copy
+BUDGET_MB = (N_DATES * N_TICKERS * 8 + 10_000) / 1024 ** 2
+
+
+def factor_returns(seed: int = 0, missing: float = 0.0) -> np.ndarray:
+    """Returns driven by a few sector factors, so neighbours are well separated"""
+    rng = np.random.default_rng(seed)
+    factors = rng.normal(0, 0.01, (N_DATES, 4))
+    loadings = rng.normal(0, 1, (4, N_TICKERS)) * (rng.random((4, N_TICKERS)) < 0.5)
+    returns = factors @ loadings + rng.normal(0, 0.01, (N_DATES, N_TICKERS))
+    returns[rng.random(returns.shape) < missing] = np.nan
+    return returns
+
+
+def engine(shrinkage=None) -> BlockwiseCorrelation:
+    return BlockwiseCorrelation(dtype='float64', memory_budget_mb=BUDGET_MB, shrinkage=shrinkage)
+
+
+def brute_force_top_k(corr: np.ndarray, k: int):
+    """Each row's k largest off-diagonal |correlations|, strongest first"""
+    corr = corr.copy()
+    np.fill_diagonal(corr, 0)
+    order = np.argsort(-np.abs(corr), axis=1, kind='stable')[:, :k]
+    return order, np.take_along_axis(corr, order, axis=1)
+
+
+def test_budget_forces_several_tiles():
+    blockwise = engine()
+    shape = (N_DATES, N_TICKERS)
+    assert blockwise._block_size(shape, 2 * 8) < N_TICKERS / 2
+    assert blockwise._block_size(shape, 3 * 8 + 8, extra_cells=K) < N_TICKERS / 2
+    assert blockwise._block_size(shape, 2 * 8 + 8, bytes_per_column=2 * N_DATES * 8) < N_TICKERS / 2
+
+
+def test_ledoit_wolf_matches_sklearn():
+    returns = factor_returns()
+    expected_cov, expected_shrinkage = ledoit_wolf(returns)
+
+    blockwise = engine('ledoit_wolf')
+    assert blockwise.shrinkage_intensity(returns) == pytest.approx(expected_shrinkage, rel=1e-10)
+    np.testing.assert_allclose(blockwise.covariance(returns), expected_cov, rtol=1e-10, atol=1e-16)
+
+    std = np.sqrt(np.diag(expected_cov))
+    np.testing.assert_allclose(blockwise.correlation(returns), expected_cov / np.outer(std, std),
+                               rtol=1e-10, atol=1e-14)
+
+
+@pytest.mark.parametrize('shrinkage', [None, 'ledoit_wolf'])
+def test_top_k_matches_brute_force(shrinkage):
+    returns = factor_returns()
+    blockwise = engine(shrinkage)
+    if shrinkage is None:
+        dense = np.corrcoef(returns, rowvar=False)
+    else:
+        cov = ledoit_wolf(returns)[0]
+        dense = cov / np.outer(np.sqrt(np.diag(cov)), np.sqrt(np.diag(cov)))
+
+    neighbours = blockwise.top_k(returns, K)
+    expected_idx, expected_val = brute_force_top_k(dense, K)
+    assert (neighbours.getnnz(axis=1) == K).all()
+    np.testing.assert_array_equal(neighbours.indices.reshape(N_TICKERS, K), expected_idx)
+    np.testing.assert_allclose(neighbours.data.reshape(N_TICKERS, K), expected_val, rtol=1e-10)
+
+
+def test_top_k_with_missing_days_matches_dense_correlation():
+    returns = factor_returns(seed=1, missing=0.1)
+    blockwise = engine()
+    expected_idx, expected_val = brute_force_top_k(blockwise.correlation(returns), K)
+
+    neighbours = blockwise.top_k(returns, K)
+    np.testing.assert_array_equal(neighbours.indices.reshape(N_TICKERS, K), expected_idx)
+    np.testing.assert_allclose(neighbours.data.reshape(N_TICKERS, K), expected_val, rtol=1e-10)
@@ -0,0 +1,74 @@
+"""
+Data provider tests
+LocalFileProvider against files laid out the way yfinance saves them
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.data_providers import LocalFileProvider, parse_dates
+from src.analysis.performance_analyzer import PerformanceAnalyzer
+
+
+def yfinance_csv(path, tz='America/New_York', start='2024-01-02', periods=120, seed=0):
+    """Write a CSV the way yfinance history().to_csv() does: tz-aware Date with offsets"""
+    dates = pd.bdate_range(start, periods=periods).tz_localize(tz)
+    close = 100 * np.cumprod(1 + np.random.default_rng(seed).normal(0, 0.01, periods))
+    frame = pd.DataFrame({'Open': close, 'High': close, 'Low': close, 'Close': close,
+                          'Volume': 1000, 'Dividends': 0.0, 'Stock Splits': 0.0},
+                         index=pd.Index(dates, name='Date'))
+    frame.to_csv(path)
+    return frame
+
+
+def test_parse_dates_across_dst_keeps_local_dates():
+    dates = parse_dates(['2024-03-08 00:00:00-05:00', '2024-03-11 00:00:00-04:00'])
+    assert dates.tz is None
+    assert list(dates) == [pd.Timestamp('2024-03-08'), pd.Timestamp('2024-03-11')]
+
+
+def test_parse_dates_east_of_utc_does_not_shift_day():
+    dates = parse_dates(['2024-03-11 00:00:00+05:30', '2024-03-12 00:00:00+05:30'])
+    assert list(dates) == [pd.Timestamp('2024-03-11'), pd.Timestamp('2024-03-12')]
+
+
+def test_parse_dates_keeps_datetime_index():
+    index = pd.date_range('2024-01-01', periods=3, tz='UTC')
+    assert parse_dates(index).equals(index)
+
+
+@pytest.mark.parametrize('tz', ['America/New_York', 'Asia/Kolkata'])
+def test_history_spanning_dst_is_complete(tmp_path, tz):
+    frame = yfinance_csv(tmp_path / 'AAA.csv', tz=tz)
+    history = LocalFileProvider(tmp_path).get_history(
+        'AAA', datetime(2024, 1, 1), datetime(2025, 1, 1)
+    )
+    assert len(history) == len(frame)
+    assert list(history.index) == list(frame.index.tz_localize(None))
+    np.testing.assert_allclose(history['Close'], frame['Close'])
+
+
+def test_history_is_sliced_end_exclusive(tmp_path):
+    yfinance_csv(tmp_path / 'AAA.csv')
+    history = LocalFileProvider(tmp_path).get_history(
+        'AAA', datetime(2024, 3, 8), datetime(2024, 3, 12)
+    )
+    assert list(history.index) == [pd.Timestamp('2024-03-08'), pd.Timestamp('2024-03-11')]
+
+
+def test_unreadable_file_is_logged(tmp_path, caplog):
+    (tmp_path / 'BAD.csv').write_text("Date,Close\nnot a date,1\n")
+    with pytest.raises(Exception):
+        LocalFileProvider(tmp_path).get_history('BAD', datetime(2024, 1, 1), datetime(2025, 1, 1))
+    assert 'BAD' in caplog.text
+
+
+def test_fetch_companies_keeps_every_dst_ticker(tmp_path):
+    tickers = [f"T{i}" for i in range(4)]
+    for seed, ticker in enumerate(tickers):
+        yfinance_csv(tmp_path / f"{ticker}.csv", seed=seed)
+    analyzer = PerformanceAnalyzer(provider=LocalFileProvider(tmp_path), max_workers=1)
+    companies = analyzer.fetch_companies(tickers, datetime(2024, 1, 1), datetime(2025, 1, 1))
+    assert [c.ticker for c in companies] == tickers
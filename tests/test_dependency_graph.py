@@ -0,0 +1,30 @@
+"""
+Dependency graph tests
+Edge file resolution independent of the working directory
+"""
+import logging
+
+from config import DEPENDENCY_GRAPH
+from src.analysis.dependency_graph import (
+    edge_file_path, graph_signature, load_dependency_graph, project_root
+)
+
+
+def test_configured_edge_file_loads_from_any_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert edge_file_path(DEPENDENCY_GRAPH) == project_root / DEPENDENCY_GRAPH['edge_file']
+    assert graph_signature(DEPENDENCY_GRAPH)['mtime'] is not None
+    assert len(load_dependency_graph(DEPENDENCY_GRAPH)) > 0
+
+
+def test_missing_edge_file_warns_and_disables(caplog):
+    settings = {**DEPENDENCY_GRAPH, 'edge_file': 'data/no_such_edges.csv'}
+    with caplog.at_level(logging.WARNING):
+        assert load_dependency_graph(settings) is None
+    assert 'no_such_edges.csv' in caplog.text
+
+
+def test_no_edge_file_configured_is_silent(caplog):
+    with caplog.at_level(logging.WARNING):
+        assert load_dependency_graph({**DEPENDENCY_GRAPH, 'edge_file': None}) is None
+    assert caplog.text == ''
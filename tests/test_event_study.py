@@ -0,0 +1,60 @@
+"""
+Event study tests
+The batched market model against per-ticker least-squares fits
+"""
+import numpy as np
+import pandas as pd
+
+from config import EVENT_STUDY
+from src.analysis.event_study import EventStudy
+from src.analysis.price_panel import PricePanel
+from src.analysis.risk_features import daily_returns
+
+from .synthetic import mixed_calendar_companies
+
+SETTINGS = {
+    **EVENT_STUDY,
+    'events': [{'name': 'Fab fire', 'date': '2023-08-15'},
+               {'name': 'Export controls', 'date': '2023-10-07'}],
+    'estimation_window': (-120, -10),
+    'min_estimation_days': 60
+}
+
+
+def test_market_model_matches_per_ticker_polyfit():
+    panel = PricePanel.from_companies(mixed_calendar_companies(), fields=('Close',))
+    result = EventStudy(SETTINGS).analyze_events(panel)
+    returns = daily_returns(panel.field('Close'))
+    est_start, est_end = SETTINGS['estimation_window']
+    fitted = 0
+
+    for e, event in enumerate(result.events):
+        anchor = panel.dates.searchsorted(pd.Timestamp(event['date']))
+        estimation = np.arange(anchor + est_start, anchor + est_end + 1)
+        window = anchor + result.offsets
+        for i, ticker in enumerate(panel.tickers):
+            # Equal-weight market of the other tickers; holidays and late listings masked
+            others = np.delete(returns, i, axis=1)
+            with np.errstate(invalid='ignore'):
+                market = np.nansum(others, axis=1) / (~np.isnan(others)).sum(axis=1)
+            y, x = returns[estimation, i], market[estimation]
+            mask = ~np.isnan(y) & ~np.isnan(x)
+            if mask.sum() < SETTINGS['min_estimation_days']:
+                assert np.isnan(result.beta[e, i]), ticker
+                continue
+
+            beta, alpha = np.polyfit(x[mask], y[mask], 1)
+            residual = y[mask] - alpha - beta * x[mask]
+            np.testing.assert_allclose(result.beta[e, i], beta, rtol=1e-8, err_msg=ticker)
+            np.testing.assert_allclose(result.alpha[e, i], alpha, rtol=1e-6, atol=1e-12, err_msg=ticker)
+            np.testing.assert_allclose(result.residual_std[e, i],
+                                       np.sqrt((residual ** 2).sum() / (mask.sum() - 2)),
+                                       rtol=1e-8, err_msg=ticker)
+            np.testing.assert_allclose(result.abnormal[e, :, i],
+                                       returns[window, i] - alpha - beta * market[window],
+                                       rtol=1e-4, atol=1e-6, err_msg=ticker)
+            fitted += 1
+
+    assert fitted > len(panel.tickers)
+    # The mixed calendars leave masked days in the estimation windows
+    assert np.isnan(returns[anchor + est_start:anchor + est_end + 1]).any()
@@ -0,0 +1,131 @@
+"""
+Export tests
+Every format round-trips the result tables and leaves no temp file open
+"""
+import io
+import tempfile
+import zipfile
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from config import EXPORT_SETTINGS, SCENARIO_SETTINGS
+from src.analysis import pipeline
+from src.dashboard import export_utils
+from src.dashboard.export_utils import EXPORT_FORMATS, ExportUtils
+
+from .synthetic import UNIVERSE, analyzed_companies
+
+SETTINGS = {**EXPORT_SETTINGS, 'chunk_rows': 500}
+
+
+@pytest.fixture(scope='module')
+def results():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setitem(SCENARIO_SETTINGS, 'n_paths', 200)
+        return pipeline.analyze_companies(analyzed_companies(), list(UNIVERSE),
+                                          datetime(2023, 1, 1), datetime(2024, 1, 1))
+
+
+def expected_tables(results):
+    tables = {}
+    for name, chunks in ExportUtils.export_tables(results, SETTINGS).items():
+        frames = list(chunks())
+        if frames:
+            tables[name] = pd.concat(frames, ignore_index=True)
+    return tables
+
+
+def read_export(data: bytes, fmt: str):
+    """Table name -> DataFrame from an exported file"""
+    if fmt == 'xlsx':
+        sheets = pd.read_excel(io.BytesIO(data), sheet_name=None)
+        tables = {}
+        for name, sheet in sheets.items():
+            # Continuation sheets of long tables are named <name[:28]>_<part>
+            base = next((n for n in tables if name.startswith(n[:28] + '_')), name)
+            tables[base] = pd.concat([tables[base], sheet], ignore_index=True) \
+                if base in tables else sheet
+        return tables
+
+    tables = {}
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        for entry in archive.namelist():
+            name, suffix = entry.rsplit('.', 1)
+            with archive.open(entry) as file:
+                if suffix == 'csv':
+                    tables[name] = pd.read_csv(file)
+                elif suffix == 'parquet':
+                    tables[name] = pq.read_table(io.BytesIO(file.read())).to_pandas()
+                else:
+                    tables[name] = pa.ipc.open_file(io.BytesIO(file.read())).read_all().to_pandas()
+    return tables
+
+
+def assert_same_table(actual: pd.DataFrame, expected: pd.DataFrame, fmt: str):
+    assert list(actual.columns) == list(expected.columns)
+    if fmt in ('parquet', 'arrow'):
+        # Object columns of numbers (transposed records) are written as doubles
+        pd.testing.assert_frame_equal(actual, expected.infer_objects())
+        return
+    # Text and spreadsheet cells don't keep dtypes: compare values as read back
+    for column in expected:
+        values = expected[column]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            assert (pd.to_datetime(actual[column]) == values).all(), column
+            continue
+        try:
+            numbers = pd.to_numeric(values).astype(float)
+        except (TypeError, ValueError):
+            assert text(actual[column]) == text(values), column
+            continue
+        pd.testing.assert_series_equal(actual[column].astype(float), numbers,
+                                       check_names=False, rtol=1e-9)
+
+
+def text(values: pd.Series):
+    return [str(v) for v in values.astype(object).where(values.notna(), '')]
+
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS))
+def test_export_round_trips_every_table(results, fmt, monkeypatch):
+    # Small sheets so Excel continues long tables on numbered sheets
+    monkeypatch.setattr(export_utils, 'EXCEL_MAX_ROWS', 700)
+    data = ExportUtils.create_export(results, fmt, SETTINGS)
+    assert isinstance(data, bytes)
+
+    expected = expected_tables(results)
+    assert len(expected['Price_History']) > 2 * SETTINGS['chunk_rows']
+    actual = read_export(data, fmt)
+    assert sorted(actual) == sorted(expected)
+    for name, table in expected.items():
+        assert_same_table(actual[name], table, fmt)
+
+
+@pytest.mark.parametrize('fmt', list(EXPORT_FORMATS))
+def test_export_closes_its_temp_file(results, fmt, monkeypatch):
+    opened, temporary_file = [], tempfile.TemporaryFile
+
+    def recording_temp_file(*args, **kwargs):
+        opened.append(temporary_file(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(export_utils.tempfile, 'TemporaryFile', recording_temp_file)
+    ExportUtils.create_export(results, fmt, SETTINGS)
+    assert opened and all(file.closed for file in opened)
+
+
+def test_write_export_goes_straight_to_disk(results, tmp_path):
+    path = tmp_path / 'analysis.zip'
+    ExportUtils.write_export(results, path, 'parquet', SETTINGS)
+    actual = read_export(path.read_bytes(), 'parquet')
+    for name, table in expected_tables(results).items():
+        assert_same_table(actual[name], table, 'parquet')
+
+
+def test_unknown_format_is_rejected(results):
+    with pytest.raises(ValueError):
+        ExportUtils.create_export(results, 'json', SETTINGS)
@@ -0,0 +1,142 @@
+"""
+Fetch scheduler tests
+Retries on transient provider errors, the per-run request budget and
+limits shared by worker processes
+"""
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import pytest
+import requests
+
+from config import FETCH_SETTINGS, SCENARIO_SETTINGS
+from src.analysis.batch_runner import BatchRunner
+from src.analysis.data_providers import DataProvider, LocalFileProvider
+from src.analysis.fetch_scheduler import (
+    RateLimitedProvider, RequestBudget, RequestBudgetExceeded, TokenBucket
+)
+from src.analysis.performance_analyzer import PerformanceAnalyzer
+
+from .synthetic import UNIVERSE, mixed_calendar_companies, price_frame, trading_dates, write_prices
+
+START, END = datetime(2023, 1, 1), datetime(2024, 1, 1)
+
+
+class FlakyProvider(DataProvider):
+    """Raises the queued errors first, then serves synthetic history"""
+
+    name = 'flaky'
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def get_history(self, ticker, start_date, end_date):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return price_frame(trading_dates('US', '2023-01-03'), seed=len(ticker))
+
+    def get_info(self, ticker):
+        return {'longName': ticker, 'sector': 'Technology', 'industry': 'Semiconductors'}
+
+
+def http_error(status: int) -> requests.HTTPError:
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} error", response=response)
+
+
+def limited(provider, **kwargs) -> RateLimitedProvider:
+    return RateLimitedProvider(provider, backoff_base=0.001, **kwargs)
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.ConnectionError('reset by peer'),
+    requests.exceptions.ReadTimeout('read timed out'),
+    http_error(503),
+    ConnectionResetError('reset'),
+])
+def test_transient_errors_are_retried(error):
+    provider = FlakyProvider([error, error])
+    assert len(limited(provider).get_history('NVDA', START, END)) > 0
+    assert provider.calls == 3
+
+
+def test_client_errors_are_not_retried():
+    provider = FlakyProvider([http_error(404)])
+    with pytest.raises(requests.HTTPError):
+        limited(provider).get_history('NVDA', START, END)
+    assert provider.calls == 1
+
+
+def test_retries_stop_at_max_retries():
+    error = requests.exceptions.ConnectionError('down')
+    provider = FlakyProvider([error] * 5)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        limited(provider, max_retries=2).get_history('NVDA', START, END)
+    assert provider.calls == 3
+
+
+@pytest.mark.parametrize('max_workers', [1, 4])
+def test_exhausted_budget_stops_the_run(monkeypatch, max_workers):
+    analyzer = PerformanceAnalyzer(provider=limited(FlakyProvider()), max_workers=max_workers)
+    monkeypatch.setitem(analyzer._fetch_settings, 'request_budget', 5)
+    with pytest.raises(RequestBudgetExceeded):
+        analyzer.fetch_companies(['NVDA', 'AMD', 'TSM', 'INTC', 'QCOM'], START, END)
+
+
+_shared = {}
+
+
+def _init_shared(bucket, budget):
+    _shared.update(bucket=bucket, budget=budget)
+
+
+def _draw(n: int):
+    """In a worker process: take n tokens, then spend n budget requests"""
+    times = []
+    for _ in range(n):
+        _shared['bucket'].acquire()
+        times.append(time.monotonic())
+    spent = 0
+    for _ in range(n):
+        try:
+            _shared['budget'].consume()
+            spent += 1
+        except RequestBudgetExceeded:
+            break
+    return times, spent
+
+
+def test_limits_built_with_a_context_are_shared_by_processes():
+    context = multiprocessing.get_context('spawn')
+    rate, burst = 40.0, 2
+    bucket = TokenBucket(rate, burst, context)
+    budget = RequestBudget(15, context)
+    with ProcessPoolExecutor(max_workers=2, mp_context=context, initializer=_init_shared,
+                             initargs=(bucket, budget)) as executor:
+        results = list(executor.map(_draw, [10, 10]))
+
+    assert sum(spent for _, spent in results) == 15 == budget.used
+    # Separate buckets would hand out the 20 tokens in about half the time
+    times = sorted(t for worker_times, _ in results for t in worker_times)
+    assert times[-1] - times[0] >= (len(times) - burst - 1) / rate
+
+
+def test_batch_shards_share_one_request_budget(tmp_path, monkeypatch):
+    write_prices(tmp_path, mixed_calendar_companies())
+    monkeypatch.setitem(SCENARIO_SETTINGS, 'n_paths', 200)
+    runner = BatchRunner(workers=2, shard_size=2, provider=LocalFileProvider(tmp_path))
+
+    # 8 tickers x (history + info) fit a budget of 16 across all shards...
+    monkeypatch.setitem(FETCH_SETTINGS, 'request_budget', 16)
+    summary = runner.run(list(UNIVERSE), START, END, tmp_path / 'out')
+    assert summary['companies_analyzed'] == len(UNIVERSE) and summary['shards'] == 4
+
+    # ...but not 10, although each 2-ticker shard alone would
+    monkeypatch.setitem(FETCH_SETTINGS, 'request_budget', 10)
+    with pytest.raises(RequestBudgetExceeded):
+        runner.run(list(UNIVERSE), START, END, tmp_path / 'out')
@@ -0,0 +1,93 @@
+"""
+Incremental metrics tests
+Book state against the vectorized kernel, and the daily refresh path
+"""
+from datetime import datetime
+
+import pandas as pd
+
+from src.analysis import batch_runner
+from src.analysis.data_providers import LocalFileProvider
+from src.analysis.incremental_metrics import IncrementalMetrics, IncrementalMetricsBook
+from src.analysis.metrics_kernel import compute_metrics, metrics_records
+from src.analysis.performance_analyzer import PerformanceAnalyzer
+from src.analysis.price_panel import PricePanel
+
+from .synthetic import mixed_calendar_companies, reference_metrics, write_prices
+
+START = datetime(2023, 1, 1)
+
+
+def test_seeded_book_matches_panel_metrics():
+    companies = mixed_calendar_companies()
+    panel_metrics = metrics_records(compute_metrics(
+        PricePanel.from_companies(companies, fields=('Close',)).field('Close')
+    ))
+    book = IncrementalMetricsBook(START)
+    book.seed(companies)
+    for company, expected in zip(companies, panel_metrics):
+        assert book.states[company.ticker].metrics == expected, company.ticker
+
+
+def test_bar_by_bar_updates_match_reference():
+    company = mixed_calendar_companies()[4]
+    state = IncrementalMetrics()
+    for date, close in company.data['Close'].items():
+        state.update(close, date)
+    assert state.metrics == reference_metrics(company.data['Close'])
+    assert state.last_date == company.data.index[-1]
+
+
+def test_refresh_fetches_only_new_bars(tmp_path):
+    companies = mixed_calendar_companies()
+    write_prices(tmp_path, companies)
+    provider = LocalFileProvider(tmp_path)
+    requests = []
+
+    def get_history(ticker, start, end):
+        requests.append((ticker, start))
+        return provider.get_history(ticker, start, end)
+
+    tickers = [c.ticker for c in companies]
+    book = IncrementalMetricsBook(START)
+    book.refresh(get_history, tickers, datetime(2023, 9, 1))
+    requests.clear()
+    metrics = book.refresh(get_history, tickers, datetime(2024, 1, 1))
+
+    assert all(start > datetime(2023, 8, 25) for _, start in requests)
+    for company in companies:
+        assert metrics[company.ticker] == reference_metrics(company.data['Close']), company.ticker
+
+
+def test_book_save_is_atomic_and_reopens(tmp_path):
+    book = IncrementalMetricsBook(START)
+    book.seed(mixed_calendar_companies())
+    path = tmp_path / 'book' / 'metrics_book.pkl'
+    book.save(path)
+
+    assert [p.name for p in path.parent.iterdir()] == ['metrics_book.pkl']
+    reopened = IncrementalMetricsBook.open(path, START)
+    assert reopened.metrics() == book.metrics()
+    assert IncrementalMetricsBook.open(path, datetime(2022, 1, 1)).states == {}
+
+
+def test_refresh_metrics_writes_book_and_table(tmp_path, monkeypatch):
+    companies = mixed_calendar_companies()
+    prices = tmp_path / 'prices'
+    prices.mkdir()
+    write_prices(prices, companies)
+    monkeypatch.setattr(batch_runner, 'PerformanceAnalyzer',
+                        lambda: PerformanceAnalyzer(provider=LocalFileProvider(prices)))
+
+    tickers = [c.ticker for c in companies]
+    book_path = tmp_path / 'metrics_book.pkl'
+    first = batch_runner.refresh_metrics(tickers, START, datetime(2023, 10, 1),
+                                         tmp_path / 'out', book_path=book_path)
+    second = batch_runner.refresh_metrics(tickers, START, datetime(2024, 1, 1),
+                                          tmp_path / 'out', book_path=book_path)
+
+    assert first['tickers_seeded'] == len(tickers) and second['tickers_seeded'] == 0
+    table = pd.read_parquet(tmp_path / 'out' / 'metrics.parquet').set_index('Ticker')
+    for company in companies:
+        expected = reference_metrics(company.data['Close'])
+        assert table.loc[company.ticker, ['return', 'volatility', 'drawdown']].to_dict() == expected
@@ -0,0 +1,52 @@
+"""
+Metadata store tests
+TTL expiry and loading each preload file version once
+"""
+import os
+import time
+
+import pandas as pd
+
+from src.analysis.metadata_store import MetadataStore
+
+DAY = 86400
+
+
+def write_preload(path, sector='Technology'):
+    pd.DataFrame({
+        'ticker': ['NVDA', 'F'],
+        'longName': ['NVIDIA', 'Ford'],
+        'sector': [sector, 'Consumer Cyclical'],
+        'industry': ['Semiconductors', None]
+    }).to_csv(path, index=False)
+
+
+def test_entries_expire_after_ttl(tmp_path, monkeypatch):
+    store = MetadataStore(tmp_path / 'metadata.sqlite', ttl_seconds=30 * DAY)
+    store.put('NVDA', {'longName': 'NVIDIA', 'sector': 'Technology', 'industry': None})
+    assert store.get('NVDA') == {'longName': 'NVIDIA', 'sector': 'Technology'}
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 31 * DAY)
+    assert store.get('NVDA') is None
+
+
+def test_preload_runs_once_per_file_version(tmp_path, monkeypatch):
+    path = tmp_path / 'metadata.csv'
+    write_preload(path)
+    store = MetadataStore(tmp_path / 'metadata.sqlite', ttl_seconds=30 * DAY)
+    assert store.preload(path) == 2
+
+    # Later analyzers (shards, runs) preloading the same file don't renew it
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 20 * DAY)
+    assert MetadataStore(store.path, ttl_seconds=30 * DAY).preload(path) == 0
+    monkeypatch.setattr(time, 'time', lambda: now + 31 * DAY)
+    assert store.get_many(['NVDA', 'F']) == {}
+
+    # A new version of the file is loaded again
+    write_preload(path, sector='Information Technology')
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert store.preload(path) == 2
+    assert store.get('NVDA')['sector'] == 'Information Technology'
+    assert store.get('F') == {'longName': 'Ford', 'sector': 'Consumer Cyclical'}
@@ -0,0 +1,58 @@
+"""
+Metrics kernel tests
+The vectorized panel pass against the per-ticker pandas reference
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analysis.metrics_kernel import compact, compute_metrics, metrics_records
+from src.analysis.price_panel import PricePanel
+
+from .synthetic import analyzed_companies, mixed_calendar_companies, reference_metrics
+
+
+def test_compact_moves_valid_values_up_in_order():
+    values = np.array([[np.nan, 1.0], [2.0, np.nan], [np.nan, 3.0], [4.0, 5.0]])
+    expected = np.array([[2.0, 1.0], [4.0, 3.0], [np.nan, 5.0], [np.nan, np.nan]])
+    np.testing.assert_array_equal(compact(values), expected)
+
+
+def test_mixed_calendar_panel_matches_per_ticker_pandas():
+    companies = mixed_calendar_companies()
+    panel = PricePanel.from_companies(companies, fields=('Close',))
+    records = metrics_records(compute_metrics(panel.field('Close')))
+
+    for company, record in zip(companies, records):
+        assert record == reference_metrics(company.data['Close']), company.ticker
+
+
+def test_metrics_do_not_depend_on_other_tickers():
+    companies = mixed_calendar_companies()
+    together = metrics_records(compute_metrics(
+        PricePanel.from_companies(companies, fields=('Close',)).field('Close')
+    ))
+    for company, record in zip(companies, together):
+        alone = metrics_records(compute_metrics(company.data['Close'].to_numpy()))[0]
+        assert record == alone, company.ticker
+
+
+def test_gap_inside_history_uses_previous_close():
+    close = pd.Series(100 * np.cumprod(1 + np.random.default_rng(1).normal(0, 0.02, 80)))
+    with_gap = close.copy()
+    with_gap.iloc[40] = np.nan
+    expected = reference_metrics(with_gap.dropna())
+    assert metrics_records(compute_metrics(with_gap.to_numpy()))[0] == expected
+
+
+def test_empty_column_gives_nan():
+    close = np.column_stack([np.linspace(100, 120, 50), np.full(50, np.nan)])
+    metrics = compute_metrics(close)
+    assert np.isnan(metrics['return'][1]) and np.isnan(metrics['volatility'][1])
+
+
+def test_performance_analyzer_fills_reference_metrics():
+    valid = analyzed_companies()
+    assert len(valid) == len(mixed_calendar_companies())
+    for company in valid:
+        assert company.metrics == pytest.approx(reference_metrics(company.data['Close']))
@@ -0,0 +1,78 @@
+"""
+Pipeline tests
+The panel is built from the fetch stream and no per-company frames are kept
+"""
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from config import SCENARIO_SETTINGS
+from src.analysis import pipeline
+from src.analysis.data_providers import LocalFileProvider
+from src.analysis.performance_analyzer import CompanyData, PerformanceAnalyzer
+from src.analysis.price_panel import PricePanel
+
+from .synthetic import UNIVERSE, mixed_calendar_companies, write_prices
+
+START, END = datetime(2023, 1, 1), datetime(2024, 1, 1)
+FIELDS = ('Close', 'Volume')
+
+
+@pytest.fixture
+def local_analyzer(tmp_path, monkeypatch):
+    write_prices(tmp_path, mixed_calendar_companies())
+
+    class LocalAnalyzer(PerformanceAnalyzer):
+        def __init__(self, provider=None):
+            super().__init__(provider=LocalFileProvider(tmp_path))
+
+    monkeypatch.setattr(pipeline, 'PerformanceAnalyzer', LocalAnalyzer)
+    return LocalAnalyzer
+
+
+def test_fetched_histories_keep_only_panel_fields(local_analyzer):
+    full = local_analyzer().fetch_companies(list(UNIVERSE), START, END)
+    slim = local_analyzer().fetch_companies(list(UNIVERSE), START, END,
+                                            fields=FIELDS, dtype='float32')
+
+    for before, after in zip(full, slim):
+        assert list(after.data.columns) == list(FIELDS)
+        assert after.data['Close'].dtype == np.float64
+        assert after.data['Volume'].dtype == np.float32
+        assert after.metrics == before.metrics
+
+
+def test_fetch_panel_matches_panel_of_full_histories(local_analyzer):
+    full = local_analyzer().fetch_companies(list(UNIVERSE), START, END)
+    expected = PricePanel.from_companies(full, fields=FIELDS, dtype='float32')
+    panel = local_analyzer().fetch_panel(list(UNIVERSE), START, END,
+                                         fields=FIELDS, dtype='float32')
+
+    assert panel.tickers == expected.tickers
+    assert panel.dates.equals(expected.dates)
+    for field in FIELDS:
+        np.testing.assert_array_equal(panel.field(field), expected.field(field))
+    assert [c.metrics for c in panel] == [c.metrics for c in expected]
+
+
+def test_engine_keeps_the_panel_not_company_frames(local_analyzer, monkeypatch):
+    engine = pipeline.build_engine()
+    monkeypatch.setattr(pipeline, 'ENGINE', engine)
+    monkeypatch.setitem(SCENARIO_SETTINGS, 'n_paths', 200)
+
+    results = pipeline.run_pipeline(list(UNIVERSE), START, END)
+    assert results['companies'] == list(UNIVERSE)
+
+    memo = list(engine._memo.values())
+    assert any(isinstance(value, PricePanel) for value in memo)
+    assert not any(isinstance(value, list) and value and isinstance(value[0], CompanyData)
+                   for value in memo)
+
+    # Seeding equal companies hashes to the fetched panel's results
+    companies = pipeline.fetch_companies(list(UNIVERSE), START, END)
+    pipeline.analyze_companies(companies, list(UNIVERSE), START, END)
+    first = engine.last_run['computed']
+    pipeline.analyze_companies(pipeline.fetch_companies(list(UNIVERSE), START, END),
+                               list(UNIVERSE), START, END)
+    assert engine.last_run['computed'] == [] and first
@@ -0,0 +1,64 @@
+"""
+Pipeline engine tests
+Content hashing of seeds and the bounded stage memo
+"""
+import numpy as np
+import pandas as pd
+
+from src.analysis.pipeline_engine import PipelineEngine, Stage, approx_nbytes, content_hash
+
+from .synthetic import mixed_calendar_companies
+
+
+def test_equal_fetches_hash_equal():
+    assert content_hash(mixed_calendar_companies()) == content_hash(mixed_calendar_companies())
+
+
+def test_shared_objects_do_not_change_the_hash():
+    frame = pd.DataFrame({'Close': [1.0, 2.0]})
+    shared = [frame, frame]
+    separate = [frame.copy(), frame.copy()]
+    assert content_hash(shared) == content_hash(separate)
+
+
+def test_changed_price_changes_the_hash():
+    companies = mixed_calendar_companies()
+    before = content_hash(companies)
+    companies[3].data.iloc[-1, companies[3].data.columns.get_loc('Close')] += 0.01
+    assert content_hash(companies) != before
+
+
+def test_config_values_hash_by_content():
+    assert content_hash({'a': [1, 2], 'b': None}) == content_hash({'b': None, 'a': [1, 2]})
+    assert content_hash(np.arange(3)) != content_hash(np.arange(3, dtype=np.float32))
+
+
+def test_reseeding_equal_companies_is_served_from_memo():
+    calls = []
+    engine = PipelineEngine([
+        Stage('companies', lambda: []),
+        Stage('closes', lambda companies: calls.append(1) or [c.data['Close'].iloc[-1] for c in companies],
+              inputs=('companies',)),
+        Stage('total', lambda closes, scale: sum(closes) * scale,
+              inputs=('closes',), config=('scale',))
+    ], max_workers=1)
+
+    first = engine.run({'scale': 2}, seeds={'companies': mixed_calendar_companies()})
+    second = engine.run({'scale': 2}, seeds={'companies': mixed_calendar_companies()})
+    assert engine.last_run['computed'] == []
+    assert first['total'] == second['total'] and len(calls) == 1
+
+
+def test_memo_is_bounded_by_size():
+    engine = PipelineEngine([
+        Stage('block', lambda n: np.zeros(n), config=('n',))
+    ], max_workers=1, cache_bytes=3 * 8000)
+
+    for n in range(1000, 1006):
+        engine.run({'n': n})
+    assert engine.memo_bytes <= 3 * 8000
+    assert len(engine._memo) == 2
+
+    engine.run({'n': 10_000})        # larger than the whole budget: not kept
+    assert engine.last_run['computed'] == ['block']
+    assert all(approx_nbytes(value) < 80_000 for value in engine._memo.values())
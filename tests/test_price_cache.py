@@ -0,0 +1,117 @@
+"""
+Price cache tests
+Delta fetching, re-adjusted history and LRU eviction
+"""
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.analysis.data_providers import DataProvider, slice_dates
+from src.analysis.price_cache import CachedProvider, PriceCache
+
+from .synthetic import price_frame, trading_dates
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close']
+
+
+class RecordingProvider(DataProvider):
+    """Serves slices of a full history and records every requested range"""
+
+    name = 'recording'
+
+    def __init__(self, history: pd.DataFrame):
+        self.history = history
+        self.requests = []
+
+    def get_history(self, ticker, start_date, end_date):
+        self.requests.append((pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        return slice_dates(self.history, start_date, end_date)
+
+    def get_info(self, ticker):
+        return {}
+
+    def adjust_before(self, date: str, factor: float):
+        """Back-adjust prices before date, as yfinance does after a split or dividend"""
+        before = self.history.index < pd.Timestamp(date)
+        self.history.loc[before, PRICE_COLUMNS] *= factor
+
+
+def cached_provider(tmp_path):
+    provider = RecordingProvider(price_frame(trading_dates('US', '2023-01-03'), seed=7))
+    return provider, CachedProvider(provider, PriceCache(tmp_path / 'prices'))
+
+
+def test_cached_range_is_served_without_fetching(tmp_path):
+    provider, cached = cached_provider(tmp_path)
+    first = cached.get_history('NVDA', datetime(2023, 2, 1), datetime(2023, 6, 1))
+    second = cached.get_history('NVDA', datetime(2023, 3, 1), datetime(2023, 5, 1))
+
+    assert len(provider.requests) == 1
+    pd.testing.assert_frame_equal(second, slice_dates(first, datetime(2023, 3, 1), datetime(2023, 5, 1)),
+                                  check_freq=False)
+
+
+def test_extension_fetches_only_the_new_range_plus_one_overlap_bar(tmp_path):
+    provider, cached = cached_provider(tmp_path)
+    cached.get_history('NVDA', datetime(2023, 3, 1), datetime(2023, 6, 1))
+    extended = cached.get_history('NVDA', datetime(2023, 2, 1), datetime(2023, 9, 1))
+
+    head, tail = provider.requests[1:]
+    assert head == (pd.Timestamp('2023-02-01'), pd.Timestamp('2023-03-02'))
+    assert tail == (pd.Timestamp('2023-05-31'), pd.Timestamp('2023-09-01'))
+    expected = slice_dates(provider.history, datetime(2023, 2, 1), datetime(2023, 9, 1))
+    pd.testing.assert_frame_equal(extended, expected, check_freq=False)
+
+
+def test_split_between_runs_refetches_instead_of_stitching(tmp_path):
+    provider, cached = cached_provider(tmp_path)
+    provider.adjust_before('2023-07-03', 4.0)      # pre-split prices, cached
+    cached.get_history('NVDA', datetime(2023, 1, 1), datetime(2023, 6, 1))
+
+    provider.adjust_before('2023-07-03', 0.25)     # 4-for-1 split, back-adjusted
+    history = cached.get_history('NVDA', datetime(2023, 1, 1), datetime(2023, 9, 1))
+
+    assert provider.requests[-1] == (pd.Timestamp('2023-01-01'), pd.Timestamp('2023-09-01'))
+    expected = slice_dates(provider.history, datetime(2023, 1, 1), datetime(2023, 9, 1))
+    pd.testing.assert_frame_equal(history, expected, check_freq=False)
+    assert history['Close'].pct_change().abs().max() < 0.2
+
+    # The cache now holds the re-adjusted history
+    served = cached.get_history('NVDA', datetime(2023, 2, 1), datetime(2023, 5, 1))
+    np.testing.assert_allclose(served['Close'],
+                               slice_dates(provider.history, datetime(2023, 2, 1),
+                                           datetime(2023, 5, 1))['Close'])
+
+
+def test_dividend_adjustment_is_detected(tmp_path):
+    provider, cached = cached_provider(tmp_path)
+    cached.get_history('NVDA', datetime(2023, 1, 1), datetime(2023, 6, 1))
+
+    provider.adjust_before('2023-06-15', 0.995)
+    calls = len(provider.requests)
+    history = cached.get_history('NVDA', datetime(2023, 1, 1), datetime(2023, 7, 1))
+
+    assert len(provider.requests) == calls + 2     # tail delta, then the full refetch
+    np.testing.assert_allclose(history['Close'],
+                               slice_dates(provider.history, datetime(2023, 1, 1),
+                                           datetime(2023, 7, 1))['Close'])
+
+
+def test_store_round_trips_and_evicts_least_recently_used(tmp_path):
+    frame = price_frame(trading_dates('US', '2023-01-03'), seed=1)
+    probe = PriceCache(tmp_path / 'probe')
+    probe.store('A', frame, frame.index[0], frame.index[-1])
+    file_size = probe.size_bytes()
+
+    cache = PriceCache(tmp_path / 'prices', max_bytes=int(file_size * 2.5))
+    for age, ticker in enumerate(['A', 'B', 'C']):
+        cache.store(ticker, frame, frame.index[0], frame.index[-1])
+        os.utime(cache._path(ticker), (age, age))
+    cache.store('D', frame, frame.index[0], frame.index[-1])
+
+    assert sorted(p.name for p in cache.directory.iterdir()) == ['C.parquet', 'D.parquet']
+    loaded, start, end = cache.load('D')
+    pd.testing.assert_frame_equal(loaded, frame, check_freq=False)
+    assert (start, end) == (frame.index[0], frame.index[-1])
@@ -0,0 +1,48 @@
+"""
+Resolution pyramid tests
+Weekly and monthly bars against per-ticker pandas OHLC resampling
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import PANEL_SETTINGS
+from src.analysis.price_panel import PricePanel
+from src.analysis.resolution_pyramid import OHLC_FIELDS, PYRAMID_LEVELS, ResolutionPyramid
+
+from .synthetic import mixed_calendar_companies
+
+
+def reference_bars(data: pd.DataFrame, freq: str) -> pd.DataFrame:
+    """OHLC of one ticker's own bars per calendar period"""
+    return data.groupby(data.index.to_period(freq)).agg(
+        {'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last'}
+    )
+
+
+def test_panel_settings_carry_ohlc():
+    assert set(OHLC_FIELDS) <= set(PANEL_SETTINGS['fields'])
+
+
+@pytest.mark.parametrize('level', ['weekly', 'monthly'])
+def test_bars_match_pandas_resampling(level):
+    companies = mixed_calendar_companies()
+    panel = PricePanel.from_companies(companies, fields=PANEL_SETTINGS['fields'])
+    bars = ResolutionPyramid.from_panel(panel, dtype=np.float64).levels[level]
+    periods = bars.dates.to_period(PYRAMID_LEVELS[level])
+
+    for column, company in enumerate(companies):
+        expected = reference_bars(company.data, PYRAMID_LEVELS[level])
+        traded = ~np.isnan(bars.ohlc['Close'][:, column])
+        assert list(periods[traded]) == list(expected.index), company.ticker
+        for field in OHLC_FIELDS:
+            np.testing.assert_allclose(bars.ohlc[field][traded, column],
+                                       expected[field].to_numpy(), err_msg=company.ticker)
+        assert (bars.ohlc['High'][traded, column] >= bars.ohlc['Close'][traded, column]).all()
+
+
+def test_missing_fields_are_not_faked_from_close():
+    panel = PricePanel.from_companies(mixed_calendar_companies(), fields=('Close',))
+    pyramid = ResolutionPyramid.from_panel(panel)
+    for level in pyramid.levels.values():
+        assert list(level.ohlc) == ['Close']
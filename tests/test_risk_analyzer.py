@@ -0,0 +1,35 @@
+"""
+Risk analyzer tests
+Model persistence: explicit, atomic and independent of the working directory
+"""
+import pytest
+
+from src.analysis.risk_analyzer import RiskAnalyzer, default_model_path, project_root
+
+from .synthetic import analyzed_companies
+
+
+def test_scoring_does_not_persist_the_model(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("fit was persisted without a save_path")
+    monkeypatch.setattr(RiskAnalyzer, 'save_model', staticmethod(fail))
+
+    scores = RiskAnalyzer().score_risk(analyzed_companies())
+    assert len(scores) == len(analyzed_companies())
+
+
+def test_explicit_save_round_trips(tmp_path):
+    companies = analyzed_companies()
+    path = tmp_path / 'models' / 'risk_model.joblib'
+    fitted = RiskAnalyzer(save_path=str(path)).score_risk(companies)
+
+    assert [p.name for p in path.parent.iterdir()] == ['risk_model.joblib']
+    reloaded = RiskAnalyzer(model_path=str(path)).score_risk(companies)
+    assert reloaded.keys() == fitted.keys()
+    for ticker, risk in fitted.items():
+        assert reloaded[ticker]['anomaly_score'] == pytest.approx(risk['anomaly_score'])
+
+
+def test_default_model_path_is_under_project_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert default_model_path().resolve().is_relative_to(project_root.resolve())
@@ -0,0 +1,54 @@
+"""
+Risk feature tests
+Drawdown duration over each ticker's own bars and leave-one-out basket beta
+"""
+import numpy as np
+
+from src.analysis.price_panel import PricePanel
+from src.analysis.risk_features import (
+    BASKET_SECTOR, FEATURE_NAMES, compute_risk_features, daily_returns
+)
+
+from .synthetic import mixed_calendar_companies
+
+DURATION = FEATURE_NAMES.index('max_drawdown_duration')
+BETA = FEATURE_NAMES.index('beta')
+
+
+def reference_duration(close) -> int:
+    """Longest run of consecutive bars below the running peak"""
+    longest = run = 0
+    for below in (close < close.cummax()):
+        run = run + 1 if below else 0
+        longest = max(longest, run)
+    return longest
+
+
+def test_drawdown_duration_counts_own_bars():
+    companies = mixed_calendar_companies()
+    _, features = compute_risk_features(companies)
+
+    for row, company in enumerate(companies):
+        assert features[row, DURATION] == reference_duration(company.data['Close']), company.ticker
+        # Holidays of other listings in the panel don't lengthen the stretch
+        _, alone = compute_risk_features([company])
+        assert alone[0, DURATION] == features[row, DURATION], company.ticker
+
+
+def test_beta_leaves_the_ticker_out_of_its_basket():
+    companies = mixed_calendar_companies()
+    panel = PricePanel.from_companies(companies, fields=('Close',))
+    _, features = compute_risk_features(panel)
+    returns = daily_returns(panel.field('Close'))
+    members = [i for i, c in enumerate(companies) if c.sector == BASKET_SECTOR]
+
+    for column, company in enumerate(companies):
+        others = returns[:, [i for i in members if i != column]]
+        with np.errstate(invalid='ignore'):
+            counts = (~np.isnan(others)).sum(axis=1)
+            basket = np.where(counts > 0, np.nansum(others, axis=1) / counts, np.nan)
+        pair = ~np.isnan(returns[:, column]) & ~np.isnan(basket)
+        r, b = returns[pair, column], basket[pair]
+        expected = np.cov(r, b, bias=True)[0, 1] / b.var()
+        np.testing.assert_allclose(features[column, BETA], expected, rtol=1e-9,
+                                   err_msg=company.ticker)
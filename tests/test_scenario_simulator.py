@@ -0,0 +1,117 @@
+"""
+Scenario simulator tests
+Worker start method and count, reproducibility across workers, one pool
+per run_all and the memory budget
+"""
+import os
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from config import SCENARIO_SETTINGS
+from src.analysis import scenario_simulator
+from src.analysis.scenario_simulator import Scenario, ScenarioSimulator, _simulate_chunk
+
+from .synthetic import mixed_calendar_companies
+
+SCENARIO = Scenario('Foundry -30%', {'Semiconductors': -0.30}, 60)
+SCENARIOS = [
+    {'name': 'Baseline', 'shocks': {}, 'duration_days': 0},
+    {'name': 'Foundry -30%', 'shocks': {'Semiconductors': -0.30}, 'duration_days': 60},
+    {'name': 'Autos -20%', 'shocks': {'Automotive': -0.20}, 'duration_days': 30, 'propagate': False}
+]
+
+
+def simulator(**overrides) -> ScenarioSimulator:
+    settings = {**SCENARIO_SETTINGS, 'n_paths': 400, 'horizon_days': 120,
+                'paths_per_task': 100, **overrides}
+    return ScenarioSimulator(mixed_calendar_companies(), settings=settings)
+
+
+def test_default_start_method_is_not_fork():
+    assert SCENARIO_SETTINGS['start_method'] in ('spawn', 'forkserver')
+
+
+@pytest.fixture
+def counted_pools(monkeypatch):
+    """Pretend to have 4 cores and count the process pools started"""
+    started = []
+
+    class CountingPool(scenario_simulator.ProcessPoolExecutor):
+        def __init__(self, max_workers=None, **kwargs):
+            started.append(max_workers)
+            super().__init__(max_workers=max_workers, **kwargs)
+
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(scenario_simulator, 'ProcessPoolExecutor', CountingPool)
+    return started
+
+
+def test_spawned_pool_matches_in_process_run(counted_pools):
+    in_process = simulator(max_workers=1).run(SCENARIO)
+    pooled = simulator(max_workers=2, min_pool_work=0, start_method='spawn').run(SCENARIO)
+    assert counted_pools == [2]
+    assert pooled == in_process
+
+
+def test_run_all_shares_one_pool(counted_pools):
+    pooled = simulator(max_workers=2, min_pool_work=0).run_all(SCENARIOS)
+    assert counted_pools == [2]
+
+    sim = simulator(max_workers=1)
+    assert pooled == [record for spec in SCENARIOS
+                      for record in sim.run(Scenario.from_dict(spec))]
+
+
+def test_small_runs_stay_in_process(counted_pools):
+    sim = simulator(max_workers=4, min_pool_work=400 * len(SCENARIOS) * 8 + 1)
+    assert len(sim.run_all(SCENARIOS)) == len(SCENARIOS) * (len(sim.sectors) + len(sim.tickers))
+    assert counted_pools == []
+
+
+def test_workers_are_capped_at_the_core_count(monkeypatch):
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    for max_workers in (8, None):
+        sim = simulator(max_workers=max_workers, min_pool_work=0)
+        assert sim._workers(sim._tasks(SCENARIO)) == 2
+
+
+def test_broken_pool_falls_back_to_in_process(monkeypatch):
+    class BrokenPool:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, *args):
+            raise scenario_simulator.BrokenProcessPool("child died")
+
+    monkeypatch.setattr(os, 'cpu_count', lambda: 4)
+    monkeypatch.setattr(scenario_simulator, 'ProcessPoolExecutor', BrokenPool)
+    expected = simulator(max_workers=1).run(SCENARIO)
+    assert simulator(max_workers=2, min_pool_work=0).run(SCENARIO) == expected
+
+
+def test_worker_peak_memory_stays_within_budget():
+    budget_mb = 2
+    sim = simulator(memory_budget_mb=budget_mb)
+    horizon = sim.settings['horizon_days']
+    batch_size = sim._batch_size(horizon)
+    n_paths = 3 * batch_size
+    assert batch_size > 1
+
+    task = (np.random.SeedSequence(0), n_paths, sim.mean, sim.cholesky,
+            np.zeros(len(sim.tickers), dtype=np.float32), 0, horizon,
+            sim.membership, sim.settings['bins'], batch_size)
+    tracemalloc.start()
+    try:
+        _simulate_chunk(task)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak <= budget_mb * 1024 * 1024
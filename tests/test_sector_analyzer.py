@@ -0,0 +1,131 @@
+"""
+Sector analyzer tests
+Mergeable aggregates against the original per-sector value lists
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import IMPACT_THRESHOLDS
+from src.analysis.performance_analyzer import CompanyData
+from src.analysis.sector_aggregates import SectorAggregateBook
+from src.analysis.sector_analyzer import SectorAnalyzer
+
+from .synthetic import analyzed_companies
+
+INDUSTRIES = {
+    'Semiconductors': ['Semiconductors', 'Foundries', 'Equipment'],
+    'Automotive': ['Auto Manufacturers', 'Auto Parts'],
+    'Consumer Electronics': ['Consumer Electronics'],
+    'Industrial': ['Machinery', ''],
+}
+
+
+def random_companies(n: int, seed: int):
+    """Companies with metrics rounded to 2 places like PerformanceAnalyzer's"""
+    rng = np.random.default_rng(seed)
+    sectors = list(INDUSTRIES)
+    companies = []
+    for i in range(n):
+        sector = sectors[rng.integers(len(sectors))]
+        industry = INDUSTRIES[sector][rng.integers(len(INDUSTRIES[sector]))]
+        companies.append(CompanyData(
+            name=f'Company {i}', sector=sector, data=pd.DataFrame(), ticker=f'T{i}',
+            metrics={'return': round(float(rng.normal(10, 40)), 2),
+                     'volatility': round(float(rng.uniform(10, 80)), 2),
+                     'drawdown': round(float(-rng.uniform(0, 90)), 2)},
+            industry=industry
+        ))
+    return companies
+
+
+def reference_sector_records(companies):
+    """The per-sector value-list implementation SectorAnalyzer replaced"""
+    analyzer = SectorAnalyzer()
+    sector_data = {}
+    for company in companies:
+        data = sector_data.setdefault(company.sector, {
+            'impacts': [], 'returns': [], 'companies': 0, 'critical': 0, 'severe': 0
+        })
+        impact = abs(company.metrics['drawdown'])
+        data['impacts'].append(impact)
+        data['returns'].append(company.metrics['return'])
+        data['companies'] += 1
+        if impact >= IMPACT_THRESHOLDS['Critical']:
+            data['critical'] += 1
+        elif impact >= IMPACT_THRESHOLDS['Severe']:
+            data['severe'] += 1
+
+    return [
+        {
+            'Sector': sector,
+            'Companies_Analyzed': data['companies'],
+            'Avg_Financial_Impact_pct': round(np.mean(data['impacts']), 1),
+            'Avg_Return_Pct': round(np.mean(data['returns']), 1),
+            'Critical_Impact_Companies': data['critical'],
+            'Severe_Impact_Companies': data['severe'],
+            'Supply_Chain_Risk_Level': analyzer._get_risk_level(np.mean(data['impacts']))
+        }
+        for sector, data in sector_data.items()
+    ]
+
+
+def assert_books_equal(book, expected):
+    assert book.industries.keys() == expected.industries.keys()
+    for key, aggregate in expected.industries.items():
+        other = book.industries[key]
+        assert (other.count, other.critical, other.severe) == \
+            (aggregate.count, aggregate.critical, aggregate.severe), key
+        assert other.impact.total == pytest.approx(aggregate.impact.total)
+        assert other.returns.total == pytest.approx(aggregate.returns.total)
+        assert other.impact.total_sq == pytest.approx(aggregate.impact.total_sq)
+
+
+@pytest.mark.parametrize('companies', [
+    analyzed_companies, lambda: random_companies(500, 0), lambda: random_companies(2000, 1)
+], ids=['synthetic', 'random_500', 'random_2000'])
+def test_analyze_sectors_matches_reference(companies):
+    companies = companies()
+    assert SectorAnalyzer().analyze_sectors(companies) == reference_sector_records(companies)
+
+
+def test_industries_roll_up_to_sectors():
+    companies = random_companies(500, 2)
+    industries = pd.DataFrame(SectorAnalyzer().analyze_industries(companies))
+    sectors = pd.DataFrame(SectorAnalyzer().analyze_sectors(companies)).set_index('Sector')
+    counts = industries.groupby('Sector')[['Companies_Analyzed', 'Critical_Impact_Companies',
+                                           'Severe_Impact_Companies']].sum()
+    pd.testing.assert_frame_equal(counts, sectors[counts.columns].loc[counts.index])
+    assert 'Unknown' in set(industries['Industry'])
+
+
+def test_merged_shards_equal_one_book():
+    analyzer = SectorAnalyzer()
+    companies = random_companies(900, 3)
+    merged = analyzer.aggregate(companies[:300])
+    for shard in (companies[300:650], companies[650:]):
+        merged.merge(analyzer.aggregate(shard))
+    assert_books_equal(merged, analyzer.aggregate(companies))
+
+
+def test_removals_and_updates_equal_a_rebuild():
+    analyzer = SectorAnalyzer()
+    companies = random_companies(400, 4)
+    replacements = random_companies(400, 5)
+    book = analyzer.aggregate(companies)
+
+    for company in companies[:50]:
+        book.remove(company)
+    delta = SectorAggregateBook(book.critical, book.severe)
+    for old, new in zip(companies[50:120], replacements[50:120]):
+        new.sector, new.industry = old.sector, old.industry
+        delta.update(old, new)
+    book.merge(delta)
+
+    expected = analyzer.aggregate(replacements[50:120] + companies[120:])
+    assert_books_equal(book, expected)
+
+
+def test_merge_rejects_different_thresholds():
+    with pytest.raises(ValueError):
+        SectorAggregateBook(60, 40).merge(SectorAggregateBook(50, 40))
@@ -0,0 +1,103 @@
+"""
+Sector classifier tests
+The indexed classifier against the original per-ticker _determine_sector scans
+"""
+import itertools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import SECTOR_MAP
+from src.analysis.performance_analyzer import PerformanceAnalyzer
+from src.analysis.sector_classifier import SectorClassifier, get_classifier
+
+FRAGMENTS = ['', 'Semiconductors', 'Technology', 'Consumer Cyclical', 'Auto Parts',
+             'Recreational Vehicles', 'Electronic Components', 'Computer Hardware',
+             'Telecom Services', 'Industrials', 'CHIPS & Autos', 'Electronic Vehicles',
+             'Industrial Computers', 'Utilities', 'Semi-Conductor Equipment']
+
+
+def reference_sector(ticker: str, info) -> str:
+    """The original SCAnalyzer._determine_sector"""
+    for sector, tickers in SECTOR_MAP.items():
+        if ticker in tickers:
+            return sector
+    try:
+        sector = info.get('sector', '').lower()
+        industry = info.get('industry', '').lower()
+
+        if any(word in sector + industry
+               for word in ['semiconductor', 'chip']):
+            return 'Semiconductors'
+        elif any(word in sector + industry
+                 for word in ['auto', 'vehicle']):
+            return 'Automotive'
+        elif any(word in sector + industry
+                 for word in ['electronic', 'computer']):
+            return 'Consumer Electronics'
+        elif any(word in sector + industry
+                 for word in ['telecom', 'industrial']):
+            return 'Telecom_Industrial'
+    except:
+        pass
+    return 'Other'
+
+
+def metadata_cases():
+    mapped = [ticker for tickers in SECTOR_MAP.values() for ticker in tickers]
+    cases = [(ticker, {'sector': 'Utilities', 'industry': 'Water'}) for ticker in mapped]
+    cases += [(f'X{i}', {'sector': sector, 'industry': industry})
+              for i, (sector, industry) in enumerate(itertools.product(FRAGMENTS, FRAGMENTS))]
+    cases += [('Y1', {}), ('Y2', {'industry': 'Auto Parts'}), ('Y3', {'sector': 'Technology'}),
+              ('Y4', {'sector': None, 'industry': 'Semiconductors'}),
+              ('Y5', {'sector': 'Technology', 'industry': float('nan')}), ('Y6', None)]
+    return cases
+
+
+def test_classify_matches_original_scan():
+    classifier = SectorClassifier()
+    for ticker, info in metadata_cases():
+        assert classifier.classify(ticker, info) == reference_sector(ticker, info), (ticker, info)
+
+
+def test_performance_analyzer_delegates_to_classifier():
+    analyzer = PerformanceAnalyzer.__new__(PerformanceAnalyzer)
+    analyzer._classifier = get_classifier()
+    for ticker, info in metadata_cases():
+        assert analyzer._determine_sector(ticker, info) == reference_sector(ticker, info)
+
+
+def test_overlapping_keywords_follow_rule_order():
+    classifier = SectorClassifier()
+    assert classifier.match_text('industrial autochips') == 'Semiconductors'
+    assert classifier.match_text('electronicvehicle') == 'Automotive'
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_classify_file_matches_original_scan(tmp_path, suffix):
+    rows = [(ticker, info) for ticker, info in metadata_cases()
+            if info and all(isinstance(info.get(k, ''), str) for k in ('sector', 'industry'))]
+    metadata = pd.DataFrame({
+        'ticker': [ticker for ticker, _ in rows],
+        'sector': [info.get('sector', np.nan) or np.nan for _, info in rows],
+        'industry': [info.get('industry', np.nan) or np.nan for _, info in rows],
+    })
+    path = tmp_path / f'metadata{suffix}'
+    if suffix == '.csv':
+        metadata.to_csv(path, index=False)
+    else:
+        metadata.to_parquet(path, index=False)
+
+    sectors = SectorClassifier().classify_file(path)
+    expected = [reference_sector(ticker, info) for ticker, info in rows]
+    assert sectors.tolist() == expected
+    assert sectors.index.tolist() == metadata['ticker'].tolist()
+
+
+def test_classifier_is_shared_per_rule_set():
+    assert get_classifier() is get_classifier()
+    custom = get_classifier(keyword_rules={'Chips': ['chip']}, default='Unknown')
+    assert custom is not get_classifier()
+    assert custom.classify('ZZZ', {'industry': 'Chipmakers'}) == 'Chips'
+    assert custom.classify('ZZZ', {'industry': 'Autos'}) == 'Unknown'
@@ -0,0 +1,61 @@
+"""
+Supply chain analyzer tests
+The columnar frame path against the per-company records
+"""
+import itertools
+
+import pandas as pd
+import pytest
+
+from src.analysis.dependency_graph import DependencyGraph
+from src.analysis.performance_analyzer import CompanyData
+from src.analysis.supply_chain_analyzer import SupplyChainAnalyzer
+
+from .synthetic import UNIVERSE, analyzed_companies
+
+EDGES = pd.DataFrame({
+    'supplier': ['TSM', 'TSM', 'NVDA', 'AMD', 'TATAMOTORS.NS'],
+    'customer': ['NVDA', 'AMD', 'AAPL', 'DIXON.NS', 'MARUTI.NS'],
+    'weight': [0.6, 0.6, 0.3, 0.2, 0.4]
+})
+
+
+def boundary_companies():
+    """Metrics on the severity, recovery, recommendation and rounding edges"""
+    returns = [-35.0, 0.0, 0.3, 20.0, 20.01, 50.0, 51.25]
+    drawdowns = [0.0, -20.0, -25.0, -31.25, -45.0, -50.06, -60.0, -75.5]
+    sectors = ['Semiconductors', 'Automotive', 'Consumer Electronics', 'Unmapped Sector']
+    companies = []
+    for i, (ret, drawdown, sector) in enumerate(itertools.product(returns, drawdowns, sectors)):
+        companies.append(CompanyData(
+            name=f'Company {i}', sector=sector, data=pd.DataFrame(), ticker=f'T{i}',
+            metrics={'return': ret, 'volatility': 30.0, 'drawdown': drawdown},
+            industry=sector
+        ))
+    return companies
+
+
+@pytest.mark.parametrize('graph', [None, DependencyGraph.from_edges(EDGES)], ids=['no_graph', 'graph'])
+@pytest.mark.parametrize('companies', [analyzed_companies, boundary_companies])
+def test_frame_matches_per_company_records(graph, companies):
+    analyzer = SupplyChainAnalyzer(graph=graph, use_graph=graph is not None)
+    companies = companies()
+
+    records = analyzer.analyze_supply_chain(companies)
+    frame = analyzer.analyze_supply_chain_frame(companies)
+    assert list(frame.columns) == list(records[0])
+    assert frame.to_dict('records') == records
+
+
+def test_graph_can_be_switched_off():
+    analyzer = SupplyChainAnalyzer(graph=DependencyGraph.from_edges(EDGES), use_graph=False)
+    frame = analyzer.analyze_supply_chain_frame(analyzed_companies())
+    assert (frame['Propagated_Impact_pct'] == 0).all()
+
+
+def test_graph_propagates_to_customers():
+    analyzer = SupplyChainAnalyzer(graph=DependencyGraph.from_edges(EDGES))
+    frame = analyzer.analyze_supply_chain_frame(analyzed_companies()).set_index('Ticker')
+    assert (frame.loc[['NVDA', 'AMD', 'AAPL', 'MARUTI.NS'], 'Propagated_Impact_pct'] > 0).all()
+    assert frame.loc['TSM', 'Propagated_Impact_pct'] == 0
+    assert set(frame.index) == set(UNIVERSE)
@@ -0,0 +1,96 @@
+"""
+Table backend tests
+Filtering, ranked categorical sorting and paging against pandas
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from config import IMPACT_THRESHOLDS, RECOVERY_TIME_RULES
+from src.dashboard.dashboard_components import CATEGORY_ORDERS
+from src.dashboard.table_backend import IndexedTable
+
+SEVERITY = ['Low', 'Moderate', 'Severe', 'Critical']
+RECOVERY = ['3-6 months', '6-12 months', '12-18 months', '18+ months']
+
+
+def results_table(n: int = 200, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    impact = rng.uniform(0, 100, n)
+    impact[rng.random(n) < 0.1] = np.nan
+    severity = rng.choice(SEVERITY, n).astype(object)
+    severity[rng.random(n) < 0.1] = None
+    recovery = rng.choice(RECOVERY, n).astype(object)
+    recovery[rng.random(n) < 0.1] = np.nan
+    sector = rng.choice(['Semiconductors', 'Automotive', 'Consumer Electronics'], n).astype(object)
+    sector[rng.random(n) < 0.1] = None
+    return pd.DataFrame({
+        'Ticker': [f'T{i}' for i in range(n)],
+        'Sector': sector,
+        'Impact_Severity': severity,
+        'Estimated_Recovery_Months': recovery,
+        'Financial_Impact_pct': impact
+    })
+
+
+def reference_order(df: pd.DataFrame, column: str, ascending: bool) -> np.ndarray:
+    """pandas stable sort, ranked categories, NaN last"""
+    keys = df[column]
+    if column in CATEGORY_ORDERS:
+        keys = pd.Categorical(keys, categories=CATEGORY_ORDERS[column], ordered=True)
+    ranked = pd.DataFrame({'key': keys})
+    return ranked.sort_values('key', ascending=ascending, kind='stable',
+                              na_position='last').index.to_numpy()
+
+
+def test_category_orders_follow_config():
+    assert CATEGORY_ORDERS['Impact_Severity'] == SEVERITY == list(reversed(IMPACT_THRESHOLDS))
+    assert CATEGORY_ORDERS['Estimated_Recovery_Months'] == RECOVERY == \
+        [label for _, label in RECOVERY_TIME_RULES]
+
+
+@pytest.mark.parametrize('ascending', [True, False])
+@pytest.mark.parametrize('column', ['Impact_Severity', 'Estimated_Recovery_Months',
+                                    'Financial_Impact_pct', 'Sector'])
+def test_sort_matches_pandas_with_nan_last(column, ascending):
+    df = results_table()
+    table = IndexedTable(df, [column], CATEGORY_ORDERS)
+    positions = table.select(sort_by=column, ascending=ascending)
+    np.testing.assert_array_equal(positions, reference_order(df, column, ascending))
+    assert df[column].iloc[positions[-10:]].isna().all()
+
+
+def test_filtered_sort_and_pages():
+    df = results_table()
+    table = IndexedTable(df, ['Sector', 'Impact_Severity'], CATEGORY_ORDERS)
+    filters = {'Sector': ['Automotive'], 'Impact_Severity': ['Severe', 'Critical']}
+    ranges = {'Financial_Impact_pct': (20, 80)}
+    positions = table.select(filters, ranges, sort_by='Impact_Severity', ascending=False)
+
+    mask = df['Sector'].eq('Automotive') & df['Impact_Severity'].isin(['Severe', 'Critical']) \
+        & df['Financial_Impact_pct'].between(20, 80)
+    expected = [p for p in reference_order(df, 'Impact_Severity', False) if mask[p]]
+    np.testing.assert_array_equal(positions, expected)
+
+    pages = [table.page(positions, page, 7) for page in range(-(-len(positions) // 7))]
+    combined = pd.concat(pages)
+    assert list(combined.index) == list(range(1, len(positions) + 1))
+    pd.testing.assert_frame_equal(combined.reset_index(drop=True),
+                                  df.iloc[expected].reset_index(drop=True))
+
+    frame, total = table.query(filters, ranges, 'Impact_Severity', False, page=1, page_size=7)
+    assert total == len(positions)
+    pd.testing.assert_frame_equal(frame, pages[1])
+
+
+def test_values_are_ranked_and_unlisted_values_sort_after():
+    df = results_table()
+    df.loc[3, 'Impact_Severity'] = 'Unrated'
+    table = IndexedTable(df, category_orders=CATEGORY_ORDERS)
+    assert table.values('Impact_Severity') == SEVERITY + ['Unrated']
+    assert table.values('Sector') == sorted(df['Sector'].dropna().unique())
+
+    positions = table.select(sort_by='Impact_Severity')
+    ranks = df['Impact_Severity'].iloc[positions].dropna().map(
+        {label: i for i, label in enumerate(SEVERITY + ['Unrated'])})
+    assert ranks.is_monotonic_increasing